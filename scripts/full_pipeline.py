@@ -20,6 +20,7 @@ load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
 import notion
+import quota
 import thumbnail
 import trim
 import youtube
@@ -92,11 +93,25 @@ RECORDING_MAP = [
 ]
 
 
+def _refund_unused_quota(day: str, upload_started: bool, thumbnail_set: bool) -> None:
+    """確保したクォータのうち YouTube に課金されなかった分を、確保した日に戻す
+
+    アップロードはセッション作成の時点で課金されるため、
+    セッションが作られていれば完了していなくても戻さない。
+    """
+    units = 0
+    if not upload_started:
+        units += quota.UPLOAD_COST
+    if not thumbnail_set:
+        units += quota.THUMBNAIL_COST
+    if units:
+        quota.ledger().refund(units, day)
+
+
 def get_zoom_recordings() -> list[dict]:
-    """Zoom APIから過去30日間の録画一覧を取得"""
-    today = datetime.now()
-    from_date = "2026-01-15"
-    to_date = today.strftime("%Y-%m-%d")
+    """Zoom APIから録画一覧を取得（ZOOM_FROM_DATE 未指定時は 2026-01-15 以降）"""
+    from_date = os.environ.get("ZOOM_FROM_DATE") or "2026-01-15"
+    to_date = datetime.now().strftime("%Y-%m-%d")
 
     logger.info("Zoom録画一覧を取得中: %s ~ %s", from_date, to_date)
     recordings = zoom.list_recordings(from_date, to_date)
@@ -123,8 +138,8 @@ def match_zoom_to_config(recordings: list[dict]) -> list[dict]:
                     logger.warning("  MP4ファイルなし: %s", topic)
                     continue
 
-                # 最大サイズのMP4を選択（メインの録画）
-                best_file = max(mp4_files, key=lambda f: f.get("file_size", 0))
+                # 録画タイプ優先度 → 長さ → サイズで1ファイルを選択
+                best_file = zoom.select_best_file(mp4_files)
 
                 matched.append({
                     "config": config,
@@ -226,6 +241,20 @@ def process_single(item: dict, tmp_dir: str, idx: int, total: int) -> dict:
         idx, total, title,
     )
 
+    # 0. YouTube クォータを確保（足りなければ次回実行に回す）
+    quota_day = quota.ledger().today()
+    if not quota.ledger().try_reserve(quota.JOB_COST, quota_day):
+        logger.warning("  YouTube クォータ不足のため次回に延期: %s", title)
+        result["status"] = "DEFERRED"
+        return result
+
+    upload_started = False
+    thumbnail_set = False
+
+    def mark_upload_started() -> None:
+        nonlocal upload_started
+        upload_started = True
+
     try:
         # 1. ステータスを「処理中」に更新
         notion.update_status(page_id, "処理中")
@@ -269,12 +298,14 @@ def process_single(item: dict, tmp_dir: str, idx: int, total: int) -> dict:
             file_path=trimmed_path,
             title=title,
             description=f"講師: {config['lecturer_name']} | 種別: {config['category']} | ジャンル: {config['genre']}",
+            on_session=mark_upload_started,
         )
         youtube_url = youtube.get_video_url(video_id)
         logger.info("  YouTube URL: %s", youtube_url)
 
         # サムネイルをYouTubeに設定
         youtube.set_thumbnail(video_id, thumb_path)
+        thumbnail_set = True
         logger.info("  YouTubeサムネイル設定完了")
 
         # 6. サムネイル画像をGitHubにアップロード（Notionカバー用）
@@ -301,9 +332,20 @@ def process_single(item: dict, tmp_dir: str, idx: int, total: int) -> dict:
         result["youtube_url"] = youtube_url
         result["thumbnail"] = os.path.basename(thumb_path)
 
+    except quota.QuotaExceededError as e:
+        logger.warning("  YouTube クォータ超過のため次回に延期: %s", e)
+        result["status"] = "DEFERRED"
+        _refund_unused_quota(quota_day, upload_started, thumbnail_set)
+
+        try:
+            notion.update_status(page_id, "入力済み", error_msg=str(e))
+        except Exception:
+            pass
+
     except Exception as e:
         logger.exception("  エラー発生: %s", e)
         result["status"] = f"ERROR: {e}"
+        _refund_unused_quota(quota_day, upload_started, thumbnail_set)
 
         try:
             notion.update_status(page_id, "エラー", error_msg=str(e))
@@ -361,7 +403,7 @@ def main():
     print("  結果サマリー")
     print("=" * 60)
     for r in results:
-        status = "✅" if r["status"] == "OK" else "❌"
+        status = {"OK": "✅", "DEFERRED": "⏸"}.get(r["status"], "❌")
         yt = r.get("youtube_url", "-")
         print(f"  {status} {r['lecturer']:8s} | {r['category']:12s} | {r['status']}")
         if yt != "-":
@@ -0,0 +1,138 @@
+"""ローカル検証用: Zoom Webhook イベントを署名付きで送信する
+
+web/app.py の /webhooks/zoom に、Zoom と同じ形式（x-zm-signature /
+x-zm-request-timestamp ヘッダー付き）で recording.completed または
+endpoint.url_validation イベントを送る。
+
+Usage:
+    python scripts/send_fake_zoom_webhook.py --start-time 2026-02-09T00:01:22Z
+    python scripts/send_fake_zoom_webhook.py --validate
+    python scripts/send_fake_zoom_webhook.py --object meeting.json
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import requests
+from dotenv import load_dotenv
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+DEFAULT_URL = "http://localhost:8080/webhooks/zoom"
+
+
+def build_recording_completed(args: argparse.Namespace) -> dict:
+    """recording.completed イベントを組み立てる"""
+    if args.object:
+        with open(args.object, encoding="utf-8") as f:
+            meeting = json.load(f)
+    else:
+        meeting_uuid = args.uuid or f"fake-{uuid.uuid4()}"
+        meeting = {
+            "uuid": meeting_uuid,
+            "id": 1234567890,
+            "host_id": "fake-host",
+            "host_email": "host@example.com",
+            "topic": args.topic,
+            "start_time": args.start_time,
+            "duration": 60,
+            "recording_files": [
+                {
+                    "id": f"{meeting_uuid}-mp4",
+                    "file_type": "MP4",
+                    "recording_type": "shared_screen_with_speaker_view",
+                    "file_size": args.file_size,
+                    "download_url": args.download_url,
+                    "status": "completed",
+                }
+            ],
+        }
+
+    return {
+        "event": "recording.completed",
+        "event_ts": int(time.time() * 1000),
+        "payload": {"account_id": "fake-account", "object": meeting},
+        "download_token": "fake-download-token",
+    }
+
+
+def send(url: str, secret: str, event: dict) -> requests.Response:
+    """Zoom と同じ方式で署名して POST する"""
+    body = json.dumps(event, ensure_ascii=False)
+    timestamp = str(int(time.time()))
+    digest = hmac.new(
+        secret.encode("utf-8"),
+        f"v0:{timestamp}:{body}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+    return requests.post(
+        url,
+        data=body.encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "x-zm-request-timestamp": timestamp,
+            "x-zm-signature": f"v0={digest}",
+        },
+        timeout=30,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Send a fake Zoom webhook")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument(
+        "--secret", default=os.environ.get("ZOOM_WEBHOOK_SECRET", "")
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="endpoint.url_validation を送る",
+    )
+    parser.add_argument("--object", help="payload.object にする JSON ファイル")
+    parser.add_argument("--uuid", default="")
+    parser.add_argument("--topic", default="テスト録画")
+    parser.add_argument(
+        "--start-time",
+        default=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    )
+    parser.add_argument(
+        "--download-url", default="https://example.com/rec/download/fake"
+    )
+    parser.add_argument("--file-size", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.secret:
+        print("[ERROR] ZOOM_WEBHOOK_SECRET が未設定です（--secret で指定可）")
+        sys.exit(1)
+
+    if args.validate:
+        event = {
+            "event": "endpoint.url_validation",
+            "event_ts": int(time.time() * 1000),
+            "payload": {"plainToken": "fake-plain-token"},
+        }
+    else:
+        event = build_recording_completed(args)
+
+    resp = send(args.url, args.secret, event)
+    print(f"HTTP {resp.status_code}")
+    print(resp.text)
+
+    if args.validate and resp.ok:
+        expected = hmac.new(
+            args.secret.encode("utf-8"), b"fake-plain-token", hashlib.sha256
+        ).hexdigest()
+        ok = resp.json().get("encryptedToken") == expected
+        print("encryptedToken:", "OK" if ok else "MISMATCH")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,15 @@ Steps:
 """
 
 import json
+import os
 import requests
 import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from token_cache import TokenCache
+
 
 # ── Credentials ──────────────────────────────────────────────────────────────
 ZOOM_ACCOUNT_ID = "_0lxDkFUSWWt036mTe7EyA"
@@ -21,8 +26,8 @@ ZOOM_CLIENT_SECRET = "UoHJR5heoQzV7XV62RLtYuwZ3jtILW2S"
 
 
 # ── Step 1: Get OAuth token ──────────────────────────────────────────────────
-def get_access_token() -> str:
-    """Obtain an access token using Server-to-Server OAuth (account_credentials)."""
+def _request_access_token() -> dict:
+    """Request an access token using Server-to-Server OAuth (account_credentials)."""
     url = "https://zoom.us/oauth/token"
     params = {
         "grant_type": "account_credentials",
@@ -32,6 +37,7 @@ def get_access_token() -> str:
         url,
         params=params,
         auth=(ZOOM_CLIENT_ID, ZOOM_CLIENT_SECRET),
+        timeout=30,
     )
     if resp.status_code != 200:
         print(f"[ERROR] Failed to obtain access token: {resp.status_code}")
@@ -44,7 +50,15 @@ def get_access_token() -> str:
     print(f"  expires_in : {data.get('expires_in')} seconds")
     print(f"  scope      : {data.get('scope')}")
     print()
-    return data["access_token"]
+    return data
+
+
+_token_cache = TokenCache(_request_access_token, name="Zoom")
+
+
+def get_access_token() -> str:
+    """Return a cached access token, requesting a new one when it is stale."""
+    return _token_cache.get()
 
 
 # ── Step 2: List cloud recordings ────────────────────────────────────────────
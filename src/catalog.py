@@ -0,0 +1,483 @@
+"""Local catalog of Zoom meetings and recording files.
+
+Keeps every meeting seen by the pipeline in a small SQLite database so that
+
+* each run only lists Zoom from the last sync (minus an overlap window for
+  recordings that finish processing late) instead of a fixed
+  "yesterday → today" window -- a missed run no longer loses recordings;
+* recording files that were already published are remembered and skipped;
+* matching a Notion record to its recording is a local query instead of a
+  Zoom API call;
+* recordings deferred for lack of YouTube quota are remembered and offered
+  first on the next run.
+
+Environment variables (optional):
+    CATALOG_PATH          - SQLite file (default ``<project>/.cache/catalog.sqlite3``)
+    CATALOG_OVERLAP_HOURS - Hours re-listed before the last sync (default 48)
+    CATALOG_INITIAL_DAYS  - Days listed on the very first sync (default 1)
+    CATALOG_PENDING_DAYS  - How long an unprocessed meeting keeps being
+                            offered for matching (default 7)
+    CATALOG_RECHECK_HOURS - Wait before re-querying Notion for a meeting
+                            that had no matching record; doubles with
+                            every miss, up to a day (default 1)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+import zoom
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = os.environ.get(
+    "CATALOG_PATH",
+    str(Path(__file__).resolve().parent.parent / ".cache" / "catalog.sqlite3"),
+)
+OVERLAP_HOURS = float(os.environ.get("CATALOG_OVERLAP_HOURS", "48"))
+INITIAL_DAYS = int(os.environ.get("CATALOG_INITIAL_DAYS", "1"))
+PENDING_DAYS = int(os.environ.get("CATALOG_PENDING_DAYS", "7"))
+RECHECK_HOURS = float(os.environ.get("CATALOG_RECHECK_HOURS", "1"))
+_RECHECK_MAX = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    uuid        TEXT PRIMARY KEY,
+    meeting_id  INTEGER,
+    topic       TEXT,
+    start_time  TEXT,
+    start_ts    REAL,
+    host_id     TEXT,
+    host_email  TEXT,
+    synced_at   TEXT
+);
+CREATE INDEX IF NOT EXISTS meetings_start_ts ON meetings (start_ts);
+
+CREATE TABLE IF NOT EXISTS recording_files (
+    id           TEXT PRIMARY KEY,
+    meeting_uuid TEXT NOT NULL REFERENCES meetings (uuid),
+    payload      TEXT NOT NULL,
+    page_id      TEXT,
+    processed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS recording_files_meeting
+    ON recording_files (meeting_uuid);
+
+CREATE TABLE IF NOT EXISTS deferred (
+    file_id      TEXT PRIMARY KEY REFERENCES recording_files (id),
+    meeting_uuid TEXT NOT NULL REFERENCES meetings (uuid),
+    deferred_at  TEXT NOT NULL,
+    reason       TEXT
+);
+
+CREATE TABLE IF NOT EXISTS match_checks (
+    meeting_uuid TEXT PRIMARY KEY REFERENCES meetings (uuid),
+    checked_at   REAL NOT NULL,
+    misses       INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS claims (
+    key        TEXT PRIMARY KEY,
+    owner      TEXT,
+    claimed_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _timestamp(start_time: str) -> float | None:
+    """Convert a Zoom ISO 8601 ``start_time`` to a POSIX timestamp."""
+    if not start_time:
+        return None
+    return datetime.fromisoformat(start_time.replace("Z", "+00:00")).timestamp()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _recheck_delay(misses: int) -> float:
+    """Seconds to wait before matching a meeting again after *misses* misses."""
+    if misses <= 0:
+        return 0.0
+    return min(RECHECK_HOURS * 3600 * 2 ** (misses - 1), _RECHECK_MAX)
+
+
+class Catalog:
+    """SQLite-backed store of meetings, recording files and sync state.
+
+    A single connection is shared by all threads and guarded by a lock,
+    so the catalog can be updated from pipeline worker threads.
+
+    Args:
+        path: Database file.  Parent directories are created as needed.
+    """
+
+    def __init__(self, path: str = CATALOG_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- sync state ---------------------------------------------------------
+
+    def watermark(self) -> datetime | None:
+        """Return the time of the last completed sync, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM sync_state WHERE key = 'watermark'"
+            ).fetchone()
+        return datetime.fromisoformat(row["value"]) if row else None
+
+    def set_watermark(self, when: datetime) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) "
+                "VALUES ('watermark', ?)",
+                (when.isoformat(),),
+            )
+
+    # -- meetings -----------------------------------------------------------
+
+    def upsert_meeting(self, meeting: dict) -> None:
+        """Insert or update a normalized meeting and its recording files.
+
+        Processing state of files already in the catalog is preserved.
+
+        Args:
+            meeting: Meeting dict as returned by :func:`zoom.iter_recordings`.
+        """
+        uuid = meeting.get("uuid") or str(meeting["meeting_id"])
+        start_time = meeting.get("start_time", "")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meetings (uuid, meeting_id, topic, start_time, "
+                "start_ts, host_id, host_email, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (uuid) DO UPDATE SET "
+                "meeting_id = excluded.meeting_id, topic = excluded.topic, "
+                "start_time = excluded.start_time, "
+                "start_ts = excluded.start_ts, host_id = excluded.host_id, "
+                "host_email = excluded.host_email, "
+                "synced_at = excluded.synced_at",
+                (
+                    uuid,
+                    meeting.get("meeting_id"),
+                    meeting.get("topic", ""),
+                    start_time,
+                    _timestamp(start_time),
+                    meeting.get("host_id", ""),
+                    meeting.get("host_email", ""),
+                    _utcnow().isoformat(),
+                ),
+            )
+            for rf in meeting.get("recording_files", []):
+                self._conn.execute(
+                    "INSERT INTO recording_files (id, meeting_uuid, payload) "
+                    "VALUES (?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET payload = excluded.payload",
+                    (rf["id"], uuid, json.dumps(rf)),
+                )
+
+    def _load_meetings(self, rows: list[sqlite3.Row]) -> list[dict]:
+        """Rebuild normalized meeting dicts (with their files) from rows.
+
+        Must be called with the lock held.
+        """
+        meetings = []
+        for row in rows:
+            files = self._conn.execute(
+                "SELECT payload FROM recording_files WHERE meeting_uuid = ? "
+                "ORDER BY rowid",
+                (row["uuid"],),
+            ).fetchall()
+            meetings.append(
+                {
+                    "meeting_id": row["meeting_id"],
+                    "uuid": row["uuid"],
+                    "host_id": row["host_id"],
+                    "host_email": row["host_email"],
+                    "topic": row["topic"],
+                    "start_time": row["start_time"],
+                    "recording_files": [json.loads(f["payload"]) for f in files],
+                }
+            )
+        return meetings
+
+    def pending_meetings(
+        self, since: datetime | None = None, now: datetime | None = None
+    ) -> list[dict]:
+        """Return meetings none of whose recording files has been processed.
+
+        Only one file per meeting is published (see
+        :func:`zoom.select_best_file`), so a meeting is done as soon as
+        any of its files is.  Meetings that recently had no matching
+        Notion record (see :meth:`record_unmatched`) are left out until
+        their back-off has passed.
+
+        Args:
+            since: Ignore meetings that started before this time.  Defaults
+                   to ``PENDING_DAYS`` ago.
+            now:   Current time, for the back-off.  Defaults to now.
+
+        Returns:
+            Normalized meeting dicts, newest first.
+        """
+        if now is None:
+            now = _utcnow()
+        if since is None:
+            since = now - timedelta(days=PENDING_DAYS)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT m.*, c.checked_at, c.misses FROM meetings m "
+                "LEFT JOIN match_checks c ON c.meeting_uuid = m.uuid "
+                "WHERE m.start_ts >= ? AND NOT EXISTS ("
+                "  SELECT 1 FROM recording_files f"
+                "  WHERE f.meeting_uuid = m.uuid"
+                "  AND f.processed_at IS NOT NULL"
+                ") ORDER BY m.start_ts DESC",
+                (since.timestamp(),),
+            ).fetchall()
+            due = [
+                row
+                for row in rows
+                if row["checked_at"] is None
+                or row["checked_at"] + _recheck_delay(row["misses"])
+                <= now.timestamp()
+            ]
+            if len(due) < len(rows):
+                logger.debug(
+                    "%d pending meeting(s) backing off after a Notion miss",
+                    len(rows) - len(due),
+                )
+            return self._load_meetings(due)
+
+    def match_due(self, uuid: str, now: datetime | None = None) -> bool:
+        """Return whether *uuid* may be matched against Notion again.
+
+        ``False`` while the meeting is backing off after a miss (see
+        :meth:`record_unmatched`).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checked_at, misses FROM match_checks WHERE meeting_uuid = ?",
+                (uuid,),
+            ).fetchone()
+        if row is None:
+            return True
+        now_ts = (now or _utcnow()).timestamp()
+        return row["checked_at"] + _recheck_delay(row["misses"]) <= now_ts
+
+    def record_unmatched(self, uuid: str, now: datetime | None = None) -> None:
+        """Record that Notion had no record for a meeting.
+
+        The meeting is not offered again for ``CATALOG_RECHECK_HOURS``,
+        doubling with every further miss (capped at a day), instead of
+        querying Notion for it on every run while it is pending.
+        """
+        checked_at = (now or _utcnow()).timestamp()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO match_checks (meeting_uuid, checked_at, misses) "
+                "VALUES (?, ?, 1) "
+                "ON CONFLICT (meeting_uuid) DO UPDATE SET "
+                "checked_at = excluded.checked_at, misses = misses + 1",
+                (uuid, checked_at),
+            )
+
+    def meetings_near(self, start_time: str, window: float = 1800) -> list[dict]:
+        """Return meetings that started within *window* seconds of a time.
+
+        Args:
+            start_time: ISO 8601 timestamp.
+            window:     Tolerance in seconds on either side.
+
+        Returns:
+            Normalized meeting dicts, closest first.
+        """
+        ts = _timestamp(start_time)
+        if ts is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM meetings WHERE start_ts BETWEEN ? AND ? "
+                "ORDER BY ABS(start_ts - ?)",
+                (ts - window, ts + window, ts),
+            ).fetchall()
+            return self._load_meetings(rows)
+
+    # -- processing state ---------------------------------------------------
+
+    def is_processed(self, file_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT processed_at FROM recording_files WHERE id = ?",
+                (file_id,),
+            ).fetchone()
+        return bool(row and row["processed_at"])
+
+    def is_meeting_processed(self, meeting: dict) -> bool:
+        """Return whether any recording file of *meeting* was processed."""
+        return any(
+            self.is_processed(rf["id"])
+            for rf in meeting.get("recording_files", [])
+        )
+
+    def mark_processed(self, file_id: str, page_id: str = "") -> None:
+        """Record that a recording file has been published.
+
+        Any deferral of the file's meeting is cleared.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE recording_files SET processed_at = ?, page_id = ? "
+                "WHERE id = ?",
+                (_utcnow().isoformat(), page_id, file_id),
+            )
+            self._conn.execute(
+                "DELETE FROM deferred WHERE meeting_uuid = ("
+                "  SELECT meeting_uuid FROM recording_files WHERE id = ?"
+                ")",
+                (file_id,),
+            )
+
+    # -- claims -------------------------------------------------------------
+
+    def claim(self, key: str, owner: str = "", ttl: float = 6 * 3600) -> bool:
+        """Take an exclusive claim on *key* for this process.
+
+        The claim is a single SQL statement on the shared database file, so
+        it is atomic across processes on the same host (e.g. gunicorn
+        workers).  A claim older than *ttl* seconds is assumed to belong to
+        a process that died and is taken over.
+
+        Returns:
+            ``True`` if the claim was taken, ``False`` if someone holds it.
+        """
+        now = _utcnow().timestamp()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO claims (key, owner, claimed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, "
+                "claimed_at = excluded.claimed_at "
+                "WHERE claims.claimed_at < ?",
+                (key, owner, now, now - ttl),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, key: str) -> None:
+        """Drop a claim taken with :meth:`claim`."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM claims WHERE key = ?", (key,))
+
+    # -- deferrals ----------------------------------------------------------
+
+    def defer(self, file_id: str, reason: str = "") -> None:
+        """Record that a recording file was postponed to a later run.
+
+        A file deferred again keeps its original ``deferred_at``, so it
+        does not lose its place in line.
+
+        Args:
+            file_id: Recording file ID (must already be in the catalog).
+            reason:  Why processing was postponed, for logs.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO deferred (file_id, meeting_uuid, deferred_at, reason) "
+                "SELECT id, meeting_uuid, ?, ? FROM recording_files WHERE id = ? "
+                "ON CONFLICT (file_id) DO UPDATE SET reason = excluded.reason",
+                (_utcnow().isoformat(), reason, file_id),
+            )
+
+    def deferred_meetings(self) -> list[dict]:
+        """Return meetings with a deferred, still unprocessed recording file.
+
+        Returns:
+            Normalized meeting dicts, longest-deferred first (ties broken
+            by the oldest recording), so postponed work is resumed in the
+            order it was postponed.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT m.*, MIN(d.deferred_at) AS first_deferred "
+                "FROM deferred d JOIN meetings m ON m.uuid = d.meeting_uuid "
+                "WHERE NOT EXISTS ("
+                "  SELECT 1 FROM recording_files f"
+                "  WHERE f.meeting_uuid = m.uuid AND f.processed_at IS NOT NULL"
+                ") GROUP BY m.uuid ORDER BY first_deferred, m.start_ts",
+            ).fetchall()
+            return self._load_meetings(rows)
+
+
+def iter_sync(catalog: Catalog, now: datetime | None = None) -> Iterator[dict]:
+    """Pull new and changed meetings from Zoom into the catalog.
+
+    Lists Zoom from the last watermark minus ``OVERLAP_HOURS`` (or
+    ``INITIAL_DAYS`` ago on the first sync) up to today, storing each
+    meeting and yielding it as soon as it is stored.  The watermark only
+    advances once the whole listing has been consumed, so a failed or
+    abandoned sync is simply repeated by the next run.
+
+    Args:
+        catalog: Catalog to update.
+        now:     Current time (defaults to now, UTC).
+
+    Yields:
+        Normalized meeting dicts as returned by :func:`zoom.iter_recordings`.
+
+    Raises:
+        requests.HTTPError: If listing fails.
+    """
+    now = now or _utcnow()
+    watermark = catalog.watermark()
+    if watermark is None:
+        start = now - timedelta(days=INITIAL_DAYS)
+    else:
+        start = watermark - timedelta(hours=OVERLAP_HOURS)
+
+    from_date = start.strftime("%Y-%m-%d")
+    to_date = now.strftime("%Y-%m-%d")
+    logger.info(
+        "Syncing catalog from %s to %s (last sync: %s)",
+        from_date,
+        to_date,
+        watermark.isoformat() if watermark else "never",
+    )
+
+    count = 0
+    for meeting in zoom.iter_recordings(from_date, to_date):
+        catalog.upsert_meeting(meeting)
+        count += 1
+        yield meeting
+
+    catalog.set_watermark(now)
+    logger.info("Catalog sync complete: %d meeting(s)", count)
+
+
+def sync(catalog: Catalog, now: datetime | None = None) -> int:
+    """Run :func:`iter_sync` to completion.
+
+    Returns:
+        The number of meetings listed.
+    """
+    return sum(1 for _ in iter_sync(catalog, now))
@@ -0,0 +1,253 @@
+"""Per-record checkpoints of completed pipeline stages.
+
+A failed record is retried from scratch by the next run unless something
+remembers how far it got.  :class:`Checkpoint` stores the artifact of each
+completed stage of one Notion master record -- downloaded and trimmed file
+(path plus content hash), thumbnail, YouTube ``video_id``, whether the
+thumbnail was set and the Discord notification sent, and the archive
+``page_id`` -- in a small JSON file.  A retry skips every stage whose
+artifact is still valid, so a failure after the upload never uploads a
+second video, and a failure in the upload does not download and trim the
+recording again.
+
+Local files only help if they survive the failed run, so jobs work in a
+persistent directory per record (:func:`work_dir`) that is kept on failure
+and removed once the record is complete.  The scheduled CI workflow keeps
+only ``.cache`` between runs (recordings are too large for its cache), so
+there a retry resumes after the upload -- the ``video_id`` is never lost --
+but downloads and trims again; reusing the local files needs a host whose
+``.work`` persists.
+
+Environment variables (optional):
+    PIPELINE_CHECKPOINT_DIR  - Checkpoint files (default <project>/.cache/checkpoints)
+    PIPELINE_WORK_DIR        - Per-record work directories (default <project>/.work)
+    PIPELINE_CHECKPOINT_DAYS - Age after which an abandoned checkpoint and
+                               its work directory are removed (default 14)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+CHECKPOINT_DIR = os.environ.get(
+    "PIPELINE_CHECKPOINT_DIR", str(_PROJECT_ROOT / ".cache" / "checkpoints")
+)
+WORK_DIR = os.environ.get("PIPELINE_WORK_DIR", str(_PROJECT_ROOT / ".work"))
+MAX_AGE_DAYS = float(os.environ.get("PIPELINE_CHECKPOINT_DAYS", "14"))
+
+# Bytes read from each end of a file for its digest.
+_DIGEST_BYTES = 4 * 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """Return a content hash of *path* for detecting changed files.
+
+    Hashes the size plus the first and last few MiB rather than the whole
+    file: recordings run to several GB, and a full hash would cost about
+    as much as the download it is meant to save.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        digest.update(f.read(_DIGEST_BYTES))
+        if size > _DIGEST_BYTES:
+            f.seek(max(_DIGEST_BYTES, size - _DIGEST_BYTES))
+            digest.update(f.read(_DIGEST_BYTES))
+    return digest.hexdigest()
+
+
+def work_dir(page_id: str) -> str:
+    """Return the persistent work directory of a master record."""
+    return os.path.join(WORK_DIR, page_id)
+
+
+def _checkpoint_path(page_id: str) -> str:
+    return os.path.join(CHECKPOINT_DIR, f"{page_id}.json")
+
+
+class Checkpoint:
+    """Completed-stage artifacts of one master record.
+
+    Every update is written to disk immediately, so a checkpoint is as
+    fresh as the last completed step even if the process dies.  Updates
+    are thread-safe (the thumbnail is recorded from its own thread).
+
+    Args:
+        page_id:   Notion master record ID.
+        file_id:   Zoom recording file the artifacts belong to.
+        artifacts: Previously saved artifacts.
+    """
+
+    def __init__(self, page_id: str, file_id: str = "", artifacts: dict | None = None):
+        self.page_id = page_id
+        self.file_id = file_id
+        self.artifacts: dict = artifacts or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, page_id: str, file_id: str = "") -> "Checkpoint":
+        """Load the checkpoint of *page_id*, or start an empty one.
+
+        A checkpoint saved for a different recording file is discarded:
+        its artifacts belong to another recording.
+        """
+        try:
+            with open(_checkpoint_path(page_id), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(page_id, file_id)
+
+        if file_id and data.get("file_id") and data["file_id"] != file_id:
+            logger.info(
+                "Discarding checkpoint of %s: saved for file %s, not %s",
+                page_id,
+                data["file_id"],
+                file_id,
+            )
+            return cls(page_id, file_id)
+
+        artifacts = data.get("artifacts", {})
+        if artifacts:
+            logger.info(
+                "Resuming %s from checkpoint: %s",
+                page_id,
+                ", ".join(sorted(artifacts)),
+            )
+        return cls(page_id, file_id or data.get("file_id", ""), artifacts)
+
+    def _save(self) -> None:
+        """Write the checkpoint atomically.  Must be called with the lock held."""
+        path = _checkpoint_path(self.page_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "page_id": self.page_id,
+                    "file_id": self.file_id,
+                    "updated_at": time.time(),
+                    "artifacts": self.artifacts,
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, path)
+
+    def get(self, key: str, default=None):
+        """Return the artifact saved under *key*."""
+        with self._lock:
+            return self.artifacts.get(key, default)
+
+    def record(self, **artifacts) -> None:
+        """Save one or more artifacts, e.g. ``record(video_id="abc")``."""
+        with self._lock:
+            self.artifacts.update(artifacts)
+            self._save()
+
+    def record_file(self, key: str, path: str) -> None:
+        """Save a local file artifact together with its content hash."""
+        self.record(**{key: {"path": path, "digest": file_digest(path)}})
+
+    def file(self, key: str) -> str:
+        """Return the path of a saved file artifact if it is still intact.
+
+        "Intact" is judged by :func:`file_digest`, which only samples the
+        size and both ends of the file: a change that keeps the size and
+        touches only the middle goes unnoticed.  That covers what happens
+        to work files in practice (removed, truncated, rewritten by a new
+        download or trim), not tampering or in-place corruption.
+
+        Returns:
+            The path, or ``""`` if no file was saved under *key* or it has
+            since been removed or changed.
+        """
+        entry = self.get(key)
+        if not entry:
+            return ""
+        path = entry.get("path", "")
+        try:
+            if path and file_digest(path) == entry.get("digest"):
+                return path
+        except OSError:
+            pass
+        logger.info("Checkpointed %s for %s is gone or changed", key, self.page_id)
+        return ""
+
+    def clear(self) -> None:
+        """Remove the checkpoint and the record's work directory."""
+        with self._lock:
+            self.artifacts = {}
+            try:
+                os.remove(_checkpoint_path(self.page_id))
+            except FileNotFoundError:
+                pass
+        shutil.rmtree(work_dir(self.page_id), ignore_errors=True)
+
+
+def _updated_at(path: str) -> float:
+    """Return when the checkpoint at *path* was last saved.
+
+    Falls back to the file's mtime for a checkpoint that cannot be read
+    or has no ``updated_at``.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return float(json.load(f)["updated_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return os.path.getmtime(path)
+
+
+def prune(max_age_days: float = MAX_AGE_DAYS) -> int:
+    """Remove checkpoints not updated for too long, with their work files.
+
+    Records that are never retried again (e.g. 要手動対応) would otherwise
+    keep their files forever.  Age is taken from each checkpoint's
+    ``updated_at``; a work directory is removed together with its stale
+    checkpoint, or -- when it has no checkpoint at all -- once the
+    directory itself is older than the cutoff.
+
+    Returns:
+        The number of records pruned.
+    """
+    cutoff = time.time() - max_age_days * 86400
+    live: set[str] = set()
+    stale: set[str] = set()
+    if os.path.isdir(CHECKPOINT_DIR):
+        for name in os.listdir(CHECKPOINT_DIR):
+            if not name.endswith(".json"):
+                continue
+            page_id = name[: -len(".json")]
+            path = os.path.join(CHECKPOINT_DIR, name)
+            if _updated_at(path) >= cutoff:
+                live.add(page_id)
+                continue
+            os.remove(path)
+            stale.add(page_id)
+
+    pruned = set(stale)
+    if os.path.isdir(WORK_DIR):
+        for page_id in os.listdir(WORK_DIR):
+            path = os.path.join(WORK_DIR, page_id)
+            if page_id in live:
+                continue
+            if page_id not in stale and os.path.getmtime(path) >= cutoff:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            pruned.add(page_id)
+    if pruned:
+        logger.info("Pruned %d stale checkpoint(s)", len(pruned))
+    return len(pruned)
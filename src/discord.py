@@ -9,7 +9,7 @@ from __future__ import annotations
 import logging
 import os
 
-import requests
+import transport
 
 logger = logging.getLogger(__name__)
 
@@ -124,7 +124,7 @@ def send_notification(
 
         payload: dict = {"embeds": [embed]}
 
-        response = requests.post(
+        response = transport.post(
             webhook_url,
             json=payload,
             timeout=10,
@@ -0,0 +1,232 @@
+"""Registry of lecturer images in ``assets/lecturer-images``.
+
+Image files follow the naming convention ``NN_name[_name...]_type.png``,
+e.g. ``01_陸_1人.png`` (one lecturer) or ``06_陸_たっちー_2人.png`` (a
+pair).  :class:`LecturerImageRegistry` parses the directory once into
+indexes by file name, by lecturer name and by (name, type), so lookups
+from thumbnail generation and the web form are dictionary hits instead of
+directory scans.  The index is rebuilt when the directory changes (its
+mtime moves whenever an image is added, removed or renamed).
+
+The registry also hands out images as ready Gemini ``inline_data`` parts,
+base64-encoded once and re-encoded only when the file changes.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import mimetypes
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LECTURER_IMAGES_DIR = (
+    Path(__file__).resolve().parent.parent / "assets" / "lecturer-images"
+)
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+# Image types in the file names.
+SOLO = "1人"
+PAIR = "2人"
+
+# Honorifics stripped from lecturer names before lookup.
+_NAME_SUFFIXES = ("講師", "先生")
+
+
+def normalize_name(name: str) -> str:
+    """Strip surrounding whitespace and a trailing 講師/先生 from *name*."""
+    name = name.strip()
+    for suffix in _NAME_SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+class LecturerImage:
+    """One lecturer image file.
+
+    Attributes:
+        id:       Leading number of the file name (``"06"``).
+        filename: File name (``"06_陸_たっちー_2人.png"``).
+        path:     Absolute path.
+        names:    Lecturer names in the image (``("陸", "たっちー")``).
+        type:     Image type (``"1人"``, ``"2人"``).
+    """
+
+    def __init__(self, path: Path, img_id: str, names: tuple[str, ...], img_type: str):
+        self.path = str(path)
+        self.filename = path.name
+        self.id = img_id
+        self.names = names
+        self.type = img_type
+
+    @property
+    def label(self) -> str:
+        return " x ".join(self.names)
+
+    @classmethod
+    def parse(cls, path: Path) -> "LecturerImage | None":
+        """Parse a file following the naming convention, else ``None``."""
+        parts = path.stem.split("_")
+        if len(parts) < 3:
+            return None
+        return cls(path, parts[0], tuple(parts[1:-1]), parts[-1])
+
+
+class LecturerImageRegistry:
+    """Indexed, self-refreshing view of one lecturer image directory.
+
+    Args:
+        images_dir: Directory holding the lecturer images.
+    """
+
+    def __init__(self, images_dir: str | Path = LECTURER_IMAGES_DIR):
+        self.images_dir = Path(images_dir)
+        self._lock = threading.Lock()
+        self._stamp: int | None = None
+        self._version = 0
+        self._images: list[LecturerImage] = []
+        self._by_filename: dict[str, LecturerImage] = {}
+        self._by_name: dict[str, list[LecturerImage]] = {}
+        self._by_name_type: dict[tuple[str, str], list[LecturerImage]] = {}
+        # filename -> ((mtime_ns, size), inline part)
+        self._payloads: dict[str, tuple[tuple[int, int], dict]] = {}
+
+    def _refresh(self) -> None:
+        """Rebuild the indexes if the directory changed.  Lock must be held."""
+        try:
+            stamp = os.stat(self.images_dir).st_mtime_ns
+        except OSError:
+            stamp = None
+        if stamp == self._stamp and self._version:
+            return
+
+        images = []
+        if stamp is None:
+            logger.warning("Lecturer images directory not found: %s", self.images_dir)
+        else:
+            for path in sorted(self.images_dir.iterdir()):
+                if path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+                    continue
+                image = LecturerImage.parse(path)
+                if image is not None:
+                    images.append(image)
+
+        by_name: dict[str, list[LecturerImage]] = {}
+        by_name_type: dict[tuple[str, str], list[LecturerImage]] = {}
+        for image in images:
+            for name in image.names:
+                by_name.setdefault(name, []).append(image)
+                by_name_type.setdefault((name, image.type), []).append(image)
+
+        self._images = images
+        self._by_filename = {image.filename: image for image in images}
+        self._by_name = by_name
+        self._by_name_type = by_name_type
+        self._payloads = {
+            k: v for k, v in self._payloads.items() if k in self._by_filename
+        }
+        self._stamp = stamp
+        self._version += 1
+        logger.debug(
+            "Indexed %d lecturer image(s) in %s", len(images), self.images_dir
+        )
+
+    def version(self) -> int:
+        """Return a counter that changes whenever the index is rebuilt."""
+        with self._lock:
+            self._refresh()
+            return self._version
+
+    def images(self) -> list[LecturerImage]:
+        """Return all images, sorted by file name."""
+        with self._lock:
+            self._refresh()
+            return list(self._images)
+
+    def get(self, filename: str) -> LecturerImage | None:
+        """Return the image with this exact file name, if any."""
+        with self._lock:
+            self._refresh()
+            return self._by_filename.get(filename)
+
+    def find(self, name: str, img_type: str | None = None) -> list[LecturerImage]:
+        """Return the images of a lecturer, sorted by file name.
+
+        Args:
+            name:     Lecturer name; a trailing 講師/先生 is ignored.
+            img_type: Only return images of this type (:data:`SOLO`,
+                      :data:`PAIR`).
+
+        Returns:
+            The images whose names include *name* exactly.  When there are
+            none, images whose names contain *name* as a substring (e.g.
+            ``"みく"`` for ``"みくぽん"``).
+        """
+        name = normalize_name(name)
+        if not name:
+            return []
+        with self._lock:
+            self._refresh()
+            if img_type is None:
+                exact = self._by_name.get(name)
+            else:
+                exact = self._by_name_type.get((name, img_type))
+            if exact:
+                return list(exact)
+            return [
+                image
+                for image in self._images
+                if (img_type is None or image.type == img_type)
+                and any(name in n for n in image.names)
+            ]
+
+    def payload(self, filename: str) -> dict | None:
+        """Return an image as a base64 Gemini ``inline_data`` part.
+
+        The encoded payload is cached and rebuilt only when the file's
+        mtime or size changes.
+
+        Returns:
+            The part, or ``None`` if *filename* is not a known image.
+        """
+        image = self.get(filename)
+        if image is None:
+            return None
+        try:
+            st = os.stat(image.path)
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._payloads.get(filename)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+        data = Path(image.path).read_bytes()
+        part = {
+            "inline_data": {
+                "mime_type": mimetypes.guess_type(image.path)[0] or "image/png",
+                "data": base64.b64encode(data).decode("utf-8"),
+            }
+        }
+        with self._lock:
+            self._payloads[filename] = (stamp, part)
+        return part
+
+
+_registries: dict[str, LecturerImageRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def registry(images_dir: str | Path = LECTURER_IMAGES_DIR) -> LecturerImageRegistry:
+    """Return the process-wide registry for *images_dir*."""
+    key = os.path.abspath(images_dir)
+    with _registries_lock:
+        reg = _registries.get(key)
+        if reg is None:
+            reg = _registries[key] = LecturerImageRegistry(key)
+        return reg
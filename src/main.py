@@ -9,15 +9,16 @@ Pipeline flow:
     2. Fetch Zoom recordings from the last 24 hours
     3. For each recording: match, download, trim, thumbnail, upload, notify
     4. On error: update Notion status; escalate after 3 retries
+    5. When the YouTube quota is used up: defer the recording to a later run
 """
 
 from __future__ import annotations
 
 import logging
 import os
-import shutil
 import sys
-import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -30,9 +31,20 @@ SRC_DIR = PROJECT_ROOT / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+# Load .env before importing the src modules: they read their settings
+# (TRIM_SCAN_WINDOW, ZOOM_DOWNLOAD_CONNECTIONS, ...) at import time.
+from dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(dotenv_path=str(PROJECT_ROOT / ".env"))
+
+import catalog                 # noqa: E402
+import checkpoint              # noqa: E402
 import discord as discord_mod  # noqa: E402  (renamed to avoid stdlib clash)
 import notion                  # noqa: E402
+import pipeline                # noqa: E402
+import quota                   # noqa: E402
 import thumbnail               # noqa: E402
+import transport               # noqa: E402
 import trim                    # noqa: E402
 import youtube                 # noqa: E402
 import zoom                    # noqa: E402
@@ -41,73 +53,329 @@ logger = logging.getLogger(__name__)
 
 MAX_RETRY_COUNT = 3
 
+# Per-stage concurrency limits for run_pipeline().  Each can be overridden
+# with PIPELINE_<STAGE>_WORKERS, e.g. PIPELINE_UPLOAD_WORKERS=2.
+STAGE_WORKERS = {
+    "download": 2,   # network (Zoom)
+    "trim": 1,       # CPU (ffmpeg)
+    "thumbnail": 2,  # remote AI call (Gemini), runs beside the stages
+    "upload": 1,     # network (YouTube)
+    "publish": 2,    # Discord / Notion
+}
+
+# Capacity of the queue in front of each stage.  Bounds how many
+# downloaded-but-not-yet-uploaded recordings can pile up on disk.
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", "2"))
+
+# Upload trimmed recordings straight from an ffmpeg pipe instead of
+# writing a trimmed copy to disk first (halves temp disk usage).
+STREAM_TRIMMED_UPLOAD = os.environ.get("PIPELINE_STREAM_TRIMMED", "0") == "1"
+
+# Relay recordings that need no trimming straight from Zoom to YouTube,
+# without a local copy.  Whether trimming is needed is decided up front by
+# analyzing the head and tail of the recording over HTTP, which needs a
+# non-zero TRIM_SCAN_WINDOW.
+RELAY_UPLOAD = os.environ.get("PIPELINE_RELAY", "0") == "1"
+
 
 # ---------------------------------------------------------------------------
 # Single-recording processing
 # ---------------------------------------------------------------------------
 
 
-def _process_recording(
-    record: dict,
-    recording_file: dict,
-    tmp_dir: str,
-) -> None:
-    """Process one Zoom recording end-to-end.
-
-    Steps executed:
-        1. Update Notion status to "処理中"
-        2. Download the Zoom recording
-        3. Auto-trim leading/trailing silence
-        4. Generate a thumbnail image
-        5. Upload to YouTube and set thumbnail
-        6. Send Discord notification (failure is swallowed)
-        7. Create a video archive record in Notion
-        8. Update Notion master status to "完了"
-
-    On any error (except Discord), the exception propagates to the caller
-    so that the master record can be marked as "エラー".
+class _AlreadyClaimed(RuntimeError):
+    """The master record was taken by another process (see
+    :func:`notion.claim_record`)."""
+
+
+class _Job:
+    """State of one recording as it moves through the pipeline stages.
 
     Args:
         record:         Parsed Notion master record dict.
         recording_file: A single Zoom recording file entry dict containing
                         ``download_url`` (and other metadata).
-        tmp_dir:        Path to a temporary directory for downloaded files.
+        work_dir:       Directory for this job's temporary files.
+        label:          Short identifier used as a log prefix.
     """
-    page_id = record["page_id"]
-    title = record["title"]
 
-    # 1. Mark as processing ------------------------------------------------
-    notion.update_status(page_id, "処理中")
+    def __init__(
+        self,
+        record: dict,
+        recording_file: dict,
+        work_dir: str,
+        label: str = "",
+    ):
+        self.record = record
+        self.recording_file = recording_file
+        self.work_dir = work_dir
+        # Artifacts of stages completed by earlier attempts.
+        self.checkpoint = checkpoint.Checkpoint.load(
+            record["page_id"], recording_file.get("id", "")
+        )
+        self.label = label or record["page_id"].replace("-", "")[:8]
+        self.raw_path = ""
+        self.trimmed_path = ""
+        # (start, end) still to be applied while uploading, when the
+        # trimmed copy is streamed rather than written to disk.
+        self.trim_window: tuple[float, float] | None = None
+        # True when the recording is relayed from Zoom to YouTube without
+        # being downloaded (no trim needed).
+        self.relay = False
+        self.thumbnail_path = ""
+        self.thumbnail_future: Future | None = None
+        self.video_id = ""
+        self.youtube_url = ""
+        # YouTube quota units charged to the ledger for this job, and the
+        # quota day they were charged to.
+        self.quota_units = 0
+        self.quota_day = ""
+        # True once an upload session was created; YouTube has charged the
+        # upload then, even if it never completes.
+        self.upload_started = False
+
+    def mark_upload_started(self) -> None:
+        self.upload_started = True
+
+
+def _stage_download(job: _Job) -> None:
+    """Admit the job against the YouTube quota, mark the record as
+    processing and download the Zoom recording.
+
+    The download is skipped when the checkpoint still holds the downloaded
+    or trimmed file, or the recording was already uploaded.
+
+    Raises:
+        quota.QuotaExceededError: If today's quota cannot cover the upload
+            and thumbnail; the record is left untouched and deferred.
+        _AlreadyClaimed: If another process (the webhook worker or a batch
+            run) has started on the record since it was matched.
+    """
+    page_id = job.record["page_id"]
+    cp = job.checkpoint
+
+    # 0. Reserve YouTube quota -----------------------------------------------
+    # Checked before anything else so a recording that cannot be uploaded
+    # today is not downloaded (or marked in Notion) for nothing.
+    units = _quota_units(cp)
+    day = quota.ledger().today()
+    if units and not quota.ledger().try_reserve(units, day):
+        raise quota.QuotaExceededError(
+            f"Not enough YouTube quota left today for '{job.record['title']}'"
+        )
+    job.quota_units = units
+    job.quota_day = day
+
+    # 1. Claim the record (marks it as processing) -------------------------
+    if not notion.claim_record(page_id, job.record.get("status") or "入力済み"):
+        raise _AlreadyClaimed(f"Record {page_id} is being processed elsewhere")
 
     # 2. Download Zoom recording -------------------------------------------
-    download_url = recording_file["download_url"]
+    if cp.get("video_id") or cp.file("trimmed"):
+        logger.info("Skipping download for '%s' (checkpoint)", job.record["title"])
+        return
+    job.raw_path = cp.file("raw")
+    if job.raw_path:
+        logger.info(
+            "Reusing downloaded recording for '%s': %s",
+            job.record["title"],
+            job.raw_path,
+        )
+        return
+
+    download_url = job.recording_file["download_url"]
+    expected_size = job.recording_file.get("file_size", 0)
     access_token = zoom.get_access_token()
-    raw_path = os.path.join(tmp_dir, f"{page_id}_raw.mp4")
-    zoom.download_recording(download_url, access_token, raw_path)
-    logger.info("Downloaded recording for '%s' to %s", title, raw_path)
+    if RELAY_UPLOAD and _needs_no_trim(download_url, access_token):
+        job.relay = True
+        logger.info(
+            "No trim needed for '%s'; relaying from Zoom to YouTube",
+            job.record["title"],
+        )
+        return
+
+    os.makedirs(job.work_dir, exist_ok=True)
+    job.raw_path = os.path.join(job.work_dir, f"{page_id}_raw.mp4")
+    if trim.STREAM_ANALYSIS:
+        # Analyze silence on the download stream so the trim stage does not
+        # have to read the file back from disk.
+        analyzer = trim.StreamAnalyzer()
+        try:
+            zoom.download_recording(
+                download_url,
+                access_token,
+                job.raw_path,
+                tee=analyzer.write,
+                expected_size=expected_size,
+            )
+        except BaseException:
+            analyzer.abort()
+            raise
+        analyzer.finish(job.raw_path)
+    else:
+        zoom.download_recording(
+            download_url, access_token, job.raw_path, expected_size=expected_size
+        )
+    cp.record_file("raw", job.raw_path)
+    logger.info(
+        "Downloaded recording for '%s' to %s", job.record["title"], job.raw_path
+    )
+
+
+def _quota_units(cp: checkpoint.Checkpoint) -> int:
+    """Return the YouTube quota still needed by a (possibly resumed) job."""
+    units = 0
+    if not cp.get("video_id"):
+        units += quota.UPLOAD_COST
+    if not cp.get("thumbnail_set"):
+        units += quota.THUMBNAIL_COST
+    return units
 
-    # 3. Auto-trim silence -------------------------------------------------
-    trimmed_path = os.path.join(tmp_dir, f"{page_id}_trimmed.mp4")
-    trimmed_path = trim.auto_trim(raw_path, trimmed_path)
-    logger.info("Trimmed video: %s", trimmed_path)
 
-    # 4. Generate thumbnail ------------------------------------------------
+def _needs_no_trim(download_url: str, access_token: str) -> bool:
+    """Return True if the remote recording has nothing to trim.
+
+    Any doubt (analysis failed, too short to decide cheaply) returns
+    False so the recording takes the regular download-and-trim path.
+    """
+    try:
+        plan = trim.remote_trim_points(
+            download_url, headers=zoom.download_headers(access_token)
+        )
+    except Exception as exc:
+        logger.warning("Remote trim analysis failed (%s); downloading", exc)
+        return False
+    if plan is None:
+        return False
+    trim_start, trim_end, duration = plan
+    return trim_start == 0.0 and trim_end == duration
+
+
+def _stage_trim(job: _Job) -> None:
+    """Auto-trim leading/trailing silence."""
+    if job.relay or job.checkpoint.get("video_id"):
+        return
+    # 3. Auto-trim silence -------------------------------------------------
+    job.trimmed_path = job.checkpoint.file("trimmed")
+    if job.trimmed_path:
+        logger.info("Reusing trimmed video: %s", job.trimmed_path)
+        return
+    trimmed_path = os.path.join(
+        job.work_dir, f"{job.record['page_id']}_trimmed.mp4"
+    )
+    cache_key = ""
+    if job.recording_file.get("id"):
+        cache_key = trim.cache_key(
+            job.recording_file["id"], job.recording_file.get("file_size", 0)
+        )
+    if STREAM_TRIMMED_UPLOAD:
+        job.trim_window = trim.plan_trim(job.raw_path, cache_key)
+        job.trimmed_path = job.raw_path
+        logger.info("Trim window: %s", job.trim_window or "none")
+    else:
+        job.trimmed_path = trim.auto_trim(job.raw_path, trimmed_path, cache_key)
+        job.checkpoint.record_file("trimmed", job.trimmed_path)
+        logger.info("Trimmed video: %s", job.trimmed_path)
+
+
+def _generate_thumbnail(record: dict, cp: checkpoint.Checkpoint) -> str:
+    """Generate the thumbnail image for *record* and return its path."""
     thumbnail_path = thumbnail.generate_thumbnail(
         record, base_dir=str(PROJECT_ROOT)
     )
+    cp.record_file("thumbnail", thumbnail_path)
     logger.info("Generated thumbnail: %s", thumbnail_path)
+    return thumbnail_path
 
-    # 5. Upload to YouTube -------------------------------------------------
-    video_id = youtube.upload_video(
-        file_path=trimmed_path,
-        title=title,
-        description=record.get("notes", ""),
-    )
-    youtube_url = youtube.get_video_url(video_id)
-    logger.info("Uploaded to YouTube: %s", youtube_url)
 
-    youtube.set_thumbnail(video_id, thumbnail_path)
-    logger.info("Thumbnail set for video %s", video_id)
+def _start_thumbnail(job: _Job, executor: ThreadPoolExecutor) -> None:
+    """Start thumbnail generation for *job* in the background.
+
+    The thumbnail only depends on the Notion record, so it is generated
+    while the recording is still downloading and trimming; the upload
+    stage joins on the result.  A thumbnail already set on YouTube, or
+    generated by an earlier attempt, is not generated again.
+    """
+    cp = job.checkpoint
+    if cp.get("thumbnail_set"):
+        job.thumbnail_future = Future()
+        job.thumbnail_future.set_result("")
+        return
+    path = cp.file("thumbnail")
+    if path:
+        logger.info("Reusing thumbnail: %s", path)
+        job.thumbnail_future = Future()
+        job.thumbnail_future.set_result(path)
+        return
+    job.thumbnail_future = executor.submit(_generate_thumbnail, job.record, cp)
+
+
+def _stage_upload(job: _Job) -> None:
+    """Upload the trimmed video to YouTube and set its thumbnail."""
+    # 4. Wait for the thumbnail generated in the background ----------------
+    # Joined before uploading so that a thumbnail failure never leaves an
+    # orphaned video on YouTube.
+    job.thumbnail_path = job.thumbnail_future.result()
+    cp = job.checkpoint
+
+    # 5. Upload to YouTube -------------------------------------------------
+    # The video ID is checkpointed right away: a retry after a later
+    # failure must never upload the recording a second time.
+    job.video_id = cp.get("video_id", "")
+    if job.video_id:
+        logger.info("Already uploaded as %s; skipping upload", job.video_id)
+    elif job.relay:
+        with zoom.RecordingStream(
+            job.recording_file["download_url"], zoom.get_access_token()
+        ) as stream:
+            job.video_id = youtube.upload_stream(
+                stream,
+                title=job.record["title"],
+                description=job.record.get("notes", ""),
+                total_size=stream.size,
+                on_session=job.mark_upload_started,
+            )
+    elif job.trim_window is not None:
+        start, end = job.trim_window
+        with trim.TrimmedStream(job.raw_path, start, end) as stream:
+            job.video_id = youtube.upload_stream(
+                stream,
+                title=job.record["title"],
+                description=job.record.get("notes", ""),
+                on_session=job.mark_upload_started,
+            )
+    else:
+        job.video_id = youtube.upload_video(
+            file_path=job.trimmed_path,
+            title=job.record["title"],
+            description=job.record.get("notes", ""),
+            on_session=job.mark_upload_started,
+        )
+    if not cp.get("video_id"):
+        cp.record(video_id=job.video_id)
+    job.youtube_url = youtube.get_video_url(job.video_id)
+    logger.info("Uploaded to YouTube: %s", job.youtube_url)
+
+    if not cp.get("thumbnail_set"):
+        youtube.set_thumbnail(job.video_id, job.thumbnail_path)
+        cp.record(thumbnail_set=True)
+        logger.info("Thumbnail set for video %s", job.video_id)
+
+    # The local video files are no longer needed; free the disk space
+    # before the job waits on the publish stage.
+    for path in {job.raw_path, job.trimmed_path}:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+def _stage_publish(job: _Job) -> None:
+    """Notify Discord, create the archive record and mark the record done."""
+    record = job.record
+    page_id = record["page_id"]
+    title = record["title"]
+    video_id = job.video_id
+    youtube_url = job.youtube_url
+    cp = job.checkpoint
 
     # 6. Discord notification (never fail) ---------------------------------
     # Build Notion page URL from page_id
@@ -115,7 +383,9 @@ def _process_recording(
     # Use YouTube auto-generated thumbnail for Discord embed
     discord_thumbnail_url = f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg"
 
-    discord_mod.send_notification(
+    if cp.get("discord_sent"):
+        logger.info("Discord notification already sent for '%s'", title)
+    elif discord_mod.send_notification(
         title=title,
         youtube_url=youtube_url,
         thumbnail_url=discord_thumbnail_url,
@@ -124,119 +394,259 @@ def _process_recording(
         notion_url=notion_page_url,
         thumbnail_text=record.get("thumbnail_text", ""),
         student_name=record.get("student_name", ""),
-    )
+    ):
+        cp.record(discord_sent=True)
 
     # 7. Create video archive record ---------------------------------------
-    start_date = record.get("start_time", "")[:10]  # ISO date portion
-    # Use YouTube's auto-generated thumbnail as the Notion サムネイル
-    thumbnail_url = f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg"
-    notion.create_video_record(
-        title=title,
-        category=record.get("category", ""),
-        date=start_date,
-        lecturer=record.get("lecturer_name", ""),
-        youtube_url=youtube_url,
-        thumbnail_url=thumbnail_url,
-        student_name=record.get("student_name", ""),
-    )
-    logger.info("Created video archive record for '%s'", title)
+    if cp.get("archive_page_id"):
+        logger.info(
+            "Video archive record for '%s' already exists: %s",
+            title,
+            cp.get("archive_page_id"),
+        )
+    else:
+        start_date = record.get("start_time", "")[:10]  # ISO date portion
+        # Use YouTube's auto-generated thumbnail as the Notion サムネイル
+        thumbnail_url = f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg"
+        archive_page_id = notion.create_video_record(
+            title=title,
+            category=record.get("category", ""),
+            date=start_date,
+            lecturer=record.get("lecturer_name", ""),
+            youtube_url=youtube_url,
+            thumbnail_url=thumbnail_url,
+            student_name=record.get("student_name", ""),
+        )
+        cp.record(archive_page_id=archive_page_id)
+        logger.info("Created video archive record for '%s'", title)
 
     # 8. Mark master record as complete ------------------------------------
     notion.update_status(page_id, "完了", youtube_url=youtube_url)
     logger.info("Pipeline complete for '%s'", title)
 
+    # 9. Remember the file as processed (never fail) -----------------------
+    try:
+        _get_catalog().mark_processed(job.recording_file["id"], page_id)
+    except Exception:
+        logger.exception("Failed to record '%s' in the catalog", title)
+
+    # The record is done; its checkpoint and work files are not needed.
+    cp.clear()
+
+
+# Stage functions in execution order.
+_STAGES = [
+    ("download", _stage_download),
+    ("trim", _stage_trim),
+    ("upload", _stage_upload),
+    ("publish", _stage_publish),
+]
+
 
 # ---------------------------------------------------------------------------
-# Processing wrapper with error handling
+# Failure handling
 # ---------------------------------------------------------------------------
 
 
-def _safe_process(
-    record: dict,
-    recording_file: dict,
-    tmp_dir: str,
-) -> None:
-    """Wrap :func:`_process_recording` with error handling and Notion updates.
+def _handle_failure(record: dict, exc: BaseException) -> None:
+    """Mark a master record as failed in Notion.
 
-    On failure the master record is updated to "エラー" (or "要手動対応"
-    when the retry count has reached the maximum).
+    The record is updated to "エラー" (or "要手動対応" when the retry count
+    has reached the maximum).  Notion failures are logged, never raised.
 
     Args:
-        record:         Parsed Notion master record dict.
-        recording_file: A single Zoom recording file entry dict.
-        tmp_dir:        Temporary directory for downloads.
+        record: Parsed Notion master record dict.
+        exc:    The exception that aborted processing.
     """
     page_id = record["page_id"]
-    title = record.get("title", "(unknown)")
+    retry_count = record.get("retry_count", 0)
+    error_msg = str(exc)
+
+    if retry_count + 1 >= MAX_RETRY_COUNT:
+        target_status = "要手動対応"
+    else:
+        target_status = "エラー"
 
     try:
-        _process_recording(record, recording_file, tmp_dir)
-    except Exception as exc:
-        logger.exception("Error processing '%s' (page_id=%s)", title, page_id)
+        notion.update_status(page_id, target_status, error_msg=error_msg)
+    except Exception:
+        logger.exception(
+            "Failed to update Notion status for page_id=%s", page_id
+        )
 
-        retry_count = record.get("retry_count", 0)
-        error_msg = str(exc)
 
-        if retry_count + 1 >= MAX_RETRY_COUNT:
-            target_status = "要手動対応"
-        else:
-            target_status = "エラー"
+# ---------------------------------------------------------------------------
+# Top-level pipeline
+# ---------------------------------------------------------------------------
+
+
+def _stage_workers(name: str) -> int:
+    """Return the concurrency limit for a stage (env-overridable)."""
+    env_name = f"PIPELINE_{name.upper()}_WORKERS"
+    return int(os.environ.get(env_name, STAGE_WORKERS[name]))
+
+
+def _on_job_error(job: _Job, stage_name: str, exc: BaseException) -> None:
+    """StagedPipeline error callback: log and mark failed.
+
+    A quota error defers the job instead of marking it failed, so running
+    out of quota never uses up a record's retries.  The work directory is
+    kept: together with the job's checkpoint it lets the retry resume from
+    the failed stage.  Reserved quota that was not spent is refunded.
+    """
+    if job.quota_units:
+        # Give back the units of whatever YouTube never charged: the
+        # upload unless a session was started, the thumbnail unless it
+        # was set.  Refund into the day the units were reserved on.
+        unused = 0
+        if not job.video_id and not job.upload_started:
+            unused += quota.UPLOAD_COST
+        if not job.checkpoint.get("thumbnail_set"):
+            unused += quota.THUMBNAIL_COST
+        unused = min(unused, job.quota_units)
+        if unused:
+            quota.ledger().refund(unused, job.quota_day or None)
+        job.quota_units = 0
+
+    if isinstance(exc, quota.QuotaExceededError):
+        _defer(job, stage_name, exc)
+    elif isinstance(exc, _AlreadyClaimed):
+        logger.info("Skipping '%s': %s", job.record.get("title", "(unknown)"), exc)
+    else:
+        logger.error(
+            "Error in stage '%s' for '%s' (page_id=%s)",
+            stage_name,
+            job.record.get("title", "(unknown)"),
+            job.record["page_id"],
+            exc_info=exc,
+        )
+        _handle_failure(job.record, exc)
+    if job.thumbnail_future is not None:
+        job.thumbnail_future.cancel()
+
 
+def _defer(job: _Job, stage_name: str, exc: BaseException) -> None:
+    """Postpone a job that ran out of YouTube quota to a later run.
+
+    The recording file is recorded as deferred in the catalog, so the next
+    run offers it before any new recording.  If the record had already been
+    marked "処理中" it is put back to "入力済み"; Notion failures are logged,
+    never raised.
+    """
+    record = job.record
+    logger.warning(
+        "Deferring '%s' (page_id=%s) in stage '%s': %s",
+        record.get("title", "(unknown)"),
+        record["page_id"],
+        stage_name,
+        exc,
+    )
+    try:
+        _get_catalog().defer(job.recording_file["id"], str(exc))
+    except Exception:
+        logger.exception("Failed to record deferral of '%s'", record["page_id"])
+
+    if stage_name != "download":
         try:
-            notion.update_status(page_id, target_status, error_msg=error_msg)
+            notion.update_status(
+                record["page_id"],
+                "入力済み",
+                error_msg="YouTube quota exhausted; deferred to the next run",
+            )
         except Exception:
             logger.exception(
-                "Failed to update Notion status for page_id=%s", page_id
+                "Failed to update Notion status for page_id=%s",
+                record["page_id"],
             )
 
 
-# ---------------------------------------------------------------------------
-# Top-level pipeline
-# ---------------------------------------------------------------------------
-
+def _run_jobs(jobs) -> int:
+    """Run ``(record, recording_file)`` jobs through the staged pipeline.
 
-def run_pipeline() -> None:
-    """Execute the full automation pipeline.
+    Each job works in its master record's persistent work directory (see
+    :func:`checkpoint.work_dir`), which survives a failure so the retry
+    can resume.  A record offered twice in one run is only processed
+    once, so two jobs never share a work directory.  Thumbnail generation
+    for a job starts as soon as the job is taken from *jobs*, on a
+    separate pool sized by the ``thumbnail`` worker limit.
 
-    1. Retry previously failed records (ステータス=エラー, retry < 3).
-    2. Fetch new Zoom recordings from the last 24 hours.
-    3. Match each recording with a Notion master record.
-    4. Process each matched recording independently.
+    Args:
+        jobs: Iterable of ``(record, recording_file)`` tuples.  May be a
+              generator; it is consumed while earlier jobs are already
+              being processed.
 
-    All recordings are processed in isolation -- one failure does not
-    prevent subsequent recordings from being processed.  Temporary files
-    are cleaned up at the end regardless of success or failure.
+    Returns:
+        The number of jobs processed.
     """
-    tmp_dir = tempfile.mkdtemp(prefix="cs_movie_")
-    logger.info("Temporary directory: %s", tmp_dir)
 
+    thumbnail_pool = ThreadPoolExecutor(
+        max_workers=_stage_workers("thumbnail"),
+        thread_name_prefix="thumbnail",
+    )
+
+    def _wrap():
+        seen: set[str] = set()
+        for index, (record, rec_file) in enumerate(jobs, start=1):
+            page_id = record["page_id"]
+            if page_id in seen:
+                logger.info("Record %s already queued in this run; skipping", page_id)
+                continue
+            seen.add(page_id)
+            label = f"{index:02d}-{page_id.replace('-', '')[:8]}"
+            job = _Job(record, rec_file, checkpoint.work_dir(page_id), label)
+            _start_thumbnail(job, thumbnail_pool)
+            yield job
+
+    engine = pipeline.StagedPipeline(
+        [
+            pipeline.Stage(name, func, _stage_workers(name))
+            for name, func in _STAGES
+        ],
+        queue_size=PIPELINE_QUEUE_SIZE,
+        on_error=_on_job_error,
+        label=lambda job: job.label,
+    )
     try:
-        # ---- Phase 1: retry error records --------------------------------
-        logger.info("=== Phase 1: Retrying error records ===")
+        return engine.run(_wrap())
+    finally:
+        thumbnail_pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_retry_jobs():
+    """Yield ``(record, recording_file)`` jobs for records in エラー state.
+
+    For retry records we don't have a specific recording_file from Zoom, so
+    recordings around each record's start time are re-fetched to find one.
+    """
+    logger.info("=== Phase 1: Retrying error records ===")
+    try:
+        error_records = notion.find_error_records()
+    except Exception:
+        logger.exception("Failed to fetch error records from Notion")
+        error_records = []
+
+    for record in error_records:
+        logger.info(
+            "Retrying error record: page_id=%s title=%s (retry #%d)",
+            record["page_id"],
+            record["title"],
+            record.get("retry_count", 0) + 1,
+        )
         try:
-            error_records = notion.find_error_records()
-        except Exception:
-            logger.exception("Failed to fetch error records from Notion")
-            error_records = []
+            start_time = record.get("start_time", "")
+            if not start_time:
+                logger.warning(
+                    "No start_time on error record %s; skipping",
+                    record["page_id"],
+                )
+                continue
 
-        for record in error_records:
-            logger.info(
-                "Retrying error record: page_id=%s title=%s (retry #%d)",
-                record["page_id"],
-                record["title"],
-                record.get("retry_count", 0) + 1,
+            matched_file = _find_recording_file_for_record(
+                record, _get_catalog().meetings_near(start_time)
             )
-            # For retry records we don't have a specific recording_file from
-            # Zoom.  Re-fetch recordings to find a match.
-            try:
-                start_time = record.get("start_time", "")
-                if not start_time:
-                    logger.warning(
-                        "No start_time on error record %s; skipping",
-                        record["page_id"],
-                    )
-                    continue
-
+            if not matched_file:
+                # Not in the local catalog (e.g. older than its first
+                # sync): fall back to asking Zoom directly.
                 zoom_dt = datetime.fromisoformat(
                     start_time.replace("Z", "+00:00")
                 )
@@ -244,70 +654,209 @@ def run_pipeline() -> None:
                 to_date = (zoom_dt + timedelta(days=1)).strftime("%Y-%m-%d")
 
                 recordings = zoom.list_recordings(from_date, to_date)
+                for meeting in recordings:
+                    _get_catalog().upsert_meeting(meeting)
                 matched_file = _find_recording_file_for_record(
                     record, recordings
                 )
-                if not matched_file:
-                    logger.warning(
-                        "No Zoom recording found for retry record %s",
-                        record["page_id"],
-                    )
-                    continue
-
-                _safe_process(record, matched_file, tmp_dir)
-            except Exception:
-                logger.exception(
-                    "Unexpected error during retry of %s", record["page_id"]
+            if not matched_file:
+                logger.warning(
+                    "No Zoom recording found for retry record %s",
+                    record["page_id"],
                 )
+                continue
+        except Exception:
+            logger.exception(
+                "Unexpected error during retry of %s", record["page_id"]
+            )
+            continue
+
+        yield record, matched_file
 
-        # ---- Phase 2: process new recordings -----------------------------
-        logger.info("=== Phase 2: Processing new Zoom recordings ===")
-        today = datetime.now()
-        from_date = (today - timedelta(days=1)).strftime("%Y-%m-%d")
-        to_date = today.strftime("%Y-%m-%d")
 
+def _iter_new_jobs():
+    """Yield ``(record, recording_file)`` jobs for new Zoom recordings.
+
+    Meetings deferred by an earlier run for lack of YouTube quota are
+    offered first, longest-deferred first.  Then the local catalog is
+    synced with Zoom and every meeting that has not been processed yet is
+    offered -- first those listed by this sync, as they arrive, then older
+    pending ones from the catalog.  Only the best recording file of each
+    meeting is processed.
+    """
+    logger.info("=== Phase 2: Processing new Zoom recordings ===")
+    cat = _get_catalog()
+    offered: set[str] = set()
+
+    deferred = cat.deferred_meetings()
+    if deferred:
+        logger.info(
+            "%d deferred meeting(s); %d YouTube quota unit(s) left today",
+            len(deferred),
+            quota.ledger().remaining(),
+        )
+    for meeting in deferred:
+        offered.add(meeting["uuid"])
+        yield from _match_meeting(meeting)
+
+    for meeting in _iter_synced_meetings(cat):
+        uuid = meeting.get("uuid") or str(meeting["meeting_id"])
+        if uuid in offered:
+            continue
+        offered.add(uuid)
+        if not cat.is_meeting_processed(meeting) and cat.match_due(uuid):
+            yield from _match_meeting(meeting)
+
+    for meeting in cat.pending_meetings():
+        if meeting["uuid"] not in offered:
+            offered.add(meeting["uuid"])
+            yield from _match_meeting(meeting)
+
+    logger.info("Offered %d meeting(s) for matching", len(offered))
+
+
+def _match_meeting(meeting: dict):
+    """Yield a job for *meeting* if it matches a Notion record.
+
+    The job carries the meeting's best recording file (see
+    :func:`zoom.select_best_file`).
+    """
+    start_time = meeting.get("start_time", "")
+    topic = meeting.get("topic", "")
+    logger.info(
+        "Processing meeting: topic='%s' start_time=%s",
+        topic,
+        start_time,
+    )
+
+    # Match with Notion master DB
+    try:
+        record = notion.find_matching_record(start_time)
+    except Exception:
+        logger.exception(
+            "Failed to query Notion for meeting '%s'", topic
+        )
+        return
+
+    if record is None:
+        logger.info(
+            "No matching Notion record for '%s' at %s; skipping",
+            topic,
+            start_time,
+        )
+        uuid = meeting.get("uuid") or str(meeting.get("meeting_id", ""))
         try:
-            recordings = zoom.list_recordings(from_date, to_date)
+            _get_catalog().record_unmatched(uuid)
         except Exception:
-            logger.exception("Failed to list Zoom recordings")
-            recordings = []
-
-        logger.info("Found %d meeting(s) with recordings", len(recordings))
-
-        for meeting in recordings:
-            start_time = meeting.get("start_time", "")
-            topic = meeting.get("topic", "")
-            logger.info(
-                "Processing meeting: topic='%s' start_time=%s",
-                topic,
-                start_time,
-            )
+            logger.exception("Failed to record the Notion miss for '%s'", topic)
+        return
+
+    rec_file = zoom.select_best_file(meeting.get("recording_files", []))
+    if rec_file is None:
+        return
+    logger.info(
+        "Selected %s file (%d of %d) for '%s'",
+        rec_file.get("recording_type", "?"),
+        meeting["recording_files"].index(rec_file) + 1,
+        len(meeting["recording_files"]),
+        topic,
+    )
+    yield record, rec_file
 
-            # Match with Notion master DB
-            try:
-                record = notion.find_matching_record(start_time)
-            except Exception:
-                logger.exception(
-                    "Failed to query Notion for meeting '%s'", topic
-                )
-                continue
 
-            if record is None:
-                logger.info(
-                    "No matching Notion record for '%s' at %s; skipping",
-                    topic,
-                    start_time,
-                )
-                continue
+def _iter_synced_meetings(cat: catalog.Catalog):
+    """Stream meetings from :func:`catalog.iter_sync`.
+
+    A listing failure is logged and ends the stream; meetings yielded
+    before it (and everything already in the catalog) are still
+    processed.
+    """
+    try:
+        yield from catalog.iter_sync(cat)
+    except Exception:
+        logger.exception("Failed to sync Zoom recordings into the catalog")
+
+
+_catalog: catalog.Catalog | None = None
+_catalog_lock = threading.Lock()
+
+
+def _get_catalog() -> catalog.Catalog:
+    """Return the process-wide catalog, opening it on first use."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = catalog.Catalog()
+        return _catalog
+
+
+def run_pipeline() -> None:
+    """Execute the full automation pipeline.
+
+    1. Retry previously failed records (ステータス=エラー, retry < 3).
+    2. Offer recordings deferred for lack of YouTube quota, then fetch new
+       Zoom recordings since the last sync.
+    3. Match each recording with a Notion master record.
+    4. Process each matched recording independently, as long as the day's
+       YouTube quota covers it (see :mod:`quota`); the rest are deferred.
 
-            # Process each recording file for this meeting
-            for rec_file in meeting.get("recording_files", []):
-                _safe_process(record, rec_file, tmp_dir)
+    All recordings are processed in isolation -- one failure does not
+    prevent other recordings from being processed.  Jobs flow through a
+    staged pipeline (download → trim → upload → publish) as soon as they
+    are matched, with the thumbnail generated alongside, so different
+    recordings occupy different stages at the same time.  Each completed
+    stage is checkpointed (see :mod:`checkpoint`), so a failed record's
+    retry resumes from the stage that failed; a record's work files are
+    removed once it completes.
+    """
+    logger.info("Work directory: %s", checkpoint.WORK_DIR)
+    checkpoint.prune()
 
+    def _all_jobs():
+        yield from _iter_retry_jobs()
+        yield from _iter_new_jobs()
+
+    try:
+        _run_jobs(_all_jobs())
     finally:
-        # Clean up temporary files
-        logger.info("Cleaning up temporary directory: %s", tmp_dir)
-        shutil.rmtree(tmp_dir, ignore_errors=True)
+        transport.log_stats()
+
+
+def process_meeting(meeting: dict) -> int:
+    """Process the recordings of a single Zoom meeting immediately.
+
+    Used for event-driven processing (the ``recording.completed`` webhook
+    in ``web/app.py``).  The meeting is stored in the catalog, matched
+    against the Notion master DB and, unless it was already processed, its
+    best recording file is run through the same staged pipeline as a
+    batch run.
+
+    Args:
+        meeting: Meeting object in Zoom's API shape (``uuid``, ``id``,
+                 ``start_time``, ``recording_files``, ...), e.g. the
+                 ``payload.object`` of a webhook event.
+
+    Returns:
+        The number of recording files processed (0 or 1).
+    """
+    normalized = zoom.normalize_meeting(meeting)
+    if normalized is None:
+        logger.info(
+            "Meeting '%s' has no usable MP4 recording; ignoring",
+            meeting.get("topic", ""),
+        )
+        return 0
+
+    cat = _get_catalog()
+    cat.upsert_meeting(normalized)
+    if cat.is_meeting_processed(normalized):
+        return 0
+    jobs = list(_match_meeting(normalized))
+    if not jobs:
+        return 0
+
+    _run_jobs(jobs)
+    return len(jobs)
 
 
 # ---------------------------------------------------------------------------
@@ -329,7 +878,8 @@ def _find_recording_file_for_record(
         recordings: List of meetings returned by :func:`zoom.list_recordings`.
 
     Returns:
-        The first matching recording file dict, or ``None``.
+        The best recording file (see :func:`zoom.select_best_file`) of the
+        matching meeting, or ``None``.
     """
     record_start = record.get("start_time", "")
     if not record_start:
@@ -347,9 +897,9 @@ def _find_recording_file_for_record(
         )
 
         if abs((meeting_dt - record_dt).total_seconds()) <= 1800:
-            files = meeting.get("recording_files", [])
-            if files:
-                return files[0]
+            best = zoom.select_best_file(meeting.get("recording_files", []))
+            if best:
+                return best
 
     return None
 
@@ -359,13 +909,9 @@ def _find_recording_file_for_record(
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    from dotenv import load_dotenv
-
-    load_dotenv(dotenv_path=str(PROJECT_ROOT / ".env"))
-
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        format="%(asctime)s [%(levelname)s] [%(threadName)s] %(name)s: %(message)s",
     )
 
     logger.info("Starting SNS Club Portal automation pipeline")
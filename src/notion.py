@@ -11,9 +11,10 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import requests
 from dateutil import parser as dateutil_parser
 
+import transport
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -215,7 +216,7 @@ def find_matching_record(zoom_start_time: str) -> dict | None:
         window_end.isoformat(),
     )
 
-    resp = requests.post(url, headers=_headers(), json=payload, timeout=30)
+    resp = transport.post(url, headers=_headers(), json=payload, timeout=30)
     resp.raise_for_status()
     data = resp.json()
 
@@ -274,7 +275,7 @@ def update_status(
     payload: dict[str, Any] = {"properties": properties}
 
     logger.info("Updating page %s: status=%s", page_id, status)
-    resp = requests.patch(url, headers=_headers(), json=payload, timeout=30)
+    resp = transport.patch(url, headers=_headers(), json=payload, timeout=30)
     resp.raise_for_status()
     logger.info("Successfully updated page %s", page_id)
 
@@ -282,13 +283,50 @@ def update_status(
 def _get_current_retry_count(page_id: str) -> int:
     """Fetch the current リトライ回数 for a page."""
     url = f"{BASE_URL}/pages/{page_id}"
-    resp = requests.get(url, headers=_headers(), timeout=30)
+    resp = transport.get(url, headers=_headers(), timeout=30)
     resp.raise_for_status()
     page = resp.json()
     props = page.get("properties", {})
     return _get_number(props.get("リトライ回数", {}))
 
 
+def claim_record(page_id: str, expected_status: str = "入力済み") -> bool:
+    """Set a master record to "処理中" unless another process got there first.
+
+    Re-reads ステータス and only writes "処理中" if it still equals
+    *expected_status*, so the web app's webhook worker and the scheduled
+    batch run (which share nothing but Notion) do not both process the
+    same record.  Notion has no atomic compare-and-set, so two claims
+    within the same round trip can still both succeed; the window is one
+    GET.
+
+    Parameters
+    ----------
+    page_id:
+        The Notion page ID to claim.
+    expected_status:
+        ステータス the record had when it was selected for processing.
+
+    Returns
+    -------
+    ``True`` if the record was claimed, ``False`` if its status changed.
+    """
+    url = f"{BASE_URL}/pages/{page_id}"
+    resp = transport.get(url, headers=_headers(), timeout=30)
+    resp.raise_for_status()
+    current = _get_select(resp.json().get("properties", {}).get("ステータス", {}))
+    if current != expected_status:
+        logger.info(
+            "Page %s is '%s', not '%s'; already claimed elsewhere",
+            page_id,
+            current,
+            expected_status,
+        )
+        return False
+    update_status(page_id, "処理中")
+    return True
+
+
 def _thumbnail_files_prop(thumbnail_url: str) -> dict[str, Any]:
     """Build a サムネイル files property value."""
     return {
@@ -380,7 +418,7 @@ def create_video_record(
 
     url = f"{BASE_URL}/pages"
     logger.info("Creating video archive record: title=%s category=%s", title, category)
-    resp = requests.post(url, headers=_headers(), json=payload, timeout=30)
+    resp = transport.post(url, headers=_headers(), json=payload, timeout=30)
     resp.raise_for_status()
 
     page_id = resp.json()["id"]
@@ -411,7 +449,7 @@ def create_video_record(
 
         logger.info("Creating genre record in DB %s for category=%s", genre_db_id, category)
         try:
-            resp2 = requests.post(url, headers=_headers(), json=genre_payload, timeout=30)
+            resp2 = transport.post(url, headers=_headers(), json=genre_payload, timeout=30)
             resp2.raise_for_status()
             logger.info("Created genre record: page_id=%s", resp2.json()["id"])
         except Exception:
@@ -490,7 +528,7 @@ def create_master_record(
 
     url = f"{BASE_URL}/pages"
     logger.info("Creating master record: title=%s category=%s", title, category)
-    resp = requests.post(url, headers=_headers(), json=payload, timeout=30)
+    resp = transport.post(url, headers=_headers(), json=payload, timeout=30)
     resp.raise_for_status()
 
     page = resp.json()
@@ -525,7 +563,7 @@ def find_error_records() -> list[dict]:
     url = f"{BASE_URL}/databases/{NOTION_MASTER_DB_ID}/query"
     logger.info("Querying master DB for error records (retry_count < 3)")
 
-    resp = requests.post(url, headers=_headers(), json=payload, timeout=30)
+    resp = transport.post(url, headers=_headers(), json=payload, timeout=30)
     resp.raise_for_status()
     data = resp.json()
 
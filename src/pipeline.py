@@ -0,0 +1,177 @@
+"""Staged pipeline engine.
+
+Runs items through a fixed sequence of stages, each backed by its own pool
+of worker threads and connected to the next stage by a bounded queue::
+
+    items ──▶ [download ×2] ──▶ q ──▶ [trim ×1] ──▶ q ──▶ [upload ×1] ──▶ ...
+
+Because every stage works on a different item at the same time, item N+1
+can be downloading while item N is being trimmed and item N-1 is uploading.
+Total wall time therefore approaches the time of the slowest stage rather
+than the sum of all stages.  The bounded queues provide back-pressure so a
+fast stage cannot run arbitrarily far ahead of a slow one (e.g. filling the
+disk with downloads that are still waiting to be uploaded).
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the input for one worker of a stage.
+_STOP = object()
+
+
+class Stage:
+    """A single pipeline stage.
+
+    Args:
+        name:    Stage name, used in thread names and log messages.
+        func:    Callable invoked with each item.  Its return value is
+                 ignored; the same item is passed on to the next stage.
+        workers: Maximum number of items this stage processes at once.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], None], workers: int = 1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, workers={self.workers})"
+
+
+class StagedPipeline:
+    """Run items through a sequence of :class:`Stage` objects concurrently.
+
+    An item that raises in any stage is handed to *on_error* and dropped
+    from the pipeline; other items are unaffected.  Items that complete
+    the final stage are handed to *on_done*.
+
+    Args:
+        stages:     Stages in execution order.
+        queue_size: Capacity of the queue in front of every stage.
+        on_error:   ``on_error(item, stage_name, exc)`` callback.
+        on_done:    ``on_done(item)`` callback for fully processed items.
+        label:      ``label(item)`` returning a short identifier used as
+                    the worker thread name while it processes the item,
+                    so log lines from every module carry that prefix.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        queue_size: int = 2,
+        on_error: Callable[[Any, str, BaseException], None] | None = None,
+        on_done: Callable[[Any], None] | None = None,
+        label: Callable[[Any], str] | None = None,
+    ):
+        if not stages:
+            raise ValueError("StagedPipeline requires at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, int(queue_size))
+        self.on_error = on_error
+        self.on_done = on_done
+        self.label = label
+
+    def run(self, items: Iterable[Any]) -> int:
+        """Feed *items* through all stages and block until they finish.
+
+        *items* may be a lazy iterable (e.g. a generator that is still
+        querying an API); it is consumed on the calling thread while the
+        stages are already processing earlier items.
+
+        Args:
+            items: Items to process.
+
+        Returns:
+            The number of items fed into the pipeline.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads: list[list[threading.Thread]] = []
+
+        for index, stage in enumerate(self.stages):
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            stage_threads = [
+                threading.Thread(
+                    target=self._worker,
+                    args=(stage, inbox, outbox),
+                    name=f"{stage.name}-{n}",
+                    daemon=True,
+                )
+                for n in range(1, stage.workers + 1)
+            ]
+            for t in stage_threads:
+                t.start()
+            threads.append(stage_threads)
+
+        logger.info(
+            "Started staged pipeline: %s",
+            ", ".join(f"{s.name}×{s.workers}" for s in self.stages),
+        )
+
+        fed = 0
+        try:
+            for item in items:
+                queues[0].put(item)
+                fed += 1
+        finally:
+            # Shut stages down in order: a stage only receives its stop
+            # markers once every worker of the previous stage has exited,
+            # so no item can be enqueued behind a stop marker.
+            for index, stage in enumerate(self.stages):
+                for _ in range(stage.workers):
+                    queues[index].put(_STOP)
+                for t in threads[index]:
+                    t.join()
+
+        logger.info("Staged pipeline finished: %d item(s)", fed)
+        return fed
+
+    def _worker(
+        self,
+        stage: Stage,
+        inbox: queue.Queue,
+        outbox: queue.Queue | None,
+    ) -> None:
+        """Worker loop for one thread of *stage*."""
+        thread = threading.current_thread()
+        idle_name = thread.name
+
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                return
+
+            if self.label is not None:
+                thread.name = f"{stage.name}:{self.label(item)}"
+            try:
+                stage.func(item)
+            except Exception as exc:
+                self._report_error(item, stage.name, exc)
+                continue
+            finally:
+                thread.name = idle_name
+
+            if outbox is not None:
+                outbox.put(item)
+            elif self.on_done is not None:
+                try:
+                    self.on_done(item)
+                except Exception:
+                    logger.exception("on_done callback failed")
+
+    def _report_error(self, item: Any, stage_name: str, exc: BaseException) -> None:
+        """Hand a failed item to the error callback (never raises)."""
+        if self.on_error is None:
+            logger.error("Stage '%s' failed: %s", stage_name, exc, exc_info=exc)
+            return
+        try:
+            self.on_error(item, stage_name, exc)
+        except Exception:
+            logger.exception("on_error callback failed for stage '%s'", stage_name)
@@ -0,0 +1,180 @@
+"""YouTube Data API quota ledger.
+
+YouTube grants a daily quota (10,000 units by default) that resets at
+midnight Pacific time.  Every upload costs 1600 units and every thumbnail
+50, so a backfill or a big retry day can run out part-way through and
+fail the remaining uploads.
+
+The ledger records the units spent per Pacific-time day in a JSON file so
+the count survives between runs, and the pipeline admits a recording only
+when its full cost still fits into the day's budget.  Recordings that do
+not fit are deferred to a later run instead of failing.  When YouTube
+itself reports the quota as exhausted the ledger marks the day as used up.
+
+Environment variables (optional):
+    YOUTUBE_DAILY_QUOTA  - Daily quota in units (default 10000)
+    YOUTUBE_QUOTA_LEDGER - Ledger file (default <project>/.cache/youtube_quota.json)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_COST = 1600
+THUMBNAIL_COST = 50
+# Units reserved for one recording: the upload plus its thumbnail.
+JOB_COST = UPLOAD_COST + THUMBNAIL_COST
+
+DAILY_LIMIT = int(os.environ.get("YOUTUBE_DAILY_QUOTA", "10000"))
+LEDGER_PATH = os.environ.get(
+    "YOUTUBE_QUOTA_LEDGER",
+    str(Path(__file__).resolve().parent.parent / ".cache" / "youtube_quota.json"),
+)
+
+# The quota day starts at midnight in this time zone.
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# Days of history kept in the ledger file.
+_KEEP_DAYS = 14
+
+
+class QuotaExceededError(RuntimeError):
+    """The YouTube quota for the current day is used up."""
+
+
+class QuotaLedger:
+    """Persistent, thread-safe record of quota units spent per day.
+
+    Args:
+        path:        JSON ledger file.
+        daily_limit: Units available per Pacific-time day.
+    """
+
+    def __init__(self, path: str = LEDGER_PATH, daily_limit: int = DAILY_LIMIT):
+        self.path = path
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+        self._days: dict[str, dict] = self._load()
+
+    @staticmethod
+    def today() -> str:
+        """Return the current quota day (Pacific time) as ``YYYY-MM-DD``."""
+        return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("days", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        """Write the ledger atomically.  Must be called with the lock held."""
+        for day in sorted(self._days)[:-_KEEP_DAYS]:
+            del self._days[day]
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"days": self._days}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.warning("Could not save quota ledger %s", self.path, exc_info=True)
+
+    def _entry(self, day: str | None = None) -> dict:
+        return self._days.setdefault(day or self.today(), {"spent": 0})
+
+    def remaining(self) -> int:
+        """Return the units still available today."""
+        with self._lock:
+            return max(0, self.daily_limit - self._entry()["spent"])
+
+    def try_reserve(self, units: int, day: str | None = None) -> bool:
+        """Charge *units* to today if they fit into the remaining budget.
+
+        Args:
+            units: Units to charge.
+            day:   Quota day to charge (see :meth:`today`).  Pass the day
+                   the caller recorded, so a later :meth:`refund` goes back
+                   to the same day even after midnight Pacific time.
+
+        Returns:
+            ``True`` if the units were charged, ``False`` if they do not fit
+            or YouTube has reported the day exhausted (nothing is charged
+            then).
+        """
+        with self._lock:
+            entry = self._entry(day)
+            if entry.get("exhausted"):
+                logger.info(
+                    "YouTube quota: %s is exhausted; %d unit(s) refused",
+                    day or self.today(),
+                    units,
+                )
+                return False
+            if entry["spent"] + units > self.daily_limit:
+                logger.info(
+                    "YouTube quota: %d unit(s) needed, %d of %d left today",
+                    units,
+                    max(0, self.daily_limit - entry["spent"]),
+                    self.daily_limit,
+                )
+                return False
+            entry["spent"] += units
+            self._save()
+            return True
+
+    def refund(self, units: int, day: str | None = None) -> None:
+        """Return units reserved for work that never reached YouTube.
+
+        Args:
+            units: Units to return.
+            day:   Quota day the units were reserved on.  Defaults to
+                   today.
+
+        Nothing is returned to a day YouTube reported exhausted: its real
+        usage is unknown, and reopening it would admit jobs that can only
+        fail at upload.
+        """
+        with self._lock:
+            entry = self._entry(day)
+            if entry.get("exhausted"):
+                return
+            entry["spent"] = max(0, entry["spent"] - units)
+            self._save()
+
+    def mark_exhausted(self) -> None:
+        """Record that YouTube reported today's quota as used up."""
+        with self._lock:
+            entry = self._entry()
+            if entry["spent"] < self.daily_limit:
+                logger.warning(
+                    "YouTube reports the quota exhausted at %d of %d "
+                    "ledger units; closing today's budget",
+                    entry["spent"],
+                    self.daily_limit,
+                )
+            entry["spent"] = max(entry["spent"], self.daily_limit)
+            entry["exhausted"] = True
+            self._save()
+
+
+_ledger: QuotaLedger | None = None
+_ledger_lock = threading.Lock()
+
+
+def ledger() -> QuotaLedger:
+    """Return the process-wide ledger, loading it on first use."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
@@ -6,6 +6,7 @@ to the Gemini image generation API (generateContent with IMAGE response).
 Environment variables:
     GEMINI_API_KEY  - Google Gemini API key (required)
     GEMINI_MODEL    - Model name (default: gemini-3-pro-image-preview)
+    THUMBNAIL_CACHE_MAX_MB - Size limit of the generation cache (default: 500)
 
 Template structure (templates/pattern{1,2,3}/):
     base.png    - Base template image
@@ -16,23 +17,41 @@ Patterns:
     Pattern 1 (対談)  : 2-person circular frames, requires lecturer image
     Pattern 2 (グルコン): Smartphone 45% buried, requires phone screen image
     Pattern 3 (1on1)  : Text-only, no image replacement
+
+Templates are loaded once per process and kept with their base image
+already base64-encoded (see :func:`_get_template`); a template is reloaded
+when one of its files changes on disk.
+
+Generated images are cached under assets/generated/cache/, keyed by a hash
+of the model, the final prompt and the input images, so an identical
+request (a retried record, a rerun of a test script) is answered from disk
+without calling Gemini.  The cache is trimmed to THUMBNAIL_CACHE_MAX_MB,
+least recently used entries first.  Pass ``fresh=True`` for a new variation.
 """
 
 import base64
+import hashlib
 import json
 import logging
 import mimetypes
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 
-import requests
+import lecturer_images
+import transport
 
 logger = logging.getLogger(__name__)
 
 GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta/models"
 DEFAULT_MODEL = "gemini-3-pro-image-preview"
 
+# Size limit of assets/generated/cache/ (least recently used entries go first)
+CACHE_MAX_BYTES = int(
+    float(os.environ.get("THUMBNAIL_CACHE_MAX_MB", "500")) * 1024 * 1024
+)
+
 # Mapping from record pattern field to template directory name
 PATTERN_MAP = {
     "対談": "pattern1",
@@ -47,7 +66,7 @@ PATTERN_MAP = {
 }
 
 
-def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
+def generate_thumbnail(record: dict, base_dir: str = ".", fresh: bool = False) -> str:
     """Generate a thumbnail image from a Notion record.
 
     Determines the pattern from the record, loads the corresponding template,
@@ -64,6 +83,8 @@ def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
                   - 生徒名 (str): student name (pattern 3)
                   - phone_screen_path (str): path to phone screenshot (pattern 2)
         base_dir: Project root directory path.
+        fresh:    Skip the generation cache and always call Gemini (the new
+                  image replaces the cached one).
 
     Returns:
         Absolute path to the saved generated thumbnail image.
@@ -91,7 +112,8 @@ def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
     logger.info("Using pattern: %s (%s)", pattern_raw, pattern_dir_name)
 
     # --- Load template ---
-    base_image_bytes, prompt_template, config = _load_template(str(pattern_dir))
+    template = _get_template(str(pattern_dir))
+    prompt_template, config = template.prompt_template, template.config
     logger.info("Loaded template: %s", config.get("name", pattern_dir_name))
 
     # --- Build prompt with variable substitution ---
@@ -114,10 +136,10 @@ def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
     logger.debug("Final prompt:\n%s", prompt)
 
     # --- Prepare images ---
-    images: list[tuple[str, bytes]] = []
+    images: list[dict] = []
 
-    # Image 1 is always the base template
-    images.append(("image/png", base_image_bytes))
+    # Image 1 is always the base template (already encoded)
+    images.append(template.base_image_part)
 
     # Image 2 depends on pattern
     inputs = config.get("inputs", {})
@@ -127,13 +149,12 @@ def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
             # Use lecturer_image2 filename from record (set by web form)
             image2_filename = record.get("lecturer_image2", "")
             if image2_filename:
-                image2_path = base / "assets" / "lecturer-images" / image2_filename
-                if image2_path.is_file():
-                    logger.info("Using lecturer_image2: %s", image2_path)
-                    mime = mimetypes.guess_type(str(image2_path))[0] or "image/png"
-                    images.append((mime, image2_path.read_bytes()))
+                image2_part = _lecturer_image_part(base, image2_filename)
+                if image2_part:
+                    logger.info("Using lecturer_image2: %s", image2_filename)
+                    images.append(image2_part)
                 else:
-                    logger.warning("lecturer_image2 file not found: %s", image2_path)
+                    logger.warning("lecturer_image2 file not found: %s", image2_filename)
             else:
                 # Fallback: search by lecturer_name
                 lecturer_name = record.get("lecturer_name") or record.get("講師名", "")
@@ -143,8 +164,9 @@ def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
                         f"No lecturer image found for: '{lecturer_name}'"
                     )
                 logger.info("Using lecturer image (fallback): %s", lecturer_image_path)
-                mime = mimetypes.guess_type(lecturer_image_path)[0] or "image/png"
-                images.append((mime, Path(lecturer_image_path).read_bytes()))
+                images.append(
+                    _lecturer_image_part(base, Path(lecturer_image_path).name)
+                )
 
         elif pattern_dir_name == "pattern2":
             # Pattern 2: phone screen image or lecturer image
@@ -152,37 +174,45 @@ def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
             if phone_screen_path and Path(phone_screen_path).is_file():
                 logger.info("Using phone screen image: %s", phone_screen_path)
                 mime = mimetypes.guess_type(phone_screen_path)[0] or "image/png"
-                images.append((mime, Path(phone_screen_path).read_bytes()))
+                images.append(_inline_part(mime, Path(phone_screen_path).read_bytes()))
             else:
                 # Fallback: use lecturer_image1 from web form
                 image1_filename = record.get("lecturer_image1", "")
                 if image1_filename:
-                    image1_path = base / "assets" / "lecturer-images" / image1_filename
-                    if image1_path.is_file():
-                        logger.info("Using lecturer_image1 as phone screen: %s", image1_path)
-                        mime = mimetypes.guess_type(str(image1_path))[0] or "image/png"
-                        images.append((mime, image1_path.read_bytes()))
+                    image1_part = _lecturer_image_part(base, image1_filename)
+                    if image1_part:
+                        logger.info("Using lecturer_image1 as phone screen: %s", image1_filename)
+                        images.append(image1_part)
                     else:
                         logger.warning("No image2 available for pattern2, proceeding without")
                 else:
                     logger.warning("No image2 available for pattern2, proceeding without")
 
+    # --- Look up the generation cache ---
+    cache_dir = base / "assets" / "generated" / "cache"
+    model = os.environ.get("GEMINI_MODEL", DEFAULT_MODEL)
+    cache_key = _generation_key(model, prompt, images)
+    generated_bytes = None if fresh else _cache_get(cache_dir, cache_key)
+    if generated_bytes is not None:
+        logger.info("Thumbnail generation cache hit: %s", cache_key[:16])
+
     # --- Call Gemini API (with retry) ---
     import time
-    generated_bytes = None
-    for attempt in range(1, 4):
-        logger.info("Calling Gemini API for thumbnail generation (attempt %d/3)...", attempt)
-        try:
-            generated_bytes = _call_gemini_api(prompt, images)
-            break
-        except RuntimeError as e:
-            if "did not contain image data" in str(e) and attempt < 3:
-                logger.warning("Gemini returned no image, retrying in 3s...")
-                time.sleep(3)
-            else:
-                raise
     if generated_bytes is None:
-        raise RuntimeError("Gemini API failed to generate image after 3 attempts")
+        for attempt in range(1, 4):
+            logger.info("Calling Gemini API for thumbnail generation (attempt %d/3)...", attempt)
+            try:
+                generated_bytes = _call_gemini_api(prompt, images)
+                break
+            except RuntimeError as e:
+                if "did not contain image data" in str(e) and attempt < 3:
+                    logger.warning("Gemini returned no image, retrying in 3s...")
+                    time.sleep(3)
+                else:
+                    raise
+        if generated_bytes is None:
+            raise RuntimeError("Gemini API failed to generate image after 3 attempts")
+        _cache_put(cache_dir, cache_key, generated_bytes)
 
     # --- Save result ---
     output_dir = base / "assets" / "generated"
@@ -190,7 +220,9 @@ def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     safe_text = (record.get("thumbnail_text") or record.get("サムネ文言", "thumbnail"))[:20].replace("/", "_")
-    output_filename = f"{pattern_dir_name}_{safe_text}_{timestamp}.png"
+    # Content hash keeps same-second outputs (e.g. cache hits) apart
+    content_id = hashlib.sha256(generated_bytes).hexdigest()[:8]
+    output_filename = f"{pattern_dir_name}_{safe_text}_{timestamp}_{content_id}.png"
     output_path = output_dir / output_filename
 
     output_path.write_bytes(generated_bytes)
@@ -199,6 +231,151 @@ def generate_thumbnail(record: dict, base_dir: str = ".") -> str:
     return str(output_path)
 
 
+def _generation_key(model: str, prompt: str, images: list[dict]) -> str:
+    """Return the cache key of a generation request.
+
+    A SHA-256 over the model, the final prompt and every input image
+    (MIME type and base64 data), so any change in the request -- a new
+    template, lecturer image or prompt wording -- misses the cache.
+    """
+    digest = hashlib.sha256()
+    for field in (model, prompt):
+        digest.update(field.encode("utf-8"))
+        digest.update(b"\0")
+    for part in images:
+        inline = part["inline_data"]
+        image_digest = hashlib.sha256(inline["data"].encode("ascii")).digest()
+        digest.update(inline["mime_type"].encode("ascii") + b"\0" + image_digest)
+    return digest.hexdigest()
+
+
+def _cache_get(cache_dir: Path, key: str) -> bytes | None:
+    """Return a cached generated image and mark it as recently used."""
+    path = cache_dir / f"{key}.png"
+    try:
+        data = path.read_bytes()
+        os.utime(path)
+    except OSError:
+        return None
+    return data
+
+
+def _cache_put(cache_dir: Path, key: str, data: bytes) -> None:
+    """Store a generated image, then trim the cache to CACHE_MAX_BYTES.
+
+    Cache failures are logged, never raised: the image was generated
+    either way.
+    """
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_dir / f"{key}.png.tmp"
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_dir / f"{key}.png")
+        _evict(cache_dir, CACHE_MAX_BYTES)
+    except OSError:
+        logger.warning("Could not write generation cache %s", cache_dir, exc_info=True)
+
+
+def _evict(cache_dir: Path, max_bytes: int) -> None:
+    """Delete least recently used cache entries until under *max_bytes*."""
+    entries = []
+    for path in cache_dir.glob("*.png"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        logger.info("Evicted cached thumbnail %s", path.name)
+
+
+class _Template:
+    """A pattern template held in memory.
+
+    Attributes:
+        base_image_bytes: Raw ``base.png``.
+        base_image_part:  ``base.png`` as a ready Gemini ``inline_data``
+                          part, so it is base64-encoded once rather than
+                          on every request.
+        prompt_template:  Contents of ``prompt.txt``.
+        config:           Parsed ``config.json``.
+        stamp:            ``(mtime_ns, size)`` of each file when loaded.
+    """
+
+    def __init__(
+        self,
+        base_image_bytes: bytes,
+        prompt_template: str,
+        config: dict,
+        stamp: tuple,
+    ):
+        self.base_image_bytes = base_image_bytes
+        self.base_image_part = _inline_part("image/png", base_image_bytes)
+        self.prompt_template = prompt_template
+        self.config = config
+        self.stamp = stamp
+
+
+_TEMPLATE_FILES = ("base.png", "prompt.txt", "config.json")
+
+_templates: dict[str, _Template] = {}
+_templates_lock = threading.Lock()
+
+
+def _template_stamp(pattern_dir: str) -> tuple:
+    """Return ``(mtime_ns, size)`` of each template file (``None`` if missing)."""
+    stamp = []
+    for name in _TEMPLATE_FILES:
+        try:
+            st = os.stat(os.path.join(pattern_dir, name))
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _get_template(pattern_dir: str) -> _Template:
+    """Return the template of *pattern_dir*, loading it only when needed.
+
+    Templates are cached per directory for the life of the process and
+    shared by generation and validation.  Each call only ``stat``s the
+    three files; the template is read again when any of them changed.
+
+    Raises:
+        FileNotFoundError: If any required template file is missing.
+    """
+    key = os.path.abspath(pattern_dir)
+    stamp = _template_stamp(key)
+    with _templates_lock:
+        cached = _templates.get(key)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+        base_image_bytes, prompt_template, config = _load_template(key)
+        template = _Template(base_image_bytes, prompt_template, config, stamp)
+        _templates[key] = template
+        if cached is not None:
+            logger.info("Template %s changed on disk; reloaded", key)
+        return template
+
+
+def _inline_part(mime_type: str, data: bytes) -> dict:
+    """Return *data* as a Gemini ``inline_data`` request part."""
+    return {
+        "inline_data": {
+            "mime_type": mime_type,
+            "data": base64.b64encode(data).decode("utf-8"),
+        }
+    }
+
+
 def _load_template(pattern_dir: str) -> tuple[bytes, str, dict]:
     """Load template files from a pattern directory.
 
@@ -242,8 +419,9 @@ def _load_template(pattern_dir: str) -> tuple[bytes, str, dict]:
 def _find_lecturer_image(name: str, base_dir: str) -> str | None:
     """Find a lecturer image file matching the given name.
 
-    Searches for files in assets/lecturer-images/ whose filename
-    contains the lecturer name.
+    Looks the name up in the lecturer image registry (see
+    :mod:`lecturer_images`) for assets/lecturer-images/.  A solo (1人)
+    image is preferred, since it fills a single portrait frame.
 
     Args:
         name: Lecturer name to search for (e.g., "陸", "はなこ").
@@ -257,21 +435,10 @@ def _find_lecturer_image(name: str, base_dir: str) -> str | None:
         logger.warning("Empty lecturer name provided")
         return None
 
-    # 「講師」「先生」等のサフィックスを除去して検索
-    for suffix in ("講師", "先生"):
-        if name.endswith(suffix):
-            name = name[: -len(suffix)]
-            break
-
-    images_dir = Path(base_dir) / "assets" / "lecturer-images"
-    if not images_dir.is_dir():
-        logger.warning("Lecturer images directory not found: %s", images_dir)
-        return None
-
-    matches = sorted(
-        p for p in images_dir.iterdir()
-        if p.is_file() and name in p.name
+    registry = lecturer_images.registry(
+        Path(base_dir) / "assets" / "lecturer-images"
     )
+    matches = registry.find(name, lecturer_images.SOLO) or registry.find(name)
 
     if not matches:
         logger.warning("No image found for lecturer: '%s'", name)
@@ -282,12 +449,32 @@ def _find_lecturer_image(name: str, base_dir: str) -> str | None:
         "Found %d image(s) for '%s', using: %s",
         len(matches),
         name,
-        selected.name,
+        selected.filename,
     )
-    return str(selected)
+    return selected.path
+
+
+def _lecturer_image_part(base: Path, filename: str) -> dict | None:
+    """Return a file in assets/lecturer-images/ as an inline image part.
 
+    Registered images come pre-encoded from the registry; any other file
+    in the directory is read and encoded directly.
 
-def _call_gemini_api(prompt: str, images: list[tuple[str, bytes]]) -> bytes:
+    Returns:
+        The part, or None if the file does not exist.
+    """
+    images_dir = base / "assets" / "lecturer-images"
+    part = lecturer_images.registry(images_dir).payload(filename)
+    if part is None:
+        path = images_dir / filename
+        if not path.is_file():
+            return None
+        mime = mimetypes.guess_type(str(path))[0] or "image/png"
+        part = _inline_part(mime, path.read_bytes())
+    return part
+
+
+def _call_gemini_api(prompt: str, images: list[dict]) -> bytes:
     """Call the Gemini API to generate a thumbnail image.
 
     Sends a multimodal request with text prompt and image parts to the
@@ -296,8 +483,8 @@ def _call_gemini_api(prompt: str, images: list[tuple[str, bytes]]) -> bytes:
 
     Args:
         prompt: The text prompt describing the desired edits.
-        images: List of (mime_type, image_bytes) tuples to include
-                as inline image parts in the request.
+        images: Inline image parts to include in the request, as built by
+                :func:`_inline_part`.
 
     Returns:
         The generated image as raw bytes (PNG).
@@ -314,16 +501,7 @@ def _call_gemini_api(prompt: str, images: list[tuple[str, bytes]]) -> bytes:
     url = f"{GEMINI_API_BASE}/{model}:generateContent"
 
     # Build request parts: images first, then text prompt
-    parts: list[dict] = []
-    for mime_type, image_bytes in images:
-        encoded = base64.b64encode(image_bytes).decode("utf-8")
-        parts.append({
-            "inline_data": {
-                "mime_type": mime_type,
-                "data": encoded,
-            }
-        })
-    parts.append({"text": prompt})
+    parts: list[dict] = [*images, {"text": prompt}]
 
     payload = {
         "contents": [
@@ -338,7 +516,7 @@ def _call_gemini_api(prompt: str, images: list[tuple[str, bytes]]) -> bytes:
 
     logger.info("Sending request to Gemini API: model=%s, images=%d", model, len(images))
 
-    response = requests.post(
+    response = transport.post(
         url,
         params={"key": api_key},
         json=payload,
@@ -391,7 +569,7 @@ def _call_gemini_api(prompt: str, images: list[tuple[str, bytes]]) -> bytes:
 
 def _validate_thumbnail(
     generated_bytes: bytes,
-    base_image_bytes: bytes,
+    base_image_part: dict,
     expected: dict,
 ) -> dict:
     """Validate a generated thumbnail against the original template.
@@ -401,7 +579,8 @@ def _validate_thumbnail(
 
     Args:
         generated_bytes: The generated thumbnail image bytes.
-        base_image_bytes: The original base template image bytes.
+        base_image_part: The original base template as an encoded inline
+                         part (:attr:`_Template.base_image_part`).
         expected: Dict with expected values: guest, thumbnail_text.
 
     Returns:
@@ -415,9 +594,6 @@ def _validate_thumbnail(
     model = os.environ.get("GEMINI_MODEL", DEFAULT_MODEL)
     url = f"{GEMINI_API_BASE}/{model}:generateContent"
 
-    base_b64 = base64.b64encode(base_image_bytes).decode("utf-8")
-    gen_b64 = base64.b64encode(generated_bytes).decode("utf-8")
-
     validation_prompt = f"""You are a QA inspector. Compare Image 1 (original template) with Image 2 (generated result).
 
 Check ALL of the following and respond ONLY with a JSON object:
@@ -432,8 +608,8 @@ Respond ONLY with JSON, no markdown, no explanation:
 {{"graduation_cap": true/false, "text_box_shape": true/false, "guest_text": true/false, "text_color": true/false, "no_extra_icons": true/false}}"""
 
     parts = [
-        {"inline_data": {"mime_type": "image/png", "data": base_b64}},
-        {"inline_data": {"mime_type": "image/png", "data": gen_b64}},
+        base_image_part,
+        _inline_part("image/png", generated_bytes),
         {"text": validation_prompt},
     ]
 
@@ -445,7 +621,7 @@ Respond ONLY with JSON, no markdown, no explanation:
     logger.info("Validating generated thumbnail...")
 
     try:
-        response = requests.post(
+        response = transport.post(
             url, params={"key": api_key}, json=payload, timeout=60,
         )
         if response.status_code != 200:
@@ -499,7 +675,9 @@ def generate_thumbnail_validated(
     """Generate a thumbnail with automatic validation and retry.
 
     Generates a thumbnail, validates it against the original template,
-    and retries if validation fails.
+    and retries if validation fails.  The first attempt may be served from
+    the generation cache; retries always ask Gemini for a fresh image,
+    since the cached one is what just failed validation.
 
     Args:
         record: Parsed Notion record dict.
@@ -520,7 +698,8 @@ def generate_thumbnail_validated(
         raise ValueError(f"Unrecognized pattern: '{pattern_raw}'")
 
     pattern_dir = base / "templates" / pattern_dir_name
-    base_image_bytes, _, _ = _load_template(str(pattern_dir))
+    # Same cached template generate_thumbnail() uses
+    template = _get_template(str(pattern_dir))
 
     expected = {
         "guest": record.get("lecturer_name") or record.get("講師名", ""),
@@ -531,11 +710,15 @@ def generate_thumbnail_validated(
         logger.info("=== Generation attempt %d/%d ===", attempt, max_attempts)
 
         # Generate
-        output_path = generate_thumbnail(record, base_dir=base_dir)
+        output_path = generate_thumbnail(
+            record, base_dir=base_dir, fresh=attempt > 1
+        )
         generated_bytes = Path(output_path).read_bytes()
 
         # Validate
-        result = _validate_thumbnail(generated_bytes, base_image_bytes, expected)
+        result = _validate_thumbnail(
+            generated_bytes, template.base_image_part, expected
+        )
 
         if result["ok"]:
             logger.info("Validation PASSED on attempt %d", attempt)
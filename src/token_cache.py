@@ -0,0 +1,96 @@
+"""Process-wide OAuth access token cache.
+
+Both the Zoom and YouTube clients obtain short-lived access tokens
+(typically valid for one hour).  :class:`TokenCache` keeps the current token
+in memory and only calls the OAuth endpoint again shortly before it expires,
+so every API call in a run -- across all pipeline worker threads -- shares
+one token instead of requesting a new one each time.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Refresh this many seconds before the token actually expires, so a token
+# handed out now is still valid for a long request (e.g. an upload chunk).
+REFRESH_MARGIN = 300
+
+# Lifetime assumed when the token response carries no ``expires_in``.
+DEFAULT_EXPIRES_IN = 3600
+
+
+class TokenCache:
+    """Thread-safe cache for a single OAuth access token.
+
+    Args:
+        fetch:          Callable performing the token request and returning
+                        the decoded JSON response, which must contain
+                        ``access_token`` and should contain ``expires_in``.
+        name:           Name used in log messages (e.g. ``"Zoom"``).
+        refresh_margin: Seconds before expiry at which the token is
+                        considered stale and refreshed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict],
+        name: str = "",
+        refresh_margin: float = REFRESH_MARGIN,
+    ):
+        self.fetch = fetch
+        self.name = name
+        self.refresh_margin = refresh_margin
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, force_refresh: bool = False) -> str:
+        """Return a valid access token, fetching a new one if needed.
+
+        Concurrent callers block on one lock, so only the first of them
+        performs the token request and the rest reuse its result.
+
+        Args:
+            force_refresh: Discard the cached token first (e.g. after the
+                           API rejected it with HTTP 401).
+
+        Returns:
+            The access token string.
+        """
+        with self._lock:
+            if force_refresh:
+                self._token = None
+            if self._token is not None and time.monotonic() < self._expires_at:
+                return self._token
+
+            data = self.fetch()
+            expires_in = float(data.get("expires_in") or DEFAULT_EXPIRES_IN)
+            # Never let the margin eat more than half of a short lifetime.
+            margin = min(self.refresh_margin, expires_in / 2)
+            self._token = data["access_token"]
+            self._expires_at = time.monotonic() + expires_in - margin
+            logger.debug(
+                "Cached %s access token for %.0fs",
+                self.name or "OAuth",
+                expires_in - margin,
+            )
+            return self._token
+
+    def invalidate(self, token: str | None = None) -> None:
+        """Forget the cached token so the next :meth:`get` fetches a new one.
+
+        Args:
+            token: The token the API rejected.  If given, the cache is only
+                   cleared while it still holds that token, so several
+                   threads hitting the same HTTP 401 trigger one refresh.
+        """
+        with self._lock:
+            if token is not None and token != self._token:
+                return
+            self._token = None
+            self._expires_at = 0.0
@@ -0,0 +1,185 @@
+"""Shared HTTP transport for all API modules.
+
+Every API module (Notion, Zoom, YouTube, Gemini, Discord) sends its requests
+through one process-wide :class:`requests.Session`, so connections to each
+host are kept alive and reused instead of paying a new TCP + TLS handshake
+per call.  The module also applies a uniform default timeout and keeps
+per-host latency and connection-reuse counters (see :func:`stats` and
+:func:`log_stats`).
+
+Environment variables (optional):
+    HTTP_POOL_SIZE    - Max keep-alive connections per host (default 10).
+                        Should be at least the number of threads that talk
+                        to one host at once (pipeline workers, parallel
+                        download segments).
+    HTTP_POOL_HOSTS   - Number of per-host pools to keep (default 10)
+    HTTP_TIMEOUT      - Default timeout in seconds for calls that do not
+                        pass one (default 30)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "10"))
+POOL_HOSTS = int(os.environ.get("HTTP_POOL_HOSTS", "10"))
+DEFAULT_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "30"))
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+class HostStats:
+    """Request counters for one host."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.requests += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if not ok:
+            self.errors += 1
+
+
+_stats: dict[str, HostStats] = {}
+_stats_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the shared session.
+
+    Accepts the same keyword arguments as :func:`requests.request`.  When
+    no ``timeout`` is given, ``DEFAULT_TIMEOUT`` is used.  The time until
+    the response headers arrive is recorded for the target host.
+
+    Returns:
+        The :class:`requests.Response`.
+
+    Raises:
+        requests.RequestException: On connection errors and timeouts.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    host = urlsplit(url).hostname or ""
+    started = time.monotonic()
+    ok = False
+    try:
+        response = session().request(method, url, **kwargs)
+        ok = response.status_code < 500
+        return response
+    finally:
+        elapsed = time.monotonic() - started
+        with _stats_lock:
+            _stats.setdefault(host, HostStats()).record(elapsed, ok)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Send a GET request through the shared session."""
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Send a POST request through the shared session."""
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    """Send a PUT request through the shared session."""
+    return request("PUT", url, **kwargs)
+
+
+def patch(url: str, **kwargs) -> requests.Response:
+    """Send a PATCH request through the shared session."""
+    return request("PATCH", url, **kwargs)
+
+
+def _connection_counts() -> dict[str, tuple[int, int]]:
+    """Return ``{host: (connections_opened, requests_sent)}`` from urllib3."""
+    counts: dict[str, tuple[int, int]] = {}
+    if _session is None:
+        return counts
+    for adapter in set(_session.adapters.values()):
+        pools = getattr(adapter.poolmanager, "pools", None)
+        if pools is None:
+            continue
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened, sent = counts.get(pool.host, (0, 0))
+            counts[pool.host] = (
+                opened + pool.num_connections,
+                sent + pool.num_requests,
+            )
+    return counts
+
+
+def stats() -> dict[str, dict]:
+    """Return per-host latency and connection-reuse counters.
+
+    Returns:
+        ``{host: {...}}`` with ``requests``, ``errors``, ``avg_ms``,
+        ``max_ms``, ``connections`` (TCP connections opened) and
+        ``reused`` (requests served on an already-open connection).
+        The connection counts only cover hosts whose pool is still
+        cached by the session.
+    """
+    connections = _connection_counts()
+    result = {}
+    with _stats_lock:
+        for host, s in _stats.items():
+            opened, sent = connections.get(host, (0, 0))
+            result[host] = {
+                "requests": s.requests,
+                "errors": s.errors,
+                "avg_ms": round(s.total_seconds / s.requests * 1000, 1),
+                "max_ms": round(s.max_seconds * 1000, 1),
+                "connections": opened,
+                "reused": max(0, sent - opened),
+            }
+    return result
+
+
+def log_stats() -> None:
+    """Log one summary line per host contacted so far."""
+    for host, s in sorted(stats().items()):
+        logger.info(
+            "HTTP %s: %d request(s), %d error(s), avg %.0f ms, max %.0f ms, "
+            "%d connection(s), %d reused",
+            host,
+            s["requests"],
+            s["errors"],
+            s["avg_ms"],
+            s["max_ms"],
+            s["connections"],
+            s["reused"],
+        )
@@ -5,15 +5,462 @@ Trims silent portions from the beginning and end of Zoom recordings:
 - End: Forgot to stop recording, silence at the end
 
 Requires ffmpeg and ffprobe to be installed and available on PATH.
+
+Environment variables:
+    TRIM_SCAN_WINDOW     - Seconds analyzed at each end of a recording
+                           when looking for trim points (default 0 =
+                           decode the whole file; e.g. 600 to opt in).
+    TRIM_STREAM_ANALYSIS - "1" to analyze recordings while they download
+                           (see :class:`StreamAnalyzer`).
+    TRIM_SILENCE_BACKEND - "ffmpeg" (default, silencedetect filter) or
+                           "numpy" (loudness envelope, see :class:`Envelope`;
+                           requires numpy).
+    TRIM_CACHE_DIR       - Directory of the persistent analysis cache
+                           (default: <project>/.cache/trim).
+    TRIM_FRAGMENTED      - "1" to write trimmed files as fragmented MP4.
 """
 
+import base64
+import bisect
+import json
 import logging
 import os
 import re
 import subprocess
+import tempfile
+import threading
+import zlib
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SILENCE_THRESHOLD = -40
+DEFAULT_MIN_DURATION = 10.0
+
+# Trim points only depend on the first and last silent regions, so with a
+# non-zero window only this many seconds at each end of the file are
+# decoded.  The window is widened automatically while silence runs to its
+# edge.  Opt-in: 0 (the default) decodes the whole file.
+SCAN_WINDOW = float(os.environ.get("TRIM_SCAN_WINDOW", "0"))
+
+# Analyze recordings from the download stream instead of re-reading them.
+STREAM_ANALYSIS = os.environ.get("TRIM_STREAM_ANALYSIS", "0") == "1"
+
+# Silence detector used by analyze(): "ffmpeg" or "numpy".
+SILENCE_BACKEND = os.environ.get("TRIM_SILENCE_BACKEND", "ffmpeg")
+SILENCE_BACKENDS = ("ffmpeg", "numpy")
+
+# Envelope backend: audio is decoded to mono PCM at this rate and reduced
+# to one RMS level per window.
+ENVELOPE_SAMPLE_RATE = 8000
+ENVELOPE_WINDOW = 0.5  # seconds
+
+# Persistent per-recording analysis cache (see load_cached / save_cached).
+CACHE_DIR = os.environ.get(
+    "TRIM_CACHE_DIR",
+    str(Path(__file__).resolve().parent.parent / ".cache" / "trim"),
+)
+_CACHE_VERSION = 1
+
+# Write trimmed output as fragmented MP4 (no index rewrite at the end).
+FRAGMENTED_OUTPUT = os.environ.get("TRIM_FRAGMENTED", "0") == "1"
+_FRAGMENT_FLAGS = "+frag_keyframe+empty_moov+default_base_moof"
+
+# Seconds probed either side of a cut point when snapping it to a keyframe.
+KEYFRAME_WINDOW = 30.0
+
+# Maximum number of files kept in the in-process MediaInfo cache.
+_MEDIA_CACHE_MAX = 32
+
+_media_cache: dict[str, "MediaInfo"] = {}
+_media_cache_lock = threading.Lock()
+
+
+def _require_numpy():
+    """Import numpy for the envelope backend, with a clear error if missing."""
+    try:
+        import numpy
+    except ImportError as exc:
+        raise RuntimeError(
+            "The 'numpy' silence backend requires numpy (pip install numpy)"
+        ) from exc
+    return numpy
+
+
+class Envelope:
+    """Loudness envelope of an audio track.
+
+    One RMS level (dBFS) per ``window`` seconds.  Silent regions for any
+    threshold / minimum duration are derived from it with a few vectorized
+    NumPy operations, so thresholds can be tuned without decoding the
+    audio again.
+
+    Attributes:
+        levels:   1-D float array of RMS levels in dBFS.
+        window:   Window length in seconds.
+        duration: Audio duration in seconds.
+    """
+
+    def __init__(self, levels, window: float, duration: float):
+        self.levels = levels
+        self.window = window
+        self.duration = duration
+
+    def __repr__(self) -> str:
+        return (
+            f"Envelope({len(self.levels)} windows of {self.window}s, "
+            f"duration={self.duration:.2f})"
+        )
+
+    def silence_regions(
+        self,
+        silence_threshold: float = DEFAULT_SILENCE_THRESHOLD,
+        min_duration: float = DEFAULT_MIN_DURATION,
+    ) -> list[tuple[float, float]]:
+        """Return ``(start, end)`` runs quieter than *silence_threshold*.
+
+        Equivalent to ffmpeg's silencedetect at window resolution.
+        """
+        np = _require_numpy()
+
+        silent = np.asarray(self.levels) < silence_threshold
+        edges = np.flatnonzero(
+            np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+        )
+        starts = edges[0::2] * self.window
+        ends = np.minimum(edges[1::2] * self.window, self.duration)
+        keep = (ends - starts) >= min_duration
+        return [
+            (float(s), float(e)) for s, e in zip(starts[keep], ends[keep])
+        ]
+
+
+def compute_envelope(input_path: str) -> tuple[Envelope, list[dict]]:
+    """Decode the first audio stream once and compute its loudness envelope.
+
+    ffmpeg decodes to downsampled mono s16 PCM over a pipe
+    (``ENVELOPE_SAMPLE_RATE``); the samples are reduced to windowed RMS
+    levels block by block, so memory use stays constant.
+
+    Args:
+        input_path: Path to the input media file.
+
+    Returns:
+        ``(envelope, streams)`` where *streams* is the stream metadata
+        ffmpeg reported for the input.  A file without an audio stream
+        gets an empty envelope (no levels, so no silent regions).
+
+    Raises:
+        RuntimeError: If numpy is not installed.
+        subprocess.CalledProcessError: If ffmpeg fails.
+    """
+    np = _require_numpy()
+
+    samples_per_window = int(ENVELOPE_SAMPLE_RATE * ENVELOPE_WINDOW)
+    block_bytes = samples_per_window * 2 * 600  # 600 windows per read
+    full_scale_sq = 32768.0 ** 2
+
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i", input_path,
+        "-map", "0:a:0",
+        "-ac", "1",
+        "-ar", str(ENVELOPE_SAMPLE_RATE),
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "pipe:1",
+    ]
+
+    levels = []
+    total_samples = 0
+    pending = b""
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err)
+        while True:
+            data = proc.stdout.read(block_bytes)
+            if not data:
+                break
+            data = pending + data
+            usable = len(data) - len(data) % (samples_per_window * 2)
+            pending = data[usable:]
+            if not usable:
+                continue
+            pcm = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32)
+            total_samples += pcm.size
+            mean_sq = (pcm.reshape(-1, samples_per_window) ** 2).mean(axis=1)
+            levels.append(10 * np.log10(mean_sq / full_scale_sq + 1e-12))
+        proc.stdout.close()
+        returncode = proc.wait()
+        err.seek(0)
+        stderr = err.read().decode("utf-8", "replace")
+
+    if returncode != 0:
+        header_duration, streams = _parse_ffmpeg_header(stderr)
+        if streams and not any(st["type"] == "audio" for st in streams):
+            # "-map 0:a:0" matched nothing: there is no silence to detect.
+            logger.warning("No audio stream in %s; no silence to detect", input_path)
+            empty = np.zeros(0, dtype=np.float32)
+            return Envelope(empty, ENVELOPE_WINDOW, header_duration or 0.0), streams
+        raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+
+    if len(pending) >= 2:
+        pcm = np.frombuffer(pending[: len(pending) // 2 * 2], dtype="<i2").astype(np.float32)
+        total_samples += pcm.size
+        mean_sq = (pcm ** 2).mean()
+        levels.append(np.array([10 * np.log10(mean_sq / full_scale_sq + 1e-12)]))
+
+    level_array = (
+        np.concatenate(levels).astype(np.float32)
+        if levels else np.zeros(0, dtype=np.float32)
+    )
+    duration = total_samples / ENVELOPE_SAMPLE_RATE
+    _, streams = _parse_ffmpeg_header(stderr)
+    return Envelope(level_array, ENVELOPE_WINDOW, duration), streams
+
+
+class MediaInfo:
+    """Analysis results for one media file.
+
+    Holds everything later trim steps need -- duration, stream metadata and
+    the silent regions found for each ``(threshold, min_duration)`` pair --
+    so that no step has to start another ffmpeg/ffprobe process for it.
+
+    Attributes:
+        path:     Path of the analyzed file.
+        duration: Duration in seconds.
+        streams:  Stream metadata dicts with ``index``, ``type``
+                  (``video``/``audio``/...), ``codec`` and ``description``.
+        stat_key: ``(size, mtime_ns)`` of the file when it was analyzed,
+                  used to invalidate the cache when the file changes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        duration: float,
+        streams: list[dict] | None = None,
+        stat_key: tuple[int, int] | None = None,
+    ):
+        self.path = path
+        self.duration = duration
+        self.streams = streams or []
+        self.stat_key = stat_key
+        # Loudness envelope, when analyzed with the "numpy" backend.
+        self.envelope: Envelope | None = None
+        # (threshold, min_duration) -> (trim_start, trim_end)
+        self.trim_points: dict[tuple[float, float], tuple[float, float]] = {}
+        # Requested start -> keyframe start, see snap_to_keyframe().
+        self.keyframe_snaps: dict[float, float] = {}
+        # (threshold, min_duration) -> (regions, complete)
+        self._silences: dict[tuple[float, float], tuple[list, bool]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"MediaInfo({self.path!r}, duration={self.duration:.2f}, "
+            f"streams={len(self.streams)})"
+        )
+
+    def has_audio(self) -> bool:
+        """Return True if the file has at least one audio stream."""
+        return any(st["type"] == "audio" for st in self.streams)
+
+    def silence_regions(
+        self,
+        silence_threshold: float = DEFAULT_SILENCE_THRESHOLD,
+        min_duration: float = DEFAULT_MIN_DURATION,
+        head_tail_only: bool = False,
+    ) -> list[tuple[float, float]] | None:
+        """Return cached silent regions, or None if not analyzed yet.
+
+        Args:
+            silence_threshold: Threshold the regions were detected with.
+            min_duration:      Minimum duration they were detected with.
+            head_tail_only:    Accept a head/tail-only scan, which lacks
+                               the silent regions in the middle of the file.
+        """
+        entry = self._silences.get((float(silence_threshold), float(min_duration)))
+        incomplete = entry is not None and not entry[1] and not head_tail_only
+        if (entry is None or incomplete) and self.envelope is not None:
+            # Derive regions for new parameters (or complete a head/tail
+            # scan) without decoding again.
+            regions = self.envelope.silence_regions(silence_threshold, min_duration)
+            self.set_silence_regions(silence_threshold, min_duration, regions)
+            return regions
+        if entry is None:
+            return None
+        regions, complete = entry
+        if not complete and not head_tail_only:
+            return None
+        return regions
+
+    def set_silence_regions(
+        self,
+        silence_threshold: float,
+        min_duration: float,
+        regions: list[tuple[float, float]],
+        complete: bool = True,
+    ) -> None:
+        """Store silent regions found for the given parameters.
+
+        A head/tail-only result (``complete=False``) never replaces a full
+        one.
+        """
+        key = (float(silence_threshold), float(min_duration))
+        existing = self._silences.get(key)
+        if existing is not None and existing[1] and not complete:
+            return
+        self._silences[key] = (list(regions), complete)
+
+
+def _stat_key(input_path: str) -> tuple[int, int]:
+    """Return ``(size, mtime_ns)`` identifying the current file contents."""
+    st = os.stat(input_path)
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _cached_info(input_path: str) -> MediaInfo | None:
+    """Return the cached MediaInfo for *input_path* if still valid."""
+    key = os.path.realpath(input_path)
+    with _media_cache_lock:
+        info = _media_cache.get(key)
+    if info is None:
+        return None
+    try:
+        if info.stat_key != _stat_key(input_path):
+            return None
+    except OSError:
+        return None
+    return info
+
+
+def _store_info(info: MediaInfo) -> None:
+    """Put *info* into the in-process cache (evicting the oldest entry)."""
+    key = os.path.realpath(info.path)
+    with _media_cache_lock:
+        _media_cache.pop(key, None)
+        while len(_media_cache) >= _MEDIA_CACHE_MAX:
+            _media_cache.pop(next(iter(_media_cache)))
+        _media_cache[key] = info
+
+
+def cache_key(recording_id: str, file_size: int) -> str:
+    """Build a persistent cache key from a Zoom recording file ID and size."""
+    safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", str(recording_id))
+    return f"{safe_id}_{int(file_size)}"
+
+
+def _cache_path(key: str) -> Path:
+    return Path(CACHE_DIR) / f"{key}.json"
+
+
+def _encode_levels(levels) -> str:
+    """Pack envelope levels as zlib-compressed 0.1 dB int16 values."""
+    np = _require_numpy()
+    quantized = np.clip(np.round(np.asarray(levels) * 10), -32768, 32767)
+    raw = quantized.astype("<i2").tobytes()
+    return base64.b64encode(zlib.compress(raw, 9)).decode("ascii")
+
+
+def _decode_levels(encoded: str):
+    """Inverse of :func:`_encode_levels`; returns None without numpy."""
+    try:
+        np = _require_numpy()
+    except RuntimeError:
+        return None
+    raw = zlib.decompress(base64.b64decode(encoded))
+    return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 10
+
+
+def load_cached(key: str, input_path: str) -> MediaInfo | None:
+    """Load a persisted analysis for *input_path* from the on-disk cache.
+
+    The entry is bound to the current file (and put into the in-process
+    cache), so :func:`analyze`, :func:`find_trim_points` and
+    :func:`trim_video` use it without decoding anything.
+
+    Args:
+        key:        Cache key from :func:`cache_key`.
+        input_path: Local path of the recording the entry describes.
+
+    Returns:
+        The cached :class:`MediaInfo`, or ``None`` on a miss.
+    """
+    path = _cache_path(key)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable trim cache entry: %s", path)
+        return None
+    if data.get("version") != _CACHE_VERSION:
+        return None
+
+    info = MediaInfo(
+        input_path,
+        float(data["duration"]),
+        data.get("streams", []),
+        _stat_key(input_path),
+    )
+    for thr, min_dur, regions, complete in data.get("silences", []):
+        info.set_silence_regions(
+            thr, min_dur, [tuple(r) for r in regions], complete=complete
+        )
+    for thr, min_dur, start, end in data.get("trim_points", []):
+        info.trim_points[(float(thr), float(min_dur))] = (start, end)
+    for start, snapped in data.get("keyframe_snaps", []):
+        info.keyframe_snaps[float(start)] = snapped
+    if data.get("envelope"):
+        levels = _decode_levels(data["envelope"]["levels"])
+        if levels is not None:
+            info.envelope = Envelope(
+                levels, data["envelope"]["window"], info.duration
+            )
+
+    _store_info(info)
+    logger.info("Trim cache hit: %s", key)
+    return info
+
+
+def save_cached(key: str, info: MediaInfo) -> None:
+    """Persist *info* (envelope, silent regions, trim points) under *key*.
+
+    Failures are logged and never raised; the cache is only an
+    optimization.
+    """
+    data: dict = {
+        "version": _CACHE_VERSION,
+        "duration": info.duration,
+        "streams": info.streams,
+        "silences": [
+            [thr, min_dur, regions, complete]
+            for (thr, min_dur), (regions, complete) in info._silences.items()
+        ],
+        "trim_points": [
+            [thr, min_dur, start, end]
+            for (thr, min_dur), (start, end) in info.trim_points.items()
+        ],
+        "keyframe_snaps": [
+            [start, snapped] for start, snapped in info.keyframe_snaps.items()
+        ],
+    }
+    try:
+        if info.envelope is not None:
+            data["envelope"] = {
+                "window": info.envelope.window,
+                "levels": _encode_levels(info.envelope.levels),
+            }
+        path = _cache_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, path)
+        logger.debug("Saved trim cache entry: %s", path)
+    except Exception:
+        logger.exception("Failed to save trim cache entry %s", key)
+
 
 def _get_duration(input_path: str) -> float:
     """Get the duration of a media file in seconds using ffprobe.
@@ -28,6 +475,10 @@ def _get_duration(input_path: str) -> float:
         subprocess.CalledProcessError: If ffprobe fails.
         ValueError: If ffprobe output cannot be parsed.
     """
+    info = _cached_info(input_path)
+    if info is not None:
+        return info.duration
+
     result = subprocess.run(
         [
             "ffprobe",
@@ -43,71 +494,654 @@ def _get_duration(input_path: str) -> float:
     return float(result.stdout.strip())
 
 
-def detect_silence(
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):([\d.]+)")
+_STREAM_RE = re.compile(
+    r"Stream #\d+:(\d+)[^:]*:\s*(Video|Audio|Subtitle|Data|Attachment):\s*(\w+)(.*)"
+)
+_TIME_RE = re.compile(r"time=\s*(\d+):(\d+):([\d.]+)")
+
+
+def _parse_ffmpeg_header(stderr: str) -> tuple[float | None, list[dict]]:
+    """Parse input duration and stream metadata from ffmpeg's stderr.
+
+    Only the ``Input #0`` section is considered so that the streams of the
+    null output are not reported.
+
+    Returns:
+        ``(duration_or_None, streams)``.
+    """
+    header = re.split(
+        r"^(?:Output #0|Stream mapping:)", stderr, maxsplit=1, flags=re.M
+    )[0]
+
+    duration = None
+    m = _DURATION_RE.search(header)
+    if m:
+        h, mnt, sec = m.groups()
+        duration = int(h) * 3600 + int(mnt) * 60 + float(sec)
+
+    streams = []
+    for m in _STREAM_RE.finditer(header):
+        index, kind, codec, rest = m.groups()
+        streams.append({
+            "index": int(index),
+            "type": kind.lower(),
+            "codec": codec,
+            "description": rest.strip(" ,"),
+        })
+    return duration, streams
+
+
+def _parse_silence(stderr: str) -> tuple[list[float], list[float]]:
+    """Parse silence_start / silence_end markers from ffmpeg's stderr.
+
+    Lines look like::
+
+        [silencedetect @ ...] silence_start: 0
+        [silencedetect @ ...] silence_end: 15.5 | silence_duration: 15.5
+
+    Args:
+        stderr: ffmpeg stderr output.
+
+    Returns:
+        ``(starts, ends)`` lists in seconds.  *starts* may be one longer
+        than *ends* when the silence runs to the end of the input.
+    """
+    starts = [float(v) for v in re.findall(r"silence_start:\s*(-?[\d.]+)", stderr)]
+    ends = [float(v) for v in re.findall(r"silence_end:\s*(-?[\d.]+)", stderr)]
+    return starts, ends
+
+
+def _probe(input_path: str) -> MediaInfo:
+    """Read duration and stream metadata from the container header.
+
+    Unlike :func:`analyze` this does not decode anything, so it returns
+    almost instantly even for multi-GB files.
+    """
+    duration, streams = _ffprobe(input_path)
+    return MediaInfo(input_path, duration, streams, _stat_key(input_path))
+
+
+def _header_args(headers: dict[str, str] | None) -> list[str]:
+    """Return ffmpeg/ffprobe input options sending *headers* with HTTP requests."""
+    if not headers:
+        return []
+    return ["-headers", "".join(f"{k}: {v}\r\n" for k, v in headers.items())]
+
+
+def _redacted(cmd: list[str]) -> list[str]:
+    """Return *cmd* with the value of any ``-headers`` option masked.
+
+    Use it for every command that ends up in a log or an exception.
+    """
+    return [
+        "<redacted>" if i and cmd[i - 1] == "-headers" else arg
+        for i, arg in enumerate(cmd)
+    ]
+
+
+def _ffprobe(
+    input_path: str, headers: dict[str, str] | None = None
+) -> tuple[float, list[dict]]:
+    """Return ``(duration, streams)`` of a local file or URL via ffprobe.
+
+    *headers* are sent with the HTTP requests for a URL (e.g.
+    ``Authorization``), so credentials stay out of the URL.
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        *_header_args(headers),
+        "-show_entries", "format=duration:stream=index,codec_type,codec_name",
+        "-of", "json",
+        input_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(
+            result.returncode,
+            _redacted(cmd),
+            output=result.stdout,
+            stderr=result.stderr,
+        )
+    data = json.loads(result.stdout or "{}")
+    streams = [
+        {
+            "index": st.get("index", 0),
+            "type": st.get("codec_type", ""),
+            "codec": st.get("codec_name", ""),
+            "description": "",
+        }
+        for st in data.get("streams", [])
+    ]
+    duration = float(data.get("format", {}).get("duration") or 0.0)
+    return duration, streams
+
+
+def _scan_segment(
     input_path: str,
-    silence_threshold: float = -40,
-    min_duration: float = 10.0,
-) -> list[tuple[float, float]]:
-    """Detect silent regions in a media file using ffmpeg silencedetect.
+    start: float,
+    length: float,
+    duration: float,
+    silence_threshold: float,
+    min_duration: float,
+    headers: dict[str, str] | None = None,
+) -> tuple[list[tuple[float, float]], bool]:
+    """Run silencedetect on ``[start, start + length)`` of the audio stream.
 
-    Runs ffmpeg's silencedetect audio filter and parses the stderr output
-    for silence_start / silence_end markers.
+    Uses input seeking (``-ss`` before ``-i``) and maps only the first
+    audio stream, so ffmpeg neither reads nor decodes the rest of the file.
+    *headers* are sent with the HTTP requests for a URL.
+
+    Returns:
+        ``(regions, open_at_end)`` with regions in absolute seconds.
+        *open_at_end* is True when the last region was still silent at the
+        end of the segment (its end is then clipped to the segment end).
+    """
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-ss", f"{start:.3f}",
+        "-t", f"{length:.3f}",
+        *_header_args(headers),
+        "-i", input_path,
+        "-map", "0:a:0",
+        "-af", f"silencedetect=noise={silence_threshold}dB:d={min_duration}",
+        "-f", "null",
+        "-",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(
+            result.returncode,
+            _redacted(cmd),
+            output=result.stdout,
+            stderr=result.stderr,
+        )
+
+    starts, ends = _parse_silence(result.stderr)
+    open_at_end = len(starts) > len(ends)
+    if open_at_end:
+        ends.append(min(length, duration - start))
+
+    regions = [(start + s, start + e) for s, e in zip(starts, ends)]
+    return regions, open_at_end
+
+
+def _scan_head_tail(
+    input_path: str,
+    duration: float,
+    silence_threshold: float,
+    min_duration: float,
+    scan_window: float,
+    headers: dict[str, str] | None = None,
+) -> list[tuple[float, float]] | None:
+    """Find leading/trailing silence by decoding only the ends of a file.
+
+    The head window is scanned from 0 and the tail window up to the end.
+    While the leading (or trailing) silence runs all the way to the far
+    edge of its window, that window is doubled and scanned again.
+    *headers* are passed on to :func:`_scan_segment`.
+
+    Returns:
+        Silent regions found in the head and tail windows, or ``None`` if
+        the windows would have to cover most of the file (the caller then
+        falls back to a full scan).
+    """
+    # --- Head ---
+    window = scan_window
+    while True:
+        if window >= duration / 2:
+            return None
+        head, open_at_end = _scan_segment(
+            input_path,
+            0.0,
+            window,
+            duration,
+            silence_threshold,
+            min_duration,
+            headers,
+        )
+        if open_at_end and len(head) == 1 and head[0][0] < 1.0:
+            logger.info("Leading silence reaches %.0fs; widening head window", window)
+            window *= 2
+            continue
+        if open_at_end:
+            # Its real end lies beyond the window and does not matter for
+            # trimming; drop it rather than report a clipped region.
+            head = head[:-1]
+        break
+
+    # --- Tail ---
+    window = scan_window
+    while True:
+        seg_start = duration - window
+        if seg_start <= duration / 2:
+            return None
+        tail, _ = _scan_segment(
+            input_path,
+            seg_start,
+            window,
+            duration,
+            silence_threshold,
+            min_duration,
+            headers,
+        )
+        if (
+            tail
+            and duration - tail[-1][1] < 1.0
+            and tail[-1][0] - seg_start < 1.0
+        ):
+            logger.info("Trailing silence exceeds %.0fs; widening tail window", window)
+            window *= 2
+            continue
+        break
+
+    return head + tail
+
+
+def _full_scan(
+    input_path: str,
+    silence_threshold: float,
+    min_duration: float,
+) -> tuple[float, list[dict], list[tuple[float, float]]]:
+    """Decode the whole audio track once with silencedetect.
+
+    Returns:
+        ``(duration, streams, regions)``.
+    """
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-i", input_path,
+        "-vn",
+        "-af", f"silencedetect=noise={silence_threshold}dB:d={min_duration}",
+        "-f", "null",
+        "-",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    stderr = result.stderr
+
+    duration, streams = _parse_ffmpeg_header(stderr)
+    if duration is None:
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, cmd, output=result.stdout, stderr=stderr
+            )
+        # Container without a duration header: fall back to the last
+        # progress timestamp, which is the decoded audio length.
+        times = _TIME_RE.findall(stderr)
+        if times:
+            h, mnt, sec = times[-1]
+            duration = int(h) * 3600 + int(mnt) * 60 + float(sec)
+        else:
+            duration = _get_duration(input_path)
+
+    starts, ends = _parse_silence(stderr)
+
+    # If ffmpeg reported a silence_start without a matching silence_end it
+    # means the silence extends to the very end of the file.
+    if len(starts) > len(ends):
+        ends.append(duration)
+
+    return duration, streams, list(zip(starts, ends))
+
+
+def analyze(
+    input_path: str,
+    silence_threshold: float = DEFAULT_SILENCE_THRESHOLD,
+    min_duration: float = DEFAULT_MIN_DURATION,
+    scan_window: float = 0.0,
+    backend: str | None = None,
+) -> MediaInfo:
+    """Analyze a media file for silence, duration and stream metadata.
+
+    By default one ffmpeg run (audio only, ``-vn``) applies the
+    silencedetect filter to the whole file and reports the container
+    duration and stream metadata at the same time.
+
+    With *scan_window* > 0 only the first and last *scan_window* seconds
+    of the audio stream are decoded (see :func:`_scan_head_tail`).  The
+    result then contains the leading and trailing silence -- all that
+    :func:`find_trim_points` needs -- but not silences in the middle.
+    Short files, where the windows would cover most of the file, are
+    always scanned in full.
+
+    With the ``numpy`` backend the audio is instead decoded once into a
+    loudness :class:`Envelope` kept on the result; silent regions for any
+    other threshold / minimum duration are then derived from it without
+    decoding again.  *scan_window* does not apply to this backend.
+
+    The result is cached per file (invalidated when its size or mtime
+    changes), so repeated calls -- and every later trim step -- reuse it
+    instead of starting new ffmpeg/ffprobe processes.
 
     Args:
         input_path:        Path to the input media file.
         silence_threshold: Volume threshold in dB below which audio is
-                           considered silent. Default -40 dB.
-        min_duration:      Minimum silence duration in seconds to be
-                           reported. Default 10.0 seconds.
+                           considered silent.
+        min_duration:      Minimum silence duration in seconds.
+        scan_window:       Seconds to scan at each end, or 0 to scan the
+                           whole file.
+        backend:           ``"ffmpeg"`` or ``"numpy"``.  Defaults to
+                           ``SILENCE_BACKEND``.
 
     Returns:
-        A list of ``(start, end)`` tuples representing each silent region
-        in seconds.  If no silence is detected the list is empty.
+        The :class:`MediaInfo` for the file.
 
     Raises:
         FileNotFoundError: If the input file does not exist.
-        subprocess.CalledProcessError: If ffmpeg fails.
+        ValueError: If *backend* is unknown.
+        subprocess.CalledProcessError: If ffmpeg cannot read the file.
     """
     if not os.path.isfile(input_path):
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
+    if backend is None:
+        backend = SILENCE_BACKEND
+    if backend not in SILENCE_BACKENDS:
+        raise ValueError(
+            f"Unknown silence backend: '{backend}'. Expected one of: {SILENCE_BACKENDS}"
+        )
+
+    head_tail_only = scan_window > 0
+    info = _cached_info(input_path)
+    if info is not None and info.silence_regions(
+        silence_threshold, min_duration, head_tail_only=head_tail_only
+    ) is not None:
+        logger.debug("Using cached analysis for %s", input_path)
+        return info
+
     logger.info(
-        "Detecting silence in %s (threshold=%sdB, min_duration=%ss)",
+        "Analyzing %s (backend=%s, threshold=%sdB, min_duration=%ss, scan_window=%ss)",
         input_path,
+        backend,
         silence_threshold,
         min_duration,
+        scan_window or "full",
     )
 
-    result = subprocess.run(
-        [
-            "ffmpeg",
-            "-i", input_path,
-            "-af", f"silencedetect=noise={silence_threshold}dB:d={min_duration}",
-            "-f", "null",
-            "-",
-        ],
-        capture_output=True,
-        text=True,
+    if backend == "numpy":
+        stat_key = _stat_key(input_path)
+        envelope, streams = compute_envelope(input_path)
+        if info is None:
+            info = MediaInfo(input_path, envelope.duration, streams, stat_key)
+        info.streams = streams or info.streams
+        info.envelope = envelope
+        # Store the full result explicitly: it replaces any head/tail-only
+        # entry cached for the same parameters.
+        regions = envelope.silence_regions(silence_threshold, min_duration)
+        info.set_silence_regions(silence_threshold, min_duration, regions)
+        _store_info(info)
+        logger.info(
+            "Envelope analysis complete: duration=%.2fs, %d window(s), %d silent region(s)",
+            info.duration,
+            len(envelope.levels),
+            len(regions),
+        )
+        return info
+
+    if head_tail_only:
+        if info is None:
+            info = _probe(input_path)
+        if not info.has_audio():
+            logger.warning("No audio stream in %s; no silence to detect", input_path)
+            info.set_silence_regions(silence_threshold, min_duration, [])
+            _store_info(info)
+            return info
+
+        regions = _scan_head_tail(
+            input_path, info.duration, silence_threshold, min_duration, scan_window
+        )
+        if regions is not None:
+            info.set_silence_regions(
+                silence_threshold, min_duration, regions, complete=False
+            )
+            _store_info(info)
+            logger.info(
+                "Head/tail analysis complete: duration=%.2fs, %d silent region(s)",
+                info.duration,
+                len(regions),
+            )
+            return info
+
+        logger.info("Scan windows cover most of the file; scanning it in full")
+
+    stat_key = _stat_key(input_path)
+    duration, streams, regions = _full_scan(
+        input_path, silence_threshold, min_duration
     )
 
-    stderr = result.stderr
+    if info is None:
+        info = MediaInfo(input_path, duration, streams, stat_key)
+    else:
+        info.duration = duration
+        info.streams = streams or info.streams
+    info.set_silence_regions(silence_threshold, min_duration, regions)
+    _store_info(info)
 
-    # Parse silence_start and silence_end pairs from ffmpeg stderr.
-    # Lines look like:
-    #   [silencedetect @ ...] silence_start: 0
-    #   [silencedetect @ ...] silence_end: 15.5 | silence_duration: 15.5
-    starts = re.findall(r"silence_start:\s*([\d.]+)", stderr)
-    ends = re.findall(r"silence_end:\s*([\d.]+)", stderr)
+    logger.info(
+        "Analysis complete: duration=%.2fs, %d stream(s), %d silent region(s)",
+        duration,
+        len(streams),
+        len(regions),
+    )
+    return info
 
-    # If ffmpeg reported a silence_start without a matching silence_end it
-    # means the silence extends to the very end of the file.
-    if len(starts) > len(ends):
-        total_duration = _get_duration(input_path)
-        ends.append(str(total_duration))
 
-    regions = [
-        (float(s), float(e)) for s, e in zip(starts, ends)
-    ]
+class StreamAnalyzer:
+    """Run silence analysis on a file while it is being written.
+
+    Bytes passed to :meth:`write` (typically every chunk of a download)
+    are piped into an ffmpeg silencedetect process, so the analysis is
+    finished the moment the last byte lands and the file never has to be
+    read back from disk for it.
+
+    MP4 files whose index (``moov`` atom) is stored at the end cannot be
+    decoded from a pipe: ffmpeg skips the media data, parses the index and
+    then cannot seek back, so it decodes no audio -- and may still exit
+    with status 0.  The analyzer therefore watches the top-level atoms as
+    they are written and gives up as soon as ``mdat`` comes before
+    ``moov``; :meth:`finish` also refuses a result whose decoded audio
+    falls short of the duration.  In both cases it returns ``None`` so the
+    caller falls back to :func:`analyze` on the finished file.
+
+    Args:
+        silence_threshold: Volume threshold in dB.
+        min_duration:      Minimum silence duration in seconds.
+    """
+
+    def __init__(
+        self,
+        silence_threshold: float = DEFAULT_SILENCE_THRESHOLD,
+        min_duration: float = DEFAULT_MIN_DURATION,
+    ):
+        self.silence_threshold = silence_threshold
+        self.min_duration = min_duration
+        self._failed = False
+        self._stderr: list[str] = []
+        # Top-level MP4 atom scan: offset of the next atom header and the
+        # bytes of it received so far.  Stops once moov or mdat is seen.
+        self._atom_offset = 0
+        self._stream_offset = 0
+        self._atom_header = b""
+        self._atoms_checked = False
+        self._proc = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-i", "pipe:0",
+                "-vn",
+                "-af", f"silencedetect=noise={silence_threshold}dB:d={min_duration}",
+                "-f", "null",
+                "-",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        # Drain stderr continuously so ffmpeg never blocks on a full pipe.
+        self._reader = threading.Thread(
+            target=self._read_stderr, name="stream-analyzer", daemon=True
+        )
+        self._reader.start()
+
+    def _read_stderr(self) -> None:
+        for line in iter(self._proc.stderr.readline, b""):
+            self._stderr.append(line.decode("utf-8", "replace"))
+
+    def _check_atoms(self, chunk: bytes) -> None:
+        """Follow the top-level atoms in *chunk* until moov or mdat appears.
+
+        Gives up on the stream when ``mdat`` comes first (index at the
+        end of the file).
+        """
+        end = self._stream_offset + len(chunk)
+        while not self._atoms_checked and self._atom_offset < end:
+            # Collect up to 16 header bytes (size, type, 64-bit size) of
+            # the atom at _atom_offset; they may span several chunks.
+            pos = self._atom_offset + len(self._atom_header) - self._stream_offset
+            self._atom_header += bytes(chunk[pos:pos + 16 - len(self._atom_header)])
+            header = self._atom_header
+            if len(header) < 8:
+                break  # the rest of the header comes with the next chunk
+            size = int.from_bytes(header[:4], "big")
+            atom_type = header[4:8]
+            if size == 1:
+                if len(header) < 16:
+                    break
+                size = int.from_bytes(header[8:16], "big")
+            if atom_type == b"moov":
+                self._atoms_checked = True
+            elif atom_type == b"mdat":
+                self._atoms_checked = True
+                self._failed = True
+                self._proc.kill()
+                logger.info(
+                    "MP4 index is at the end of the file; will analyze from disk"
+                )
+            elif size < 8:
+                # Size 0 ("to end of file") or garbage: stop following.
+                self._atoms_checked = True
+            else:
+                self._atom_offset += size
+                self._atom_header = b""
+        self._stream_offset = end
+
+    def write(self, chunk: bytes) -> None:
+        """Feed the next chunk of the file to ffmpeg (never raises)."""
+        if self._failed:
+            return
+        if not self._atoms_checked:
+            self._check_atoms(chunk)
+            if self._failed:
+                return
+        try:
+            self._proc.stdin.write(chunk)
+        except (BrokenPipeError, OSError):
+            self._failed = True
+            logger.info("Stream analysis stopped early; will analyze from disk")
+
+    def abort(self) -> None:
+        """Stop the ffmpeg process without producing a result."""
+        self._failed = True
+        self._proc.kill()
+        self._close()
+
+    def _close(self) -> int:
+        try:
+            self._proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        returncode = self._proc.wait()
+        self._reader.join()
+        return returncode
+
+    def finish(self, output_path: str) -> MediaInfo | None:
+        """Wait for the analysis and cache it for the finished file.
+
+        Args:
+            output_path: Path of the file the streamed bytes were written
+                         to.  It must be complete and closed.
+
+        Returns:
+            The :class:`MediaInfo` (also stored in the analysis cache, so
+            :func:`analyze` and :func:`auto_trim` pick it up), or ``None``
+            if the stream could not be analyzed.
+        """
+        returncode = self._close()
+        stderr = "".join(self._stderr)
+
+        duration, streams = _parse_ffmpeg_header(stderr)
+        if self._failed or returncode != 0 or duration is None:
+            logger.info(
+                "Stream analysis unavailable for %s (rc=%s); falling back",
+                output_path,
+                returncode,
+            )
+            return None
+
+        # ffmpeg can exit 0 without decoding anything (e.g. it could not
+        # seek back to the media data); only trust a result that covers
+        # the whole recording.
+        times = _TIME_RE.findall(stderr)
+        decoded = 0.0
+        if times:
+            h, mnt, sec = times[-1]
+            decoded = int(h) * 3600 + int(mnt) * 60 + float(sec)
+        if decoded + max(5.0, duration * 0.02) < duration:
+            logger.info(
+                "Stream analysis of %s decoded %.1fs of %.1fs; falling back",
+                output_path,
+                decoded,
+                duration,
+            )
+            return None
+
+        starts, ends = _parse_silence(stderr)
+        if len(starts) > len(ends):
+            ends.append(duration)
+        regions = list(zip(starts, ends))
+
+        info = MediaInfo(output_path, duration, streams, _stat_key(output_path))
+        info.set_silence_regions(self.silence_threshold, self.min_duration, regions)
+        _store_info(info)
+
+        logger.info(
+            "Stream analysis complete: duration=%.2fs, %d silent region(s)",
+            duration,
+            len(regions),
+        )
+        return info
+
+
+def detect_silence(
+    input_path: str,
+    silence_threshold: float = DEFAULT_SILENCE_THRESHOLD,
+    min_duration: float = DEFAULT_MIN_DURATION,
+) -> list[tuple[float, float]]:
+    """Detect silent regions in a media file using ffmpeg silencedetect.
+
+    Thin wrapper around :func:`analyze`; the result is cached, so calling
+    this before :func:`find_trim_points` does not decode the file twice.
+
+    Args:
+        input_path:        Path to the input media file.
+        silence_threshold: Volume threshold in dB below which audio is
+                           considered silent. Default -40 dB.
+        min_duration:      Minimum silence duration in seconds to be
+                           reported. Default 10.0 seconds.
+
+    Returns:
+        A list of ``(start, end)`` tuples representing each silent region
+        in seconds.  If no silence is detected the list is empty.
+
+    Raises:
+        FileNotFoundError: If the input file does not exist.
+        subprocess.CalledProcessError: If ffmpeg fails.
+    """
+    info = analyze(input_path, silence_threshold, min_duration)
+    regions = info.silence_regions(silence_threshold, min_duration)
 
     logger.info("Found %d silent region(s)", len(regions))
     for i, (s, e) in enumerate(regions):
@@ -118,8 +1152,10 @@ def detect_silence(
 
 def find_trim_points(
     input_path: str,
-    silence_threshold: float = -40,
-    min_duration: float = 10.0,
+    silence_threshold: float = DEFAULT_SILENCE_THRESHOLD,
+    min_duration: float = DEFAULT_MIN_DURATION,
+    media_info: MediaInfo | None = None,
+    scan_window: float | None = None,
 ) -> tuple[float, float]:
     """Determine where to trim the beginning and end of a recording.
 
@@ -135,6 +1171,11 @@ def find_trim_points(
                            :func:`detect_silence`).
         min_duration:      Minimum silence duration in seconds (passed to
                            :func:`detect_silence`).
+        media_info:        Result of a previous :func:`analyze` call.  If
+                           it lacks regions for these parameters the file
+                           is analyzed (once) and the result added to it.
+        scan_window:       Seconds scanned at each end of the file (see
+                           :func:`analyze`).  Defaults to ``SCAN_WINDOW``.
 
     Returns:
         A ``(trim_start, trim_end)`` tuple in seconds.
@@ -142,9 +1183,35 @@ def find_trim_points(
     Raises:
         FileNotFoundError: If the input file does not exist.
     """
-    regions = detect_silence(input_path, silence_threshold, min_duration)
-    total_duration = _get_duration(input_path)
+    if scan_window is None:
+        scan_window = SCAN_WINDOW
 
+    params = (float(silence_threshold), float(min_duration))
+    if media_info is not None and params in media_info.trim_points:
+        return media_info.trim_points[params]
+
+    regions = None
+    if media_info is not None:
+        regions = media_info.silence_regions(
+            silence_threshold, min_duration, head_tail_only=True
+        )
+    if regions is None:
+        media_info = analyze(
+            input_path, silence_threshold, min_duration, scan_window
+        )
+        regions = media_info.silence_regions(
+            silence_threshold, min_duration, head_tail_only=True
+        )
+    points = _trim_points_from_regions(regions, media_info.duration)
+    media_info.trim_points[params] = points
+    return points
+
+
+def _trim_points_from_regions(
+    regions: list[tuple[float, float]],
+    total_duration: float,
+) -> tuple[float, float]:
+    """Apply the leading/trailing silence rules of :func:`find_trim_points`."""
     trim_start = 0.0
     trim_end = total_duration
 
@@ -180,19 +1247,149 @@ def find_trim_points(
     return (trim_start, trim_end)
 
 
+def keyframe_index(
+    input_path: str, start: float, window: float = KEYFRAME_WINDOW
+) -> list[float]:
+    """Return the sorted timestamps of the video keyframes around *start*.
+
+    Reads packet flags with ffprobe (demux only, nothing is decoded),
+    limited to *window* seconds either side of *start* with
+    ``-read_intervals``: a multi-hour recording has hundreds of thousands
+    of packets, and only the keyframes near the cut point matter.
+
+    Args:
+        input_path: Path to the input video file.
+        start:      Time in seconds to index around.
+        window:     Seconds probed before and after *start*.
+
+    Returns:
+        Keyframe timestamps in seconds (empty for audio-only files).
+    """
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-read_intervals", f"{max(start - window, 0):.3f}%+{2 * window:.3f}",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=p=0",
+            input_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            keyframes.append(float(pts))
+    keyframes.sort()
+
+    logger.debug(
+        "Indexed %d keyframe(s) around %.2fs in %s",
+        len(keyframes),
+        start,
+        input_path,
+    )
+    return keyframes
+
+
+def snap_to_keyframe(
+    input_path: str,
+    start: float,
+    media_info: MediaInfo | None = None,
+) -> float:
+    """Move *start* back to the closest keyframe at or before it.
+
+    Stream copy can only begin cleanly at a keyframe; snapping backwards
+    keeps every second the trim points asked for.  The result is cached
+    on *media_info* and persisted with it by :func:`save_cached`.
+
+    Returns:
+        The snapped start time (*start* itself if no keyframe was found
+        within :data:`KEYFRAME_WINDOW` before it; input seeking then
+        snaps on its own).
+    """
+    if start <= 0:
+        return 0.0
+    start = float(start)
+    if media_info is None:
+        media_info = _cached_info(input_path)
+    if media_info is not None and start in media_info.keyframe_snaps:
+        return media_info.keyframe_snaps[start]
+
+    keyframes = keyframe_index(input_path, start)
+    i = bisect.bisect_right(keyframes, start)
+    if i:
+        snapped = keyframes[i - 1]
+    elif keyframes and start <= KEYFRAME_WINDOW:
+        # Only keyframes after start, and the probe began at the start
+        # of the file: as in the original full index, snap to 0.
+        snapped = 0.0
+    else:
+        snapped = start
+
+    if media_info is not None:
+        media_info.keyframe_snaps[start] = snapped
+    return snapped
+
+
+def _trim_command(
+    input_path: str,
+    start: float,
+    end: float,
+    output: str,
+    fragmented: bool,
+) -> list[str]:
+    """Build the ffmpeg stream-copy command for a trim.
+
+    ``-ss`` is placed before ``-i`` (input seeking), so ffmpeg jumps
+    straight to *start* instead of demuxing everything before it.
+    """
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-ss", f"{start:.3f}",
+        "-i", input_path,
+        "-t", f"{max(end - start, 0):.3f}",
+        "-map", "0",
+        "-c", "copy",
+        "-avoid_negative_ts", "make_zero",
+    ]
+    if fragmented:
+        cmd += ["-movflags", _FRAGMENT_FLAGS]
+    if output == "pipe:1":
+        cmd += ["-f", "mp4"]
+    cmd += ["-y", output]
+    return cmd
+
+
 def trim_video(
     input_path: str,
     output_path: str,
     start: float = 0,
     end: float = 0,
+    media_info: MediaInfo | None = None,
+    fragmented: bool | None = None,
 ) -> str:
     """Trim a video file using ffmpeg with codec copy (no re-encoding).
 
+    The start is snapped back to the nearest keyframe (see
+    :func:`snap_to_keyframe`) and the input is seeked rather than read
+    from the beginning, so trimming a long recording takes seconds.
+
     Args:
         input_path:  Path to the input video file.
         output_path: Path for the trimmed output file.
         start:       Start time in seconds. Default 0.
         end:         End time in seconds. If 0, uses the full duration.
+        media_info:  Result of a previous :func:`analyze` call, used for
+                     the duration and cached keyframe snaps instead of running
+                     ffprobe.
+        fragmented:  Write a fragmented MP4.  Defaults to
+                     ``FRAGMENTED_OUTPUT``.
 
     Returns:
         The ``output_path`` string.
@@ -204,29 +1401,29 @@ def trim_video(
     if not os.path.isfile(input_path):
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
+    if media_info is None:
+        media_info = _cached_info(input_path)
+    if fragmented is None:
+        fragmented = FRAGMENTED_OUTPUT
+
     if end <= 0:
-        end = _get_duration(input_path)
+        end = media_info.duration if media_info else _get_duration(input_path)
+
+    snapped = snap_to_keyframe(input_path, start, media_info)
 
     logger.info(
-        "Trimming %s -> %s (%.2fs to %.2fs)",
+        "Trimming %s -> %s (%.2fs [keyframe %.2fs] to %.2fs)",
         input_path,
         output_path,
         start,
+        snapped,
         end,
     )
 
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
     subprocess.run(
-        [
-            "ffmpeg",
-            "-i", input_path,
-            "-ss", str(start),
-            "-to", str(end),
-            "-c", "copy",
-            "-y",
-            output_path,
-        ],
+        _trim_command(input_path, snapped, end, output_path, fragmented),
         capture_output=True,
         text=True,
         check=True,
@@ -236,11 +1433,182 @@ def trim_video(
     return output_path
 
 
-def auto_trim(input_path: str, output_path: str = "") -> str:
+class TrimmedStream:
+    """Trimmed recording produced on the fly as a readable byte stream.
+
+    Runs the same stream-copy trim as :func:`trim_video` but writes a
+    fragmented MP4 to a pipe, so the trimmed copy never exists on disk.
+    (A regular MP4 cannot be cut by copying byte ranges because its index
+    has to be rewritten; a fragmented MP4 can be written sequentially.)
+
+    Use as a context manager and read with :meth:`read`::
+
+        with TrimmedStream(raw_path, start, end) as stream:
+            youtube.upload_stream(stream, title)
+
+    Args:
+        input_path: Path to the input video file.
+        start:      Start time in seconds (snapped to a keyframe).
+        end:        End time in seconds.
+        media_info: MediaInfo with cached keyframe snaps, if available.
+
+    Raises:
+        subprocess.CalledProcessError: On close, if ffmpeg failed.
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        start: float,
+        end: float,
+        media_info: MediaInfo | None = None,
+    ):
+        if not os.path.isfile(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        snapped = snap_to_keyframe(input_path, start, media_info)
+        logger.info(
+            "Streaming trimmed %s (%.2fs [keyframe %.2fs] to %.2fs)",
+            input_path,
+            start,
+            snapped,
+            end,
+        )
+        self._cmd = _trim_command(input_path, snapped, end, "pipe:1", True)
+        self._eof = False
+        self._stderr = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(
+            self._cmd, stdout=subprocess.PIPE, stderr=self._stderr
+        )
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to *size* bytes of the trimmed MP4 (b"" at the end)."""
+        data = self._proc.stdout.read(size)
+        if not data and size != 0:
+            self._eof = True
+        return data
+
+    def close(self) -> None:
+        """Stop ffmpeg and raise if it did not finish successfully."""
+        self._proc.stdout.close()
+        if not self._eof:
+            # Closed before the end was read: the output is abandoned.
+            self._proc.kill()
+        returncode = self._proc.wait()
+        self._stderr.seek(0)
+        stderr = self._stderr.read().decode("utf-8", "replace")
+        self._stderr.close()
+        if self._eof and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, self._cmd, stderr=stderr)
+
+    def __enter__(self) -> "TrimmedStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def remote_trim_points(
+    url: str,
+    silence_threshold: float = DEFAULT_SILENCE_THRESHOLD,
+    min_duration: float = DEFAULT_MIN_DURATION,
+    scan_window: float | None = None,
+    headers: dict[str, str] | None = None,
+) -> tuple[float, float, float] | None:
+    """Find trim points of a recording that has not been downloaded.
+
+    ffmpeg reads the head and tail windows (see :func:`_scan_head_tail`)
+    straight from *url* using HTTP range requests, so only a small part
+    of the file is transferred.  This lets the caller decide whether a
+    recording needs trimming at all before downloading it.
+
+    Args:
+        url:               HTTP(S) URL of the recording.
+        silence_threshold: Volume threshold in dB.
+        min_duration:      Minimum silence duration in seconds.
+        scan_window:       Seconds scanned at each end.  Defaults to
+                           ``SCAN_WINDOW``.
+        headers:           HTTP headers for ffmpeg's requests, e.g.
+                           ``Authorization``.  Pass credentials here, not
+                           in *url*: they are redacted from errors.
+
+    Returns:
+        ``(trim_start, trim_end, duration)`` in seconds, or ``None`` if
+        it cannot be decided without reading most of the file (short
+        recordings, no audio track, head/tail scanning disabled).
+
+    Raises:
+        RuntimeError: If ffmpeg/ffprobe cannot read the URL.
+    """
+    if scan_window is None:
+        scan_window = SCAN_WINDOW
+    if scan_window <= 0:
+        return None
+
+    try:
+        duration, streams = _ffprobe(url, headers)
+        if not duration or not any(st["type"] == "audio" for st in streams):
+            return None
+        regions = _scan_head_tail(
+            url, duration, silence_threshold, min_duration, scan_window, headers
+        )
+    except subprocess.CalledProcessError as exc:
+        # Keep the URL out of the exception as well (it ends up in logs
+        # and Notion); the headers are already redacted.
+        raise RuntimeError(
+            f"ffmpeg could not read the remote recording "
+            f"(exit status {exc.returncode})"
+        ) from None
+    if regions is None:
+        return None
+
+    trim_start, trim_end = _trim_points_from_regions(regions, duration)
+    return trim_start, trim_end, duration
+
+
+def plan_trim(input_path: str, cache_key: str = "") -> tuple[float, float] | None:
+    """Decide how a recording should be trimmed, without trimming it.
+
+    Args:
+        input_path: Path to the input video file.
+        cache_key:  Persistent cache key (see :func:`cache_key`).  On a
+                    hit the recording is not decoded at all; on a miss the
+                    analysis and trim points are saved under it.
+
+    Returns:
+        ``(trim_start, trim_end)`` in seconds, or ``None`` if there is no
+        significant silence at the start or end.
+
+    Raises:
+        FileNotFoundError: If the input file does not exist.
+    """
+    if not os.path.isfile(input_path):
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+
+    info = load_cached(cache_key, input_path) if cache_key else None
+    cached_points = info is not None and bool(info.trim_points)
+    if info is None:
+        info = analyze(input_path, scan_window=SCAN_WINDOW)
+    trim_start, trim_end = find_trim_points(input_path, media_info=info)
+    if cache_key and not cached_points:
+        save_cached(cache_key, info)
+
+    # No trimming needed if the points span the full file.
+    if trim_start < 1.0 and info.duration - trim_end < 1.0:
+        logger.info("No significant silence at start/end; skipping trim")
+        return None
+    return (trim_start, trim_end)
+
+
+def auto_trim(
+    input_path: str,
+    output_path: str = "",
+    cache_key: str = "",
+) -> str:
     """Automatically trim leading and trailing silence from a recording.
 
-    This is the main entry point.  It detects silence, determines trim
-    points, and produces a trimmed copy of the video.
+    This is the main entry point.  It analyzes the file once (see
+    :func:`analyze`), determines trim points (see :func:`plan_trim`), and
+    produces a trimmed copy of the video.
 
     If no silence is detected at the beginning or end, the original file
     path is returned without creating a new file.
@@ -250,6 +1618,9 @@ def auto_trim(input_path: str, output_path: str = "") -> str:
         output_path: Path for the trimmed output file.  If empty, a path
                      is generated by inserting ``_trimmed`` before the
                      file extension.
+        cache_key:   Persistent cache key (see :func:`cache_key`).  On a
+                     hit the recording is not decoded at all; on a miss
+                     the analysis and trim points are saved under it.
 
     Returns:
         The path to the trimmed file, or ``input_path`` if no trimming
@@ -258,40 +1629,52 @@ def auto_trim(input_path: str, output_path: str = "") -> str:
     Raises:
         FileNotFoundError: If the input file does not exist.
     """
-    if not os.path.isfile(input_path):
-        raise FileNotFoundError(f"Input file not found: {input_path}")
-
     logger.info("Auto-trimming %s", input_path)
 
-    trim_start, trim_end = find_trim_points(input_path)
-    total_duration = _get_duration(input_path)
-
-    # No trimming needed if the points span the full file.
-    if trim_start < 1.0 and total_duration - trim_end < 1.0:
-        logger.info("No significant silence at start/end; skipping trim")
+    points = plan_trim(input_path, cache_key)
+    if points is None:
         return input_path
+    trim_start, trim_end = points
 
     if not output_path:
         base, ext = os.path.splitext(input_path)
         output_path = f"{base}_trimmed{ext}"
 
-    return trim_video(input_path, output_path, start=trim_start, end=trim_end)
+    info = _cached_info(input_path)
+    had_snap = info is not None and float(trim_start) in info.keyframe_snaps
+    result = trim_video(
+        input_path, output_path, start=trim_start, end=trim_end, media_info=info
+    )
+    if cache_key and info is not None and not had_snap:
+        save_cached(cache_key, info)
+    return result
 
 
 if __name__ == "__main__":
-    import sys
+    import argparse
 
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
 
-    if len(sys.argv) < 2:
-        print(f"Usage: python {sys.argv[0]} <input_video> [output_video]")
-        sys.exit(1)
+    arg_parser = argparse.ArgumentParser(
+        description="Trim leading/trailing silence from a recording."
+    )
+    arg_parser.add_argument("input_video")
+    arg_parser.add_argument("output_video", nargs="?", default="")
+    arg_parser.add_argument(
+        "--recording-id",
+        default="",
+        help="Zoom recording file ID; enables the persistent analysis cache",
+    )
+    cli_args = arg_parser.parse_args()
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else ""
+    key = ""
+    if cli_args.recording_id:
+        key = cache_key(
+            cli_args.recording_id, os.path.getsize(cli_args.input_video)
+        )
 
-    result = auto_trim(input_file, output_file)
+    result = auto_trim(cli_args.input_video, cli_args.output_video, cache_key=key)
     print(f"Result: {result}")
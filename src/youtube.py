@@ -6,13 +6,28 @@ Environment variables required:
     YOUTUBE_CLIENT_ID     - OAuth 2.0 client ID
     YOUTUBE_CLIENT_SECRET - OAuth 2.0 client secret
     YOUTUBE_REFRESH_TOKEN - OAuth 2.0 refresh token
+
+Optional:
+    YOUTUBE_UPLOAD_STATE_DIR - Where resumable upload sessions are saved
+                               (default: <project>/.cache/uploads)
 """
 
+import hashlib
+import json
 import logging
+import mmap
 import os
+import re
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable
 
 import requests
 
+import quota
+import transport
+from token_cache import TokenCache
+
 logger = logging.getLogger(__name__)
 
 GOOGLE_OAUTH_URL = "https://oauth2.googleapis.com/token"
@@ -23,18 +38,48 @@ YOUTUBE_THUMBNAIL_URL = (
     "https://www.googleapis.com/upload/youtube/v3/thumbnails/set"
 )
 
-CHUNK_SIZE = 10 * 1024 * 1024  # 10 MB
+CHUNK_SIZE = 10 * 1024 * 1024  # 10 MB (initial size for file uploads)
+
+# File uploads adapt the chunk size to the measured throughput so that one
+# chunk takes about CHUNK_TARGET_SECONDS: large chunks (few round trips)
+# on fast links, small ones (little to resend) on slow or flaky links.
+# Chunk sizes stay multiples of 256 KiB, as the API requires.
+CHUNK_ALIGN = 256 * 1024
+MIN_CHUNK_SIZE = 4 * CHUNK_ALIGN  # 1 MiB
+MAX_CHUNK_SIZE = 512 * CHUNK_ALIGN  # 128 MiB
+CHUNK_TARGET_SECONDS = 20.0
+
+# Resumable uploads of unknown length need every chunk except the last to
+# be a multiple of 256 KiB.
+STREAM_CHUNK_SIZE = 32 * 256 * 1024  # 8 MiB
+STREAM_MAX_RETRIES = 3
+
+# File uploads save their session URI here, so an upload interrupted by an
+# error -- or by the whole process dying -- resumes from the last byte
+# YouTube committed instead of from byte 0.  Sessions stay valid for
+# about a week.
+UPLOAD_STATE_DIR = os.environ.get(
+    "YOUTUBE_UPLOAD_STATE_DIR",
+    str(Path(__file__).resolve().parent.parent / ".cache" / "uploads"),
+)
+UPLOAD_MAX_RETRIES = 8
+UPLOAD_MAX_BACKOFF = 60  # seconds
+_FINGERPRINT_BYTES = 1024 * 1024
 
+# 403 error reasons meaning the daily quota (or the channel's daily upload
+# limit) is used up; retrying before the quota resets is pointless.
+QUOTA_ERROR_REASONS = {"quotaExceeded", "dailyLimitExceeded", "uploadLimitExceeded"}
 
-def get_access_token() -> str:
-    """Exchange a refresh token for a YouTube OAuth access token.
+
+def _request_access_token() -> dict:
+    """Request a new YouTube OAuth access token (uncached).
 
     Posts to the Google OAuth endpoint with grant_type=refresh_token
     using YOUTUBE_CLIENT_ID, YOUTUBE_CLIENT_SECRET, and
     YOUTUBE_REFRESH_TOKEN.
 
     Returns:
-        The access token string.
+        The decoded token response (``access_token``, ``expires_in``, ...).
 
     Raises:
         EnvironmentError: If required environment variables are missing.
@@ -58,7 +103,7 @@ def get_access_token() -> str:
 
     logger.info("Requesting YouTube OAuth access token")
 
-    response = requests.post(
+    response = transport.post(
         GOOGLE_OAUTH_URL,
         data={
             "grant_type": "refresh_token",
@@ -70,51 +115,70 @@ def get_access_token() -> str:
     )
     response.raise_for_status()
 
-    token = response.json()["access_token"]
     logger.info("Successfully obtained YouTube access token")
-    return token
+    return response.json()
 
 
-def upload_video(
-    file_path: str,
-    title: str,
-    description: str = "",
-    privacy: str = "unlisted",
-    category_id: str = "22",
-) -> str:
-    """Upload a video to YouTube using resumable upload.
+_token_cache = TokenCache(_request_access_token, name="YouTube")
 
-    Initiates a resumable upload session, then sends the video file
-    in 10 MB chunks.
+
+def get_access_token(force_refresh: bool = False) -> str:
+    """Exchange a refresh token for a YouTube OAuth access token.
+
+    The token is cached for the whole process and shared by all threads;
+    a new one is requested only shortly before the cached one expires.
 
     Args:
-        file_path:    Path to the video file (MP4).
-        title:        Video title.
-        description:  Video description.
-        privacy:      Privacy status (``unlisted``, ``private``, or ``public``).
-        category_id:  YouTube category ID (default ``22`` = People & Blogs).
+        force_refresh: Discard the cached token and request a new one.
 
     Returns:
-        The YouTube video ID of the uploaded video.
+        The access token string.
 
     Raises:
-        FileNotFoundError: If the video file does not exist.
-        requests.HTTPError: If any API request fails.
-        RuntimeError: If the upload URL is not returned by the API.
+        EnvironmentError: If required environment variables are missing.
+        requests.HTTPError: If the token request fails.
     """
-    if not os.path.isfile(file_path):
-        raise FileNotFoundError(f"Video file not found: {file_path}")
+    return _token_cache.get(force_refresh=force_refresh)
 
-    file_size = os.path.getsize(file_path)
-    access_token = get_access_token()
 
-    logger.info(
-        "Initiating resumable upload for %s (%.2f MB)",
-        title,
-        file_size / (1024 * 1024),
-    )
+def _raise_for_quota(response: requests.Response) -> None:
+    """Raise :class:`quota.QuotaExceededError` if *response* is a quota error.
 
-    # Step 1: Initiate the resumable upload session
+    The quota ledger is closed for the rest of the day so that no further
+    recordings are admitted until the quota resets.
+    """
+    if response.status_code != 403:
+        return
+    try:
+        errors = response.json().get("error", {}).get("errors", [])
+    except ValueError:
+        return
+    reasons = {e.get("reason") for e in errors if isinstance(e, dict)}
+    if reasons & QUOTA_ERROR_REASONS:
+        quota.ledger().mark_exhausted()
+        raise quota.QuotaExceededError(
+            f"YouTube quota exhausted ({', '.join(sorted(reasons))})"
+        )
+
+
+def _start_session(
+    access_token: str,
+    title: str,
+    description: str,
+    privacy: str,
+    category_id: str,
+    file_size: int | None = None,
+) -> str:
+    """Initiate a resumable upload session and return its upload URL.
+
+    Args:
+        file_size: Total upload size in bytes, or ``None`` if unknown.
+
+    Raises:
+        quota.QuotaExceededError: If the daily quota is used up.
+        requests.HTTPError: If the API request fails.
+        RuntimeError: If the upload URL is not returned by the API.
+    """
     metadata = {
         "snippet": {
             "title": title,
@@ -126,18 +190,22 @@ def upload_video(
         },
     }
 
-    init_response = requests.post(
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+        "X-Upload-Content-Type": "video/mp4",
+    }
+    if file_size is not None:
+        headers["X-Upload-Content-Length"] = str(file_size)
+
+    init_response = transport.post(
         YOUTUBE_UPLOAD_URL,
         params={"uploadType": "resumable", "part": "snippet,status"},
-        headers={
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-            "X-Upload-Content-Type": "video/mp4",
-            "X-Upload-Content-Length": str(file_size),
-        },
+        headers=headers,
         json=metadata,
         timeout=30,
     )
+    _raise_for_quota(init_response)
     init_response.raise_for_status()
 
     upload_url = init_response.headers.get("Location")
@@ -145,47 +213,441 @@ def upload_video(
         raise RuntimeError(
             "YouTube API did not return an upload URL in the Location header"
         )
+    return upload_url
 
-    logger.info("Received upload URL, starting chunked upload")
 
-    # Step 2: Upload the file in chunks
-    with open(file_path, "rb") as f:
-        bytes_sent = 0
+def _committed_offset(response: requests.Response) -> int:
+    """Return the number of bytes the server has stored, from a 308 reply.
 
-        while bytes_sent < file_size:
-            chunk = f.read(CHUNK_SIZE)
-            chunk_length = len(chunk)
-            range_end = bytes_sent + chunk_length - 1
+    The ``Range`` header looks like ``bytes=0-12345``; it is absent when
+    nothing has been stored yet.
+    """
+    match = re.match(r"bytes=0-(\d+)", response.headers.get("Range", ""))
+    return int(match.group(1)) + 1 if match else 0
 
-            content_range = f"bytes {bytes_sent}-{range_end}/{file_size}"
-            is_final_chunk = (range_end + 1) >= file_size
 
-            logger.info(
-                "Uploading chunk: %s (%.1f%%)",
-                content_range,
-                (range_end + 1) / file_size * 100,
-            )
+def _read_full(stream: BinaryIO, size: int) -> bytes:
+    """Read exactly *size* bytes from *stream* unless it ends first."""
+    parts = []
+    remaining = size
+    while remaining > 0:
+        data = stream.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
+
+
+def upload_stream(
+    stream: BinaryIO,
+    title: str,
+    description: str = "",
+    privacy: str = "unlisted",
+    category_id: str = "22",
+    total_size: int | None = None,
+    on_session: Callable[[], None] | None = None,
+) -> str:
+    """Upload a video from a readable byte stream using resumable upload.
 
-            upload_response = requests.put(
-                upload_url,
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "video/mp4",
-                    "Content-Length": str(chunk_length),
-                    "Content-Range": content_range,
-                },
-                data=chunk,
-                timeout=300,
+    The video never has to exist as a local file: chunks are read from
+    *stream* (e.g. a :class:`trim.TrimmedStream` or an HTTP response)
+    and sent as they arrive.  The chunk being sent is kept in memory: after
+    a network error, timeout or 5xx the session is queried with
+    ``Content-Range: bytes */N`` and the chunk is resent from the byte
+    YouTube last committed, as is a chunk that was only partly stored.
+
+    Args:
+        stream:      Object with a ``read(size)`` method returning bytes.
+        title:       Video title.
+        description: Video description.
+        privacy:     Privacy status.
+        category_id: YouTube category ID.
+        total_size:  Total size in bytes, if known in advance.
+        on_session:  Called once the upload session has been created, i.e.
+                     once YouTube has charged the upload's quota.
+
+    Returns:
+        The YouTube video ID of the uploaded video.
+
+    Raises:
+        quota.QuotaExceededError: If the daily quota is used up.
+        requests.HTTPError: If any API request fails.
+        RuntimeError: If the upload cannot be completed.
+    """
+    access_token = get_access_token()
+    upload_url = _start_session(
+        access_token, title, description, privacy, category_id, total_size
+    )
+    if on_session is not None:
+        on_session()
+    logger.info("Received upload URL, starting streamed upload of %s", title)
+
+    offset = 0
+    chunk = _read_full(stream, STREAM_CHUNK_SIZE)
+    next_chunk = None
+    retries = 0
+    # Set after a failed request: the server may have stored part or all
+    # of the chunk, so ask where to continue before sending again.
+    resync = False
+
+    while True:
+        if next_chunk is None:
+            next_chunk = (
+                _read_full(stream, STREAM_CHUNK_SIZE)
+                if len(chunk) == STREAM_CHUNK_SIZE else b""
+            )
+        is_final_chunk = not next_chunk
+        chunk_end = offset + len(chunk)
+
+        if is_final_chunk:
+            total = str(chunk_end)
+        else:
+            total = str(total_size) if total_size is not None else "*"
+
+        try:
+            if resync:
+                logger.info("Querying upload status after failure at byte %d", offset)
+                response = _put_chunk(upload_url, b"", f"bytes */{total}")
+            else:
+                if chunk:
+                    content_range = f"bytes {offset}-{chunk_end - 1}/{total}"
+                else:
+                    content_range = f"bytes */{total}"
+                logger.info("Uploading chunk: %s", content_range)
+                response = _put_chunk(upload_url, chunk, content_range)
+        except _SessionExpired as exc:
+            # The stream cannot be rewound to start a new session.
+            raise RuntimeError(f"Upload session expired mid-stream ({exc})") from None
+        except requests.RequestException as exc:
+            retries += 1
+            if not _is_transient(exc) or retries > STREAM_MAX_RETRIES:
+                raise
+            logger.warning(
+                "Chunk upload failed (%s); retry %d/%d",
+                exc,
+                retries,
+                STREAM_MAX_RETRIES,
             )
+            time.sleep(2 ** retries)
+            resync = True
+            continue
+        queried, resync = resync, False
+
+        if response.status_code in (200, 201):
+            video_id = response.json()["id"]
+            logger.info("Upload complete: video_id=%s (%d bytes)", video_id, chunk_end)
+            return video_id
+
+        committed = _committed_offset(response)
+        if committed < offset or committed > chunk_end:
+            raise RuntimeError(
+                f"Server committed offset {committed} outside the buffered "
+                f"chunk {offset}-{chunk_end}"
+            )
+        if not queried:
+            retries = 0
+        if committed < chunk_end:
+            # Only part of the chunk was stored; resend the rest of it.
+            chunk = chunk[committed - offset:]
+            offset = committed
+            continue
+        if is_final_chunk:
+            raise RuntimeError("Upload finished without returning a video ID")
+
+        offset = chunk_end
+        chunk, next_chunk = next_chunk, None
+
+
+def _file_fingerprint(file_path: str, file_size: int) -> str:
+    """Hash the size and the first and last MB of a file.
+
+    Cheap even for multi-GB files, and enough to tell whether a saved
+    upload session belongs to the same content.
+    """
+    digest = hashlib.sha256(str(file_size).encode())
+    with open(file_path, "rb") as f:
+        digest.update(f.read(_FINGERPRINT_BYTES))
+        if file_size > _FINGERPRINT_BYTES:
+            f.seek(max(_FINGERPRINT_BYTES, file_size - _FINGERPRINT_BYTES))
+            digest.update(f.read(_FINGERPRINT_BYTES))
+    return digest.hexdigest()
+
+
+def _state_path(key: str) -> str:
+    return os.path.join(UPLOAD_STATE_DIR, f"{key}.json")
+
+
+def _load_upload_state(key: str) -> dict | None:
+    try:
+        with open(_state_path(key), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_upload_state(key: str, state: dict) -> None:
+    """Write the session state atomically (never raises)."""
+    try:
+        os.makedirs(UPLOAD_STATE_DIR, exist_ok=True)
+        tmp_path = _state_path(key) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, _state_path(key))
+    except OSError:
+        logger.warning("Could not save upload state %s", key, exc_info=True)
+
+
+def _clear_upload_state(key: str) -> None:
+    try:
+        os.remove(_state_path(key))
+    except OSError:
+        pass
+
+
+class _ChunkSizer:
+    """Pick upload chunk sizes from measured throughput and failures.
+
+    After each chunk the size moves towards throughput ×
+    ``CHUNK_TARGET_SECONDS`` (at most doubling per step); after a failed
+    chunk it is halved.  Sizes are multiples of ``CHUNK_ALIGN`` within
+    ``MIN_CHUNK_SIZE`` .. ``MAX_CHUNK_SIZE``.
+    """
+
+    def __init__(self, initial: int = CHUNK_SIZE):
+        self.size = self._clamp(initial)
+
+    @staticmethod
+    def _clamp(size: float) -> int:
+        aligned = int(size) // CHUNK_ALIGN * CHUNK_ALIGN
+        return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, aligned))
+
+    def record(self, sent: int, seconds: float) -> None:
+        if sent <= 0 or seconds <= 0:
+            return
+        target = sent / seconds * CHUNK_TARGET_SECONDS
+        self.size = self._clamp(min(target, self.size * 2))
+
+    def record_failure(self) -> None:
+        self.size = self._clamp(self.size // 2)
+
+
+class _SessionExpired(Exception):
+    """The resumable session no longer exists (HTTP 404/410)."""
+
+
+def _put_chunk(
+    upload_url: str,
+    data: bytes | memoryview,
+    content_range: str,
+) -> requests.Response:
+    """PUT one chunk (or an empty status query) to an upload session.
+
+    Returns:
+        The response, for 200/201 (finished) and 308 (incomplete).
+
+    Raises:
+        _SessionExpired: On HTTP 404 or 410.
+        quota.QuotaExceededError: If the daily quota is used up.
+        requests.HTTPError: On other error statuses.
+        requests.ConnectionError, requests.Timeout: On network errors.
+    """
+    response = transport.put(
+        upload_url,
+        headers={
+            "Authorization": f"Bearer {get_access_token()}",
+            "Content-Type": "video/mp4",
+            "Content-Length": str(len(data)),
+            "Content-Range": content_range,
+        },
+        data=data,
+        timeout=300,
+    )
+    if response.status_code in (404, 410):
+        raise _SessionExpired(f"HTTP {response.status_code}")
+    if response.status_code not in (200, 201, 308):
+        _raise_for_quota(response)
+        response.raise_for_status()
+    return response
 
-            if is_final_chunk:
-                upload_response.raise_for_status()
-            elif upload_response.status_code not in (200, 308):
-                upload_response.raise_for_status()
 
-            bytes_sent += chunk_length
+def _is_transient(exc: Exception) -> bool:
+    """Return True for errors worth retrying (network, 5xx, 429)."""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status >= 500 or status == 429
+    return False
+
+
+def upload_video(
+    file_path: str,
+    title: str,
+    description: str = "",
+    privacy: str = "unlisted",
+    category_id: str = "22",
+    on_session: Callable[[], None] | None = None,
+) -> str:
+    """Upload a video to YouTube using resumable upload.
+
+    Initiates a resumable upload session, then sends the video file in
+    chunks.  The file is memory-mapped and each chunk is sent as a
+    ``memoryview`` slice of the mapping, so no chunk is copied into a new
+    buffer.  The chunk size starts at ``CHUNK_SIZE`` and adapts to the
+    measured throughput (see :class:`_ChunkSizer`); every chunk's
+    throughput is logged.
+
+    The session URI and the last committed offset are saved under
+    ``UPLOAD_STATE_DIR``, keyed by the file's content and the title.  A
+    later call for the same file -- in this run or after a crash --
+    queries the session with ``Content-Range: bytes */N`` and continues
+    from the byte YouTube last committed.  Network errors, 5xx and 429
+    responses are retried with exponential backoff, resuming the same way;
+    an expired session (404/410) is replaced by a new one.
+
+    Args:
+        file_path:    Path to the video file (MP4).
+        title:        Video title.
+        description:  Video description.
+        privacy:      Privacy status (``unlisted``, ``private``, or ``public``).
+        category_id:  YouTube category ID (default ``22`` = People & Blogs).
+        on_session:   Called whenever a new upload session is created, i.e.
+                      whenever YouTube charges the upload's quota (not
+                      when a saved session is resumed).
+
+    Returns:
+        The YouTube video ID of the uploaded video.
+
+    Raises:
+        FileNotFoundError: If the video file does not exist.
+        ValueError: If the video file is empty.
+        quota.QuotaExceededError: If the daily quota is used up.  The
+            session is kept, so the upload resumes once quota is back.
+        requests.HTTPError: If any API request fails.
+        RuntimeError: If the upload URL is not returned by the API.
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"Video file not found: {file_path}")
+
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        raise ValueError(f"Video file is empty: {file_path}")
+    fingerprint = _file_fingerprint(file_path, file_size)
+    state_key = hashlib.sha256(
+        f"{fingerprint}|{title}|{privacy}".encode("utf-8")
+    ).hexdigest()[:32]
+
+    logger.info(
+        "Initiating resumable upload for %s (%.2f MB)",
+        title,
+        file_size / (1024 * 1024),
+    )
 
-    video_id = upload_response.json()["id"]
+    state = _load_upload_state(state_key)
+    upload_url = state.get("upload_url") if state else None
+    offset = 0
+    response = None
+    retries = 0
+    sizer = _ChunkSizer()
+
+    with open(file_path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped, memoryview(mapped) as view:
+        while True:
+            try:
+                # Step 1: Start a session, or find out where a saved one
+                # left off.
+                if upload_url is None:
+                    upload_url = _start_session(
+                        get_access_token(),
+                        title,
+                        description,
+                        privacy,
+                        category_id,
+                        file_size,
+                    )
+                    if on_session is not None:
+                        on_session()
+                    offset = 0
+                    _save_upload_state(
+                        state_key,
+                        {"upload_url": upload_url, "offset": 0, "size": file_size},
+                    )
+                    logger.info("Received upload URL, starting chunked upload")
+                elif response is None:
+                    response = _put_chunk(upload_url, b"", f"bytes */{file_size}")
+                    if response.status_code == 308:
+                        offset = _committed_offset(response)
+                        logger.info(
+                            "Resuming upload at byte %d of %d (%.1f%%)",
+                            offset,
+                            file_size,
+                            offset / file_size * 100,
+                        )
+
+                # Step 2: Upload the file in chunks
+                while response is None or response.status_code == 308:
+                    chunk = view[offset:offset + sizer.size]
+                    range_end = offset + len(chunk) - 1
+                    content_range = f"bytes {offset}-{range_end}/{file_size}"
+                    started = time.monotonic()
+                    try:
+                        response = _put_chunk(upload_url, chunk, content_range)
+                    finally:
+                        # Drop the slice so the mapping can be closed.
+                        chunk.release()
+                    elapsed = time.monotonic() - started
+                    sizer.record(range_end + 1 - offset, elapsed)
+                    logger.info(
+                        "Uploaded chunk %s in %.1fs (%.2f MB/s, %.1f%%); "
+                        "next chunk %.1f MiB",
+                        content_range,
+                        elapsed,
+                        (range_end + 1 - offset) / (1024 * 1024)
+                        / max(elapsed, 1e-6),
+                        (range_end + 1) / file_size * 100,
+                        sizer.size / (1024 * 1024),
+                    )
+                    if response.status_code == 308:
+                        # The server may store less than was sent; continue
+                        # from what it actually committed.
+                        offset = _committed_offset(response)
+                        _save_upload_state(
+                            state_key,
+                            {
+                                "upload_url": upload_url,
+                                "offset": offset,
+                                "size": file_size,
+                            },
+                        )
+                    retries = 0
+                break
+            except _SessionExpired:
+                if retries >= UPLOAD_MAX_RETRIES:
+                    raise RuntimeError("Upload session keeps expiring") from None
+                retries += 1
+                logger.warning("Upload session expired; starting a new one")
+                upload_url, response = None, None
+            except requests.RequestException as exc:
+                if not _is_transient(exc) or retries >= UPLOAD_MAX_RETRIES:
+                    # The saved session stays, so a later run can resume.
+                    raise
+                retries += 1
+                sizer.record_failure()
+                delay = min(UPLOAD_MAX_BACKOFF, 2 ** retries)
+                logger.warning(
+                    "Upload interrupted (%s); retry %d/%d in %ds",
+                    exc,
+                    retries,
+                    UPLOAD_MAX_RETRIES,
+                    delay,
+                )
+                time.sleep(delay)
+                response = None  # re-query the committed offset
+
+    _clear_upload_state(state_key)
+    video_id = response.json()["id"]
     logger.info("Upload complete: video_id=%s", video_id)
     return video_id
 
@@ -202,6 +664,7 @@ def set_thumbnail(video_id: str, image_path: str) -> bool:
 
     Raises:
         FileNotFoundError: If the image file does not exist.
+        quota.QuotaExceededError: If the daily quota is used up.
         requests.HTTPError: If the API request fails.
     """
     if not os.path.isfile(image_path):
@@ -225,7 +688,7 @@ def set_thumbnail(video_id: str, image_path: str) -> bool:
     with open(image_path, "rb") as f:
         image_data = f.read()
 
-    response = requests.post(
+    response = transport.post(
         YOUTUBE_THUMBNAIL_URL,
         params={"videoId": video_id},
         headers={
@@ -235,6 +698,7 @@ def set_thumbnail(video_id: str, image_path: str) -> bool:
         data=image_data,
         timeout=60,
     )
+    _raise_for_quota(response)
     response.raise_for_status()
 
     logger.info("Thumbnail set successfully for video %s", video_id)
@@ -6,34 +6,78 @@ Environment variables required:
     ZOOM_ACCOUNT_ID   - Zoom account ID
     ZOOM_CLIENT_ID    - OAuth app client ID
     ZOOM_CLIENT_SECRET - OAuth app client secret
+
+Optional:
+    ZOOM_DOWNLOAD_CONNECTIONS - Parallel connections per download (default 4)
+    ZOOM_LIST_CONCURRENCY     - Listing requests in flight at once (default 4)
+    ZOOM_ACCOUNT_WIDE         - "1" to list recordings of every active user
+                                in the account instead of only ``me``
+                                (requires the ``user:read:admin`` scope)
+    ZOOM_RATE_LIMIT           - Max listing requests per second (default 10)
 """
 
+import json
 import logging
 import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Callable, Iterator
 
 import requests
 
+import transport
+from token_cache import TokenCache
+
 logger = logging.getLogger(__name__)
 
 ZOOM_OAUTH_URL = "https://zoom.us/oauth/token"
 ZOOM_API_BASE = "https://api.zoom.us/v2"
 
+# Recording listing: Zoom rejects ranges longer than one month, so longer
+# ranges are split into shards of this many days, listed concurrently.
+LIST_SHARD_DAYS = 30
+LIST_PAGE_SIZE = 300
+LIST_CONCURRENCY = int(os.environ.get("ZOOM_LIST_CONCURRENCY", "4"))
+ACCOUNT_WIDE = os.environ.get("ZOOM_ACCOUNT_WIDE", "0") == "1"
+RATE_LIMIT = float(os.environ.get("ZOOM_RATE_LIMIT", "10"))
+RATE_LIMIT_RETRIES = 3
+
+# Ranged downloads: the file is fetched in segments of this size over
+# several connections and written into place in a preallocated .part file.
+DOWNLOAD_CONNECTIONS = int(os.environ.get("ZOOM_DOWNLOAD_CONNECTIONS", "4"))
+DOWNLOAD_SEGMENT_SIZE = 32 * 1024 * 1024  # 32 MB
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024  # 1 MB per read/write
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_MAX_BACKOFF = 60  # seconds
+DOWNLOAD_TIMEOUT = (30, 60)  # (connect, read) seconds
+
 ACCEPTED_RECORDING_TYPES = {
     "shared_screen_with_speaker_view",
     "shared_screen_with_speaker_view(CC)",
     "active_speaker",
 }
 
+# Preference order when a meeting has several accepted files (most of the
+# time they are alternative views of the same session).
+RECORDING_TYPE_PRIORITY = (
+    "shared_screen_with_speaker_view",
+    "shared_screen_with_speaker_view(CC)",
+    "active_speaker",
+)
+
 
-def get_access_token() -> str:
-    """Obtain a Zoom Server-to-Server OAuth access token.
+def _request_access_token() -> dict:
+    """Request a new Zoom OAuth access token (uncached).
 
     Uses Basic authentication with ZOOM_CLIENT_ID and ZOOM_CLIENT_SECRET,
     posting to the Zoom OAuth endpoint with grant_type=account_credentials.
 
     Returns:
-        The access token string.
+        The decoded token response (``access_token``, ``expires_in``, ...).
 
     Raises:
         EnvironmentError: If required environment variables are missing.
@@ -57,7 +101,7 @@ def get_access_token() -> str:
 
     logger.info("Requesting Zoom OAuth access token")
 
-    response = requests.post(
+    response = transport.post(
         ZOOM_OAUTH_URL,
         params={
             "grant_type": "account_credentials",
@@ -68,17 +112,304 @@ def get_access_token() -> str:
     )
     response.raise_for_status()
 
-    token = response.json()["access_token"]
     logger.info("Successfully obtained access token")
-    return token
+    return response.json()
+
+
+_token_cache = TokenCache(_request_access_token, name="Zoom")
+
+
+def get_access_token(force_refresh: bool = False) -> str:
+    """Obtain a Zoom Server-to-Server OAuth access token.
+
+    The token is cached for the whole process and shared by all threads;
+    a new one is requested only shortly before the cached one expires.
+
+    Args:
+        force_refresh: Discard the cached token and request a new one.
+
+    Returns:
+        The access token string.
+
+    Raises:
+        EnvironmentError: If required environment variables are missing.
+        requests.HTTPError: If the token request fails.
+    """
+    return _token_cache.get(force_refresh=force_refresh)
+
+
+def _refresh_rejected_token(rejected: str) -> str:
+    """Return a new access token after Zoom rejected *rejected* (HTTP 401).
+
+    The cached token can be revoked or expire early on Zoom's side; it is
+    dropped (once, however many threads saw the 401) and a new one fetched.
+    """
+    logger.warning("Zoom rejected the access token (HTTP 401); refreshing it")
+    _token_cache.invalidate(rejected)
+    return get_access_token()
+
+
+class _RateLimiter:
+    """Space calls at least ``1 / rate`` seconds apart across all threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_rate_limiter = _RateLimiter(RATE_LIMIT)
+
+
+def _api_get(path: str, params: dict) -> dict:
+    """GET a Zoom API endpoint under the shared rate limiter.
+
+    HTTP 429 responses are retried after the ``Retry-After`` delay; an
+    HTTP 401 is retried once with a freshly requested access token.
+
+    Returns:
+        The decoded JSON response.
+
+    Raises:
+        requests.HTTPError: If the request fails.
+    """
+    attempt = 0
+    access_token = get_access_token()
+    refreshed = False
+    while True:
+        _rate_limiter.wait()
+        response = transport.get(
+            f"{ZOOM_API_BASE}{path}",
+            headers={"Authorization": f"Bearer {access_token}"},
+            params=params,
+            timeout=30,
+        )
+        if response.status_code == 401 and not refreshed:
+            refreshed = True
+            access_token = _refresh_rejected_token(access_token)
+            continue
+        if response.status_code == 429 and attempt < RATE_LIMIT_RETRIES:
+            attempt += 1
+            delay = float(response.headers.get("Retry-After", "1") or 1)
+            logger.warning("Zoom rate limit hit on %s; waiting %.0fs", path, delay)
+            time.sleep(delay)
+            continue
+        response.raise_for_status()
+        return response.json()
+
+
+def list_users() -> list[dict]:
+    """List the active users of the Zoom account.
+
+    Returns:
+        A list of dicts with ``id`` and ``email``.
+
+    Raises:
+        requests.HTTPError: If the API request fails.
+    """
+    params = {"status": "active", "page_size": LIST_PAGE_SIZE}
+    users: list[dict] = []
+    while True:
+        data = _api_get("/users", params)
+        users.extend(
+            {"id": u["id"], "email": u.get("email", "")}
+            for u in data.get("users", [])
+        )
+        next_page_token = data.get("next_page_token")
+        if not next_page_token:
+            break
+        params["next_page_token"] = next_page_token
+
+    logger.info("Found %d active Zoom user(s)", len(users))
+    return users
+
+
+def _date_shards(from_date: str, to_date: str) -> list[tuple[str, str]]:
+    """Split an inclusive date range into shards of ``LIST_SHARD_DAYS`` days.
+
+    Shards are returned newest first, matching the order in which Zoom
+    returns meetings.
+    """
+    start = datetime.strptime(from_date, "%Y-%m-%d")
+    end = datetime.strptime(to_date, "%Y-%m-%d")
+    shards = []
+    while start <= end:
+        shard_end = min(start + timedelta(days=LIST_SHARD_DAYS - 1), end)
+        shards.append(
+            (start.strftime("%Y-%m-%d"), shard_end.strftime("%Y-%m-%d"))
+        )
+        start = shard_end + timedelta(days=1)
+    shards.reverse()
+    return shards
+
+
+def normalize_meeting(meeting: dict, host_email: str = "") -> dict | None:
+    """Reduce a Zoom meeting entry to the fields the pipeline uses.
+
+    Args:
+        meeting:    Meeting entry from the recordings API.
+        host_email: Email of the user the meeting was listed under, used
+                    when the entry itself carries none.
+
+    Returns:
+        The normalized dict, or ``None`` if the meeting has no MP4 file of
+        an accepted recording type.
+    """
+    filtered_files = [
+        rf
+        for rf in meeting.get("recording_files", [])
+        if rf.get("file_type") == "MP4"
+        and rf.get("recording_type") in ACCEPTED_RECORDING_TYPES
+    ]
+    if not filtered_files:
+        return None
+
+    return {
+        "meeting_id": meeting["id"],
+        "uuid": meeting.get("uuid", ""),
+        "host_id": meeting.get("host_id", ""),
+        "host_email": meeting.get("host_email") or host_email,
+        "topic": meeting.get("topic", ""),
+        "start_time": meeting.get("start_time", ""),
+        "recording_files": filtered_files,
+    }
+
+
+def _iter_pages(
+    user_id: str,
+    from_date: str,
+    to_date: str,
+) -> Iterator[list[dict]]:
+    """Yield the raw ``meetings`` list of every result page for one shard."""
+    params = {"from": from_date, "to": to_date, "page_size": LIST_PAGE_SIZE}
+    while True:
+        data = _api_get(f"/users/{user_id}/recordings", params)
+        yield data.get("meetings", [])
+
+        next_page_token = data.get("next_page_token")
+        if not next_page_token:
+            return
+        params["next_page_token"] = next_page_token
+
+
+def iter_recordings(
+    from_date: str,
+    to_date: str,
+    user_id: str = "me",
+    account_wide: bool | None = None,
+) -> Iterator[dict]:
+    """Stream Zoom cloud recordings within a date range.
+
+    Ranges longer than Zoom's one-month limit are split into
+    ``LIST_SHARD_DAYS`` shards, and every shard follows
+    ``next_page_token`` until all pages are read.  In account-wide mode
+    every active user of the account is listed as well.  All
+    (user, shard) listings run concurrently -- at most
+    ``LIST_CONCURRENCY`` at once, and no faster than ``RATE_LIMIT``
+    requests per second -- and meetings are yielded as soon as their page
+    arrives, so callers can start working on them while the rest of the
+    listing is still in flight.  Meetings are de-duplicated by UUID and
+    filtered as described in :func:`list_recordings`.
+
+    Args:
+        from_date:    Start date in ``YYYY-MM-DD`` format.
+        to_date:      End date in ``YYYY-MM-DD`` format.
+        user_id:      Zoom user whose recordings are listed when not in
+                      account-wide mode.
+        account_wide: List every user of the account.  Defaults to
+                      ``ACCOUNT_WIDE``.
+
+    Yields:
+        Meeting dicts as returned by :func:`list_recordings`.
+
+    Raises:
+        requests.HTTPError: If an API request fails.
+    """
+    if account_wide is None:
+        account_wide = ACCOUNT_WIDE
+
+    shards = _date_shards(from_date, to_date)
+    if account_wide:
+        users = list_users()
+    else:
+        users = [{"id": user_id, "email": ""}]
+    # Newest shard of every user first, then the next-newest, ...
+    tasks = [(user, shard) for shard in shards for user in users]
+    logger.info(
+        "Listing recordings from %s to %s (%d user(s), %d shard(s))",
+        from_date,
+        to_date,
+        len(users),
+        len(shards),
+    )
+
+    seen: set[str] = set()
+
+    def _unseen(meetings: list[dict], host_email: str) -> Iterator[dict]:
+        for meeting in meetings:
+            key = meeting.get("uuid") or str(meeting.get("id"))
+            if key in seen:
+                continue
+            seen.add(key)
+            normalized = normalize_meeting(meeting, host_email)
+            if normalized is not None:
+                yield normalized
+
+    if len(tasks) == 1:
+        user, shard = tasks[0]
+        for meetings in _iter_pages(user["id"], *shard):
+            yield from _unseen(meetings, user["email"])
+        return
+
+    # Listing workers push pages onto an unbounded queue (so they never
+    # block if the consumer stops early); None marks a finished task.
+    pages: queue.Queue = queue.Queue()
+
+    def _list(user: dict, shard: tuple[str, str]) -> None:
+        try:
+            for meetings in _iter_pages(user["id"], *shard):
+                pages.put((meetings, user["email"]))
+        except Exception as exc:
+            pages.put(exc)
+        finally:
+            pages.put(None)
+
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, min(LIST_CONCURRENCY, len(tasks))),
+        thread_name_prefix="zoom-list",
+    )
+    try:
+        for user, shard in tasks:
+            pool.submit(_list, user, shard)
+        remaining = len(tasks)
+        while remaining:
+            item = pages.get()
+            if item is None:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield from _unseen(*item)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 def list_recordings(from_date: str, to_date: str) -> list[dict]:
     """List Zoom cloud recordings within a date range.
 
-    Fetches recordings for the authenticated user (``me``) and filters
+    Fetches recordings for the authenticated user (``me``), or for every
+    user of the account when ``ZOOM_ACCOUNT_WIDE`` is set, and filters
     to MP4 files whose recording type is ``shared_screen_with_speaker_view``
-    or ``active_speaker``.
+    or ``active_speaker``.  Any range length is supported; see
+    :func:`iter_recordings` for the streaming variant.
 
     Args:
         from_date: Start date in ``YYYY-MM-DD`` format.
@@ -87,6 +418,9 @@ def list_recordings(from_date: str, to_date: str) -> list[dict]:
     Returns:
         A list of dicts, each containing:
             - meeting_id (int)
+            - uuid (str)
+            - host_id (str)
+            - host_email (str)
             - topic (str)
             - start_time (str)
             - recording_files (list[dict]) -- filtered MP4 entries
@@ -94,86 +428,456 @@ def list_recordings(from_date: str, to_date: str) -> list[dict]:
     Raises:
         requests.HTTPError: If the API request fails.
     """
-    access_token = get_access_token()
+    results = list(iter_recordings(from_date, to_date))
+    logger.info("Found %d meetings with matching recordings", len(results))
+    return results
 
-    logger.info("Listing recordings from %s to %s", from_date, to_date)
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    params = {"from": from_date, "to": to_date, "page_size": 300}
+def _file_duration(recording_file: dict) -> float:
+    """Return a recording file's length in seconds (0 if unknown)."""
+    start = recording_file.get("recording_start", "")
+    end = recording_file.get("recording_end", "")
+    if not start or not end:
+        return 0.0
+    try:
+        start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    return max(0.0, (end_dt - start_dt).total_seconds())
 
-    response = requests.get(
-        f"{ZOOM_API_BASE}/users/me/recordings",
-        headers=headers,
-        params=params,
-        timeout=30,
+
+def select_best_file(recording_files: list[dict]) -> dict | None:
+    """Pick the one recording file of a meeting that should be published.
+
+    Zoom stores the same session as several files (screen share with
+    speaker, its ``(CC)`` variant, active speaker).  Files are ranked by
+    ``RECORDING_TYPE_PRIORITY``, then by duration, then by size, so only
+    one of them is downloaded, trimmed and uploaded.
+
+    Args:
+        recording_files: Recording file entries of one meeting.
+
+    Returns:
+        The preferred recording file, or ``None`` if the list is empty.
+    """
+    if not recording_files:
+        return None
+
+    def _rank(rf: dict) -> tuple:
+        recording_type = rf.get("recording_type", "")
+        if recording_type in RECORDING_TYPE_PRIORITY:
+            priority = RECORDING_TYPE_PRIORITY.index(recording_type)
+        else:
+            priority = len(RECORDING_TYPE_PRIORITY)
+        return (priority, -_file_duration(rf), -(rf.get("file_size") or 0))
+
+    return min(recording_files, key=_rank)
+
+
+class DownloadError(RuntimeError):
+    """Raised when a download is incomplete or has an unexpected size."""
+
+
+def _get_download(
+    download_url: str, access_token: str, **kwargs
+) -> tuple[requests.Response, str]:
+    """Start a streamed GET of a recording file.
+
+    A 401 response is retried once with a freshly requested token.
+
+    Returns:
+        ``(response, access_token)`` -- the token that was accepted, for
+        the caller's following requests.
+    """
+    response = transport.get(
+        download_url,
+        params={"access_token": access_token},
+        stream=True,
+        timeout=DOWNLOAD_TIMEOUT,
+        **kwargs,
+    )
+    if response.status_code == 401:
+        response.close()
+        access_token = _refresh_rejected_token(access_token)
+        response = transport.get(
+            download_url,
+            params={"access_token": access_token},
+            stream=True,
+            timeout=DOWNLOAD_TIMEOUT,
+            **kwargs,
+        )
+    return response, access_token
+
+
+def _probe_download(download_url: str, access_token: str) -> tuple[int | None, str]:
+    """Return the file size if the server supports byte-range requests.
+
+    Returns:
+        ``(size, access_token)``: the total size in bytes, or ``None`` if
+        ranges are not supported (the caller then falls back to a single
+        sequential stream), and the token the server accepted.
+    """
+    response, access_token = _get_download(
+        download_url, access_token, headers={"Range": "bytes=0-0"}
     )
+    try:
+        response.raise_for_status()
+        if response.status_code != 206:
+            return None, access_token
+        match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+        return (int(match.group(1)) if match else None), access_token
+    finally:
+        response.close()
+
+
+class _Journal:
+    """Record of completed segments of a ranged download.
+
+    Stored as JSON next to the ``.part`` file so an interrupted download
+    resumes with only the missing segments.
+    """
+
+    def __init__(self, path: str, size: int, segment_size: int):
+        self.path = path
+        self.size = size
+        self.segment_size = segment_size
+        self.done: set[int] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, size: int, segment_size: int) -> "_Journal":
+        """Load the journal, or start an empty one if it doesn't match."""
+        journal = cls(path, size, segment_size)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return journal
+        if data.get("size") == size and data.get("segment_size") == segment_size:
+            journal.done = set(data.get("done", []))
+        return journal
+
+    def mark_done(self, index: int) -> None:
+        with self._lock:
+            self.done.add(index)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "size": self.size,
+                        "segment_size": self.segment_size,
+                        "done": sorted(self.done),
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self.path)
+
+
+def _download_segment(
+    download_url: str,
+    access_token: str,
+    part_path: str,
+    start: int,
+    end: int,
+) -> str:
+    """Fetch bytes ``start..end`` (inclusive) and write them into place.
+
+    Returns:
+        The access token the server accepted.
+    """
+    expected = end - start + 1
+    for attempt in range(1, DOWNLOAD_RETRIES + 1):
+        written = 0
+        try:
+            response, access_token = _get_download(
+                download_url, access_token, headers={"Range": f"bytes={start}-{end}"}
+            )
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise DownloadError(
+                    f"Range request returned HTTP {response.status_code}"
+                )
+            with open(part_path, "r+b") as f:
+                f.seek(start)
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE):
+                    f.write(chunk)
+                    written += len(chunk)
+            if written != expected:
+                raise DownloadError(
+                    f"Segment {start}-{end}: got {written} of {expected} bytes"
+                )
+            return access_token
+        except (requests.RequestException, DownloadError) as exc:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            delay = min(DOWNLOAD_MAX_BACKOFF, 2 ** attempt)
+            logger.warning(
+                "Segment %d-%d failed (%s); retry %d/%d in %ds",
+                start,
+                end,
+                exc,
+                attempt,
+                DOWNLOAD_RETRIES - 1,
+                delay,
+            )
+            time.sleep(delay)
+
+
+def _download_ranged(
+    download_url: str,
+    access_token: str,
+    part_path: str,
+    size: int,
+    connections: int,
+) -> None:
+    """Download *size* bytes into *part_path* over parallel range requests."""
+    journal = _Journal.load(part_path + ".json", size, DOWNLOAD_SEGMENT_SIZE)
+    if journal.done and not os.path.exists(part_path):
+        journal.done.clear()
+
+    # Preallocate the file so every segment can be written into place.
+    mode = "r+b" if os.path.exists(part_path) else "wb"
+    with open(part_path, mode) as f:
+        f.truncate(size)
+
+    segments = [
+        (i, start, min(start + DOWNLOAD_SEGMENT_SIZE, size) - 1)
+        for i, start in enumerate(range(0, size, DOWNLOAD_SEGMENT_SIZE))
+    ]
+    pending = [seg for seg in segments if seg[0] not in journal.done]
+    if len(pending) < len(segments):
+        logger.info(
+            "Resuming download: %d of %d segment(s) already present",
+            len(segments) - len(pending),
+            len(segments),
+        )
+
+    # Latest accepted token, so segments started after a refresh use it.
+    token = [access_token]
+
+    def _fetch(segment: tuple[int, int, int]) -> None:
+        index, start, end = segment
+        token[0] = _download_segment(download_url, token[0], part_path, start, end)
+        journal.mark_done(index)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, connections), thread_name_prefix="zoom-dl"
+    ) as pool:
+        # list() re-raises the first segment failure.
+        list(pool.map(_fetch, pending))
+
+
+def _download_sequential(
+    download_url: str,
+    access_token: str,
+    part_path: str,
+    tee: Callable[[bytes], None] | None,
+) -> None:
+    """Stream the whole file over a single connection into *part_path*."""
+    response, _ = _get_download(download_url, access_token)
     response.raise_for_status()
 
-    data = response.json()
-    meetings = data.get("meetings", [])
+    with open(part_path, "wb", buffering=DOWNLOAD_BUFFER_SIZE) as f:
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE):
+            f.write(chunk)
+            if tee is not None:
+                tee(chunk)
 
-    results: list[dict] = []
-    for meeting in meetings:
-        filtered_files = [
-            rf
-            for rf in meeting.get("recording_files", [])
-            if rf.get("file_type") == "MP4"
-            and rf.get("recording_type") in ACCEPTED_RECORDING_TYPES
-        ]
 
-        if not filtered_files:
-            continue
+def download_headers(access_token: str) -> dict[str, str]:
+    """Return the HTTP headers that authorize a recording download.
 
-        results.append(
-            {
-                "meeting_id": meeting["id"],
-                "topic": meeting.get("topic", ""),
-                "start_time": meeting.get("start_time", ""),
-                "recording_files": filtered_files,
-            }
+    For tools that fetch the file themselves (e.g. ffmpeg's ``-headers``),
+    so the token stays out of the URL.  The result contains a credential
+    and must not be logged.
+    """
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+class RecordingStream:
+    """A Zoom recording download exposed as a readable byte stream.
+
+    Lets the recording be relayed to another service (e.g.
+    :func:`youtube.upload_stream`) without being written to disk.  If the
+    connection drops, the download is resumed from the current position
+    with a range request, so the reader never sees the interruption.
+
+    Use as a context manager::
+
+        with RecordingStream(url, token) as stream:
+            youtube.upload_stream(stream, title, total_size=stream.size)
+
+    Args:
+        download_url: The download URL from the recording file entry.
+        access_token: A valid Zoom OAuth access token.
+
+    Raises:
+        DownloadError: From :meth:`read`, if the download cannot be
+                       completed or its size is wrong.
+    """
+
+    def __init__(self, download_url: str, access_token: str):
+        self.download_url = download_url
+        self.access_token = access_token
+        self.size: int | None = None
+        self._received = 0
+        self._buffer = bytearray()
+        self._response = None
+        self._chunks: Iterator[bytes] = iter(())
+
+    def open(self) -> "RecordingStream":
+        """Connect (or reconnect at the current position)."""
+        if self._response is not None:
+            self._response.close()
+        headers = {}
+        if self._received:
+            headers["Range"] = f"bytes={self._received}-"
+        response, self.access_token = _get_download(
+            self.download_url, self.access_token, headers=headers
+        )
+        response.raise_for_status()
+        if self._received and response.status_code != 206:
+            response.close()
+            raise DownloadError("Server does not support resuming the download")
+        if self.size is None and response.headers.get("Content-Length"):
+            self.size = int(response.headers["Content-Length"])
+        self._response = response
+        self._chunks = response.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE)
+        return self
+
+    def _next_chunk(self) -> bytes:
+        """Return the next chunk of the file, or b"" at its end."""
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                chunk = next(self._chunks, b"")
+            except requests.RequestException as exc:
+                chunk = b""
+                error = str(exc)
+            else:
+                if chunk:
+                    self._received += len(chunk)
+                    return chunk
+                if self.size is None or self._received >= self.size:
+                    return b""
+                error = "connection closed early"
+
+            if attempt == DOWNLOAD_RETRIES:
+                break
+            delay = min(DOWNLOAD_MAX_BACKOFF, 2 ** (attempt + 1))
+            logger.warning(
+                "Recording stream interrupted at %d bytes (%s); resuming in %ds",
+                self._received,
+                error,
+                delay,
+            )
+            time.sleep(delay)
+            self.open()
+
+        raise DownloadError(
+            f"Recording stream failed at {self._received} of {self.size} bytes"
         )
 
-    logger.info("Found %d meetings with matching recordings", len(results))
-    return results
+    def read(self, size: int = -1) -> bytes:
+        """Read up to *size* bytes (all remaining if negative; b"" at the end)."""
+        while size < 0 or len(self._buffer) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def close(self) -> None:
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def __enter__(self) -> "RecordingStream":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
 
 def download_recording(
-    download_url: str, access_token: str, output_path: str
+    download_url: str,
+    access_token: str,
+    output_path: str,
+    tee: Callable[[bytes], None] | None = None,
+    expected_size: int = 0,
+    connections: int | None = None,
 ) -> str:
     """Download a Zoom recording MP4 file.
 
-    Appends the access token as a query parameter and streams the file
-    to ``output_path``.
+    Appends the access token as a query parameter.  When the server
+    supports byte ranges the file is fetched in segments over several
+    connections and written into place in a preallocated
+    ``<output_path>.part`` file; a journal of finished segments
+    (``.part.json``) lets a failed or interrupted download resume with
+    only the missing segments.  Otherwise -- and whenever *tee* is given,
+    since it needs the bytes in order -- the file is streamed over one
+    connection.  The ``.part`` file is renamed to *output_path* only once
+    its size has been verified.  A token rejected with HTTP 401 is
+    refreshed and the request retried once.
 
     Args:
         download_url:  The download URL from the recording file entry.
         access_token:  A valid Zoom OAuth access token.
         output_path:   Local file path where the MP4 will be saved.
+        tee:           Optional callable that receives every chunk as it
+                       is written, in order (e.g.
+                       :meth:`trim.StreamAnalyzer.write`).
+        expected_size: ``file_size`` reported by :func:`list_recordings`;
+                       checked against the finished file when non-zero.
+        connections:   Parallel connections.  Defaults to
+                       ``DOWNLOAD_CONNECTIONS``.
 
     Returns:
         The ``output_path`` string on success.
 
     Raises:
         requests.HTTPError: If the download request fails.
+        DownloadError: If the downloaded size is wrong.
         OSError: If writing the file fails.
     """
     logger.info("Downloading recording to %s", output_path)
 
-    response = requests.get(
-        download_url,
-        params={"access_token": access_token},
-        stream=True,
-        timeout=60,
-    )
-    response.raise_for_status()
+    if connections is None:
+        connections = DOWNLOAD_CONNECTIONS
 
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    part_path = output_path + ".part"
+
+    size = None
+    if tee is None and connections > 1:
+        size, access_token = _probe_download(download_url, access_token)
+    if size:
+        logger.info(
+            "Ranged download: %.2f MB over %d connection(s)",
+            size / (1024 * 1024),
+            connections,
+        )
+        _download_ranged(download_url, access_token, part_path, size, connections)
+    else:
+        _download_sequential(download_url, access_token, part_path, tee)
 
-    bytes_written = 0
-    with open(output_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
-            bytes_written += len(chunk)
+    bytes_written = os.path.getsize(part_path)
+    if size and bytes_written != size:
+        raise DownloadError(
+            f"Downloaded {bytes_written} bytes, server reported {size}"
+        )
+    if expected_size and bytes_written != expected_size:
+        raise DownloadError(
+            f"Downloaded {bytes_written} bytes, Zoom reported {expected_size}"
+        )
+
+    os.replace(part_path, output_path)
+    if os.path.exists(part_path + ".json"):
+        os.remove(part_path + ".json")
 
     logger.info(
         "Download complete: %s (%.2f MB)",
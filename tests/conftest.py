@@ -0,0 +1,11 @@
+"""Shared pytest setup.
+
+The pipeline modules import each other as top-level modules (``import
+zoom``), as when run as ``python src/main.py``, so ``src`` is put on the
+import path here.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
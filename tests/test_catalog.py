@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import catalog
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def cat():
+    c = catalog.Catalog(":memory:")
+    yield c
+    c.close()
+
+
+def _meeting(uuid, start, files=("f",)):
+    return {
+        "meeting_id": 1,
+        "uuid": uuid,
+        "host_id": "host",
+        "host_email": "host@example.com",
+        "topic": f"topic {uuid}",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "recording_files": [
+            {"id": f"{uuid}-{name}", "recording_type": "active_speaker"}
+            for name in files
+        ],
+    }
+
+
+@pytest.fixture
+def listed(monkeypatch):
+    calls = []
+
+    def iter_recordings(from_date, to_date):
+        calls.append((from_date, to_date))
+        yield _meeting("m1", NOW - timedelta(hours=3))
+
+    monkeypatch.setattr(catalog.zoom, "iter_recordings", iter_recordings)
+    return calls
+
+
+def test_first_sync_lists_initial_days(cat, listed):
+    assert catalog.sync(cat, NOW) == 1
+
+    start = NOW - timedelta(days=catalog.INITIAL_DAYS)
+    assert listed == [(start.strftime("%Y-%m-%d"), "2026-03-10")]
+    assert cat.watermark() == NOW
+
+
+def test_later_sync_overlaps_the_watermark(cat, listed):
+    cat.set_watermark(NOW - timedelta(days=5))
+
+    catalog.sync(cat, NOW)
+
+    start = NOW - timedelta(days=5, hours=catalog.OVERLAP_HOURS)
+    assert listed == [(start.strftime("%Y-%m-%d"), "2026-03-10")]
+
+
+def test_abandoned_sync_keeps_the_watermark(cat, listed):
+    cat.set_watermark(NOW - timedelta(days=1))
+
+    next(catalog.iter_sync(cat, NOW))
+
+    assert cat.watermark() == NOW - timedelta(days=1)
+
+
+def test_processed_meetings_are_not_pending(cat):
+    cat.upsert_meeting(_meeting("old", NOW - timedelta(days=2)))
+    cat.upsert_meeting(_meeting("new", NOW - timedelta(hours=1), files=("a", "b")))
+    cat.upsert_meeting(_meeting("done", NOW - timedelta(hours=2)))
+    cat.mark_processed("done-f", "page")
+
+    pending = cat.pending_meetings(since=NOW - timedelta(days=7), now=NOW)
+
+    assert [m["uuid"] for m in pending] == ["new", "old"]
+    assert [f["id"] for f in pending[0]["recording_files"]] == ["new-a", "new-b"]
+    assert cat.is_processed("done-f")
+
+
+def test_upsert_keeps_processing_state(cat):
+    cat.upsert_meeting(_meeting("m", NOW))
+    cat.mark_processed("m-f", "page")
+
+    cat.upsert_meeting(_meeting("m", NOW))
+
+    assert cat.is_meeting_processed(_meeting("m", NOW))
+
+
+def test_deferred_in_deferral_order(cat, monkeypatch):
+    for uuid, hours in (("a", 1), ("b", 5), ("c", 3)):
+        cat.upsert_meeting(_meeting(uuid, NOW - timedelta(hours=hours)))
+
+    clock = iter([NOW, NOW + timedelta(minutes=1), NOW + timedelta(minutes=2)])
+    monkeypatch.setattr(catalog, "_utcnow", lambda: next(clock))
+    cat.defer("c-f", "quota")
+    cat.defer("a-f", "quota")
+    cat.defer("b-f", "quota")
+
+    assert [m["uuid"] for m in cat.deferred_meetings()] == ["c", "a", "b"]
+
+
+def test_deferring_again_keeps_the_place_in_line(cat, monkeypatch):
+    for uuid in ("a", "b"):
+        cat.upsert_meeting(_meeting(uuid, NOW))
+
+    clock = iter([NOW, NOW + timedelta(minutes=1), NOW + timedelta(minutes=2)])
+    monkeypatch.setattr(catalog, "_utcnow", lambda: next(clock))
+    cat.defer("a-f", "quota")
+    cat.defer("b-f", "quota")
+    cat.defer("a-f", "quota again")
+
+    assert [m["uuid"] for m in cat.deferred_meetings()] == ["a", "b"]
+
+
+def test_processing_clears_the_deferral(cat):
+    cat.upsert_meeting(_meeting("a", NOW))
+    cat.defer("a-f")
+
+    cat.mark_processed("a-f", "page")
+
+    assert cat.deferred_meetings() == []
+
+
+def test_unmatched_meetings_back_off(cat):
+    cat.upsert_meeting(_meeting("m", NOW - timedelta(hours=1)))
+    since = NOW - timedelta(days=7)
+
+    cat.record_unmatched("m", NOW)
+    assert cat.pending_meetings(since, now=NOW) == []
+    assert not cat.match_due("m", NOW)
+    assert len(cat.pending_meetings(since, now=NOW + timedelta(hours=1))) == 1
+
+    cat.record_unmatched("m", NOW)
+    assert cat.pending_meetings(since, now=NOW + timedelta(hours=1)) == []
+    assert cat.match_due("m", NOW + timedelta(hours=2))
+
+
+def test_claims_are_exclusive_until_released(cat):
+    assert cat.claim("key", owner="1")
+    assert not cat.claim("key", owner="2")
+
+    cat.release("key")
+    assert cat.claim("key", owner="2")
+
+
+def test_stale_claim_is_taken_over(cat):
+    assert cat.claim("key", owner="1", ttl=0)
+    assert cat.claim("key", owner="2", ttl=-1)
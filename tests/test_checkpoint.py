@@ -0,0 +1,112 @@
+import json
+import os
+import time
+
+import pytest
+
+import checkpoint
+
+
+@pytest.fixture(autouse=True)
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(checkpoint, "WORK_DIR", str(tmp_path / "work"))
+    return tmp_path
+
+
+def _write(path, data: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_round_trip():
+    cp = checkpoint.Checkpoint.load("page", "file-1")
+    cp.record(video_id="abc", thumbnail_set=True)
+
+    loaded = checkpoint.Checkpoint.load("page", "file-1")
+    assert loaded.get("video_id") == "abc"
+    assert loaded.get("thumbnail_set") is True
+    assert loaded.file_id == "file-1"
+
+
+def test_other_recording_file_discards_checkpoint():
+    checkpoint.Checkpoint.load("page", "file-1").record(video_id="abc")
+
+    assert checkpoint.Checkpoint.load("page", "file-2").artifacts == {}
+
+
+def test_file_artifact_survives_until_changed():
+    path = _write(os.path.join(checkpoint.work_dir("page"), "raw.mp4"), b"x" * 1000)
+    cp = checkpoint.Checkpoint.load("page")
+    cp.record_file("raw", path)
+
+    assert checkpoint.Checkpoint.load("page").file("raw") == path
+
+    _write(path, b"y" * 1000)
+    assert checkpoint.Checkpoint.load("page").file("raw") == ""
+
+
+def test_file_artifact_missing():
+    path = _write(os.path.join(checkpoint.work_dir("page"), "raw.mp4"), b"data")
+    cp = checkpoint.Checkpoint.load("page")
+    cp.record_file("raw", path)
+    os.remove(path)
+
+    assert cp.file("raw") == ""
+    assert cp.file("trimmed") == ""
+
+
+def test_digest_covers_size_and_both_ends(monkeypatch, tmp_path):
+    monkeypatch.setattr(checkpoint, "_DIGEST_BYTES", 4)
+    a = _write(str(tmp_path / "a"), b"headMIDDLEtail")
+    head = _write(str(tmp_path / "head"), b"HeadMIDDLEtail")
+    tail = _write(str(tmp_path / "tail"), b"headMIDDLEtaiL")
+    size = _write(str(tmp_path / "size"), b"headMIDDLEtail!")
+
+    for other in (head, tail, size):
+        assert checkpoint.file_digest(a) != checkpoint.file_digest(other)
+
+
+def test_clear_removes_checkpoint_and_work_dir():
+    _write(os.path.join(checkpoint.work_dir("page"), "raw.mp4"), b"data")
+    cp = checkpoint.Checkpoint.load("page")
+    cp.record(video_id="abc")
+
+    cp.clear()
+
+    assert not os.path.exists(checkpoint.work_dir("page"))
+    assert checkpoint.Checkpoint.load("page").artifacts == {}
+
+
+def _age(path, days):
+    when = time.time() - days * 86400
+    os.utime(path, (when, when))
+
+
+def test_prune_by_updated_at():
+    # Stale record with both a checkpoint and a work directory.
+    checkpoint.Checkpoint.load("stale").record(video_id="abc")
+    _write(os.path.join(checkpoint.work_dir("stale"), "raw.mp4"), b"data")
+    # Old work directory without a checkpoint.
+    os.makedirs(checkpoint.work_dir("orphan"))
+    _age(checkpoint.work_dir("orphan"), 30)
+    # Fresh record whose work directory has not changed for long.
+    checkpoint.Checkpoint.load("fresh").record(video_id="def")
+    os.makedirs(checkpoint.work_dir("fresh"))
+    _age(checkpoint.work_dir("fresh"), 30)
+
+    stale_path = os.path.join(checkpoint.CHECKPOINT_DIR, "stale.json")
+    with open(stale_path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["updated_at"] = time.time() - 30 * 86400
+    with open(stale_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    assert checkpoint.prune(max_age_days=14) == 2
+    assert not os.path.exists(checkpoint.work_dir("stale"))
+    assert not os.path.exists(checkpoint.work_dir("orphan"))
+    assert os.path.isdir(checkpoint.work_dir("fresh"))
+    assert checkpoint.Checkpoint.load("fresh").get("video_id") == "def"
+    assert checkpoint.Checkpoint.load("stale").artifacts == {}
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import Stage, StagedPipeline
+
+
+def test_items_pass_every_stage_in_order():
+    seen = []
+    lock = threading.Lock()
+
+    def record(name):
+        def func(item):
+            with lock:
+                seen.append((name, item))
+        return func
+
+    done = []
+    engine = StagedPipeline(
+        [Stage("a", record("a"), 2), Stage("b", record("b"))],
+        on_done=done.append,
+    )
+
+    assert engine.run(iter(range(5))) == 5
+    assert sorted(done) == list(range(5))
+    for item in range(5):
+        assert seen.index(("a", item)) < seen.index(("b", item))
+
+
+def test_failed_item_is_reported_and_dropped():
+    errors = []
+    later = []
+
+    def fail_on_two(item):
+        if item == 2:
+            raise ValueError("boom")
+
+    engine = StagedPipeline(
+        [Stage("first", fail_on_two), Stage("second", later.append)],
+        on_error=lambda item, stage, exc: errors.append((item, stage, str(exc))),
+    )
+    engine.run([1, 2, 3])
+
+    assert errors == [(2, "first", "boom")]
+    assert sorted(later) == [1, 3]
+
+
+def test_callback_failures_do_not_stop_the_pipeline():
+    def fail(item):
+        raise RuntimeError("stage")
+
+    def bad_callback(*args):
+        raise RuntimeError("callback")
+
+    engine = StagedPipeline([Stage("only", fail)], on_error=bad_callback)
+    assert engine.run([1, 2]) == 2
+
+
+def test_stages_overlap():
+    # With one worker per stage, item 2 must be in "a" while item 1 is in "b".
+    in_b = threading.Event()
+    overlapped = []
+
+    def a(item):
+        if item == 2:
+            overlapped.append(in_b.wait(timeout=5))
+
+    def b(item):
+        if item == 1:
+            in_b.set()
+            time.sleep(0.05)
+
+    StagedPipeline([Stage("a", a), Stage("b", b)]).run([1, 2])
+    assert overlapped == [True]
+
+
+def test_worker_thread_carries_item_label():
+    names = []
+    engine = StagedPipeline(
+        [Stage("dl", lambda item: names.append(threading.current_thread().name))],
+        label=lambda item: f"job{item}",
+    )
+    engine.run([7])
+    assert names == ["dl:job7"]
+
+
+def test_requires_a_stage():
+    with pytest.raises(ValueError):
+        StagedPipeline([])
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+import quota
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setattr(quota.QuotaLedger, "today", staticmethod(lambda: "2026-03-01"))
+    return quota.QuotaLedger(str(tmp_path / "quota.json"), daily_limit=4000)
+
+
+def test_reserve_until_the_budget_is_used(ledger):
+    assert ledger.try_reserve(quota.JOB_COST)
+    assert ledger.try_reserve(quota.JOB_COST)
+    assert not ledger.try_reserve(quota.JOB_COST)
+    assert ledger.remaining() == 4000 - 2 * quota.JOB_COST
+
+
+def test_spent_units_persist(ledger):
+    ledger.try_reserve(1600)
+
+    reloaded = quota.QuotaLedger(ledger.path, daily_limit=4000)
+    assert reloaded.remaining() == 2400
+
+
+def test_refund(ledger):
+    ledger.try_reserve(quota.JOB_COST)
+    ledger.refund(quota.THUMBNAIL_COST)
+    assert ledger.remaining() == 4000 - quota.UPLOAD_COST
+
+    ledger.refund(10000)
+    assert ledger.remaining() == 4000
+
+
+def test_mark_exhausted_closes_the_day(ledger):
+    ledger.try_reserve(100)
+    ledger.mark_exhausted()
+
+    assert ledger.remaining() == 0
+    assert not ledger.try_reserve(1)
+    with open(ledger.path, encoding="utf-8") as f:
+        assert json.load(f)["days"]["2026-03-01"]["exhausted"] is True
+
+
+def test_refund_after_exhaustion_keeps_the_day_closed(ledger):
+    ledger.try_reserve(quota.JOB_COST)
+    ledger.mark_exhausted()
+    ledger.refund(quota.JOB_COST)
+
+    assert ledger.remaining() == 0
+    assert not ledger.try_reserve(1)
+
+
+def test_refund_into_the_reserved_day(ledger, monkeypatch):
+    day = ledger.today()
+    ledger.try_reserve(quota.JOB_COST, day)
+
+    monkeypatch.setattr(quota.QuotaLedger, "today", staticmethod(lambda: "2026-03-02"))
+    ledger.refund(quota.UPLOAD_COST, day)
+
+    assert ledger.remaining() == 4000
+    with open(ledger.path, encoding="utf-8") as f:
+        spent = json.load(f)["days"]["2026-03-01"]["spent"]
+    assert spent == quota.JOB_COST - quota.UPLOAD_COST
+
+
+def test_new_day_starts_a_fresh_budget(ledger, monkeypatch):
+    ledger.try_reserve(3000)
+    ledger.mark_exhausted()
+
+    monkeypatch.setattr(quota.QuotaLedger, "today", staticmethod(lambda: "2026-03-02"))
+    assert ledger.remaining() == 4000
+    assert ledger.try_reserve(quota.JOB_COST)
+
+
+def test_old_days_are_dropped(ledger, monkeypatch):
+    for day in range(1, 20):
+        monkeypatch.setattr(
+            quota.QuotaLedger, "today", staticmethod(lambda d=day: f"2026-03-{d:02d}")
+        )
+        ledger.try_reserve(1)
+
+    with open(ledger.path, encoding="utf-8") as f:
+        days = json.load(f)["days"]
+    assert len(days) == quota._KEEP_DAYS
+    assert "2026-03-19" in days and "2026-03-01" not in days
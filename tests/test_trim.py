@@ -0,0 +1,80 @@
+import subprocess
+
+import pytest
+
+import trim
+
+np = pytest.importorskip("numpy")
+
+
+def _envelope(levels, window=1.0):
+    return trim.Envelope(np.array(levels, dtype=np.float32), window, len(levels) * window)
+
+
+def test_silence_regions():
+    env = _envelope([-60] * 12 + [-20] * 5 + [-60] * 3 + [-20] * 5 + [-60] * 15)
+
+    assert env.silence_regions(-40, 10) == [(0.0, 12.0), (25.0, 40.0)]
+    assert env.silence_regions(-40, 3) == [(0.0, 12.0), (17.0, 20.0), (25.0, 40.0)]
+
+
+def test_silence_regions_threshold():
+    env = _envelope([-45] * 20)
+
+    assert env.silence_regions(-40, 10) == [(0.0, 20.0)]
+    assert env.silence_regions(-50, 10) == []
+
+
+def test_silence_regions_end_is_clamped_to_duration():
+    env = trim.Envelope(np.full(4, -60, dtype=np.float32), 0.5, 1.8)
+
+    assert env.silence_regions(-40, 1) == [(0.0, 1.8)]
+
+
+def test_silence_regions_empty_envelope():
+    env = trim.Envelope(np.zeros(0, dtype=np.float32), 0.5, 60.0)
+
+    assert env.silence_regions(-40, 10) == []
+
+
+def test_trim_points_from_regions():
+    assert trim._trim_points_from_regions([(0.0, 12.0), (25.0, 40.0)], 40.0) == (
+        12.0,
+        25.0,
+    )
+    assert trim._trim_points_from_regions([(5.0, 12.0)], 40.0) == (0.0, 40.0)
+    assert trim._trim_points_from_regions([(0.0, 40.0)], 40.0) == (0.0, 40.0)
+
+
+def test_numpy_analysis_replaces_a_head_tail_result(tmp_path, monkeypatch):
+    path = tmp_path / "rec.mp4"
+    path.write_bytes(b"x")
+    info = trim.MediaInfo(str(path), 40.0)
+    info.set_silence_regions(-40, 10, [(0.0, 12.0)], complete=False)
+    env = _envelope([-60] * 12 + [-20] * 13 + [-60] * 15)
+    monkeypatch.setattr(trim, "_cached_info", lambda _: info)
+    monkeypatch.setattr(trim, "_store_info", lambda _: None)
+    monkeypatch.setattr(trim, "compute_envelope", lambda _: (env, []))
+
+    result = trim.analyze(str(path), -40, 10, backend="numpy")
+
+    assert result.silence_regions(-40, 10) == [(0.0, 12.0), (25.0, 40.0)]
+
+
+def test_ffprobe_sends_headers_and_redacts_them(monkeypatch):
+    seen = []
+
+    def run(cmd, **kwargs):
+        seen.append(cmd)
+        return subprocess.CompletedProcess(cmd, 1, "", "403 Forbidden")
+
+    monkeypatch.setattr(trim.subprocess, "run", run)
+
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        trim._ffprobe("https://zoom/rec", {"Authorization": "Bearer secret"})
+
+    cmd = seen[0]
+    assert cmd[cmd.index("-headers") + 1] == "Authorization: Bearer secret\r\n"
+    assert cmd.index("-headers") < cmd.index("https://zoom/rec")
+    assert "secret" not in str(exc_info.value)
+    assert "secret" not in " ".join(exc_info.value.cmd)
@@ -0,0 +1,87 @@
+import hashlib
+import hmac
+import importlib.util
+import os
+import time
+
+import pytest
+
+pytest.importorskip("flask")
+
+_spec = importlib.util.spec_from_file_location(
+    "web_app",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "web", "app.py"),
+)
+web_app = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_app)
+
+SECRET = "test-secret"
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setenv("ZOOM_WEBHOOK_SECRET", SECRET)
+
+
+def _headers(body, timestamp=None, secret=SECRET):
+    timestamp = str(int(time.time()) if timestamp is None else timestamp)
+    digest = hmac.new(
+        secret.encode("utf-8"),
+        f"v0:{timestamp}:{body}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+    return {"x-zm-request-timestamp": timestamp, "x-zm-signature": f"v0={digest}"}
+
+
+def _verify(body, headers):
+    with web_app.app.test_request_context(
+        "/webhooks/zoom", method="POST", data=body, headers=headers
+    ):
+        return web_app._verify_zoom_signature(body)
+
+
+def test_webhook_signature_matches_zoom_format():
+    expected = hmac.new(b"key", b"v0:1:{}", hashlib.sha256).hexdigest()
+    assert web_app._webhook_signature("key", "v0:1:{}") == expected
+
+
+def test_valid_signature():
+    body = '{"event": "recording.completed"}'
+    assert _verify(body, _headers(body))
+
+
+def test_non_ascii_body():
+    body = '{"topic": "講座"}'
+    assert _verify(body, _headers(body))
+
+
+def test_tampered_body():
+    body = '{"event": "recording.completed"}'
+    assert not _verify(body.replace("completed", "started"), _headers(body))
+
+
+def test_wrong_secret():
+    body = "{}"
+    assert not _verify(body, _headers(body, secret="other"))
+
+
+def test_stale_timestamp():
+    body = "{}"
+    stale = int(time.time()) - web_app.WEBHOOK_MAX_SKEW - 60
+    assert not _verify(body, _headers(body, timestamp=stale))
+
+
+def test_missing_headers():
+    assert not _verify("{}", {})
+
+
+def test_missing_secret(monkeypatch):
+    monkeypatch.setenv("ZOOM_WEBHOOK_SECRET", "")
+    monkeypatch.setattr(web_app, "ZOOM_WEBHOOK_SECRET", "")
+    body = "{}"
+    assert not _verify(body, _headers(body))
+
+
+def test_body_that_is_not_utf8_is_rejected():
+    response = web_app.app.test_client().post("/webhooks/zoom", data=b"\xff\xfe")
+    assert response.status_code == 400
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import youtube
+from youtube import CHUNK_ALIGN, MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, _ChunkSizer
+
+
+def test_chunk_sizer_clamps_and_aligns():
+    assert _ChunkSizer(1).size == MIN_CHUNK_SIZE
+    assert _ChunkSizer(10 ** 12).size == MAX_CHUNK_SIZE
+    assert _ChunkSizer(MIN_CHUNK_SIZE + CHUNK_ALIGN + 1).size == (
+        MIN_CHUNK_SIZE + CHUNK_ALIGN
+    )
+
+
+def test_chunk_sizer_grows_at_most_double():
+    sizer = _ChunkSizer(MIN_CHUNK_SIZE)
+    # Very fast chunk: the target is huge, but growth is capped at 2x.
+    sizer.record(MIN_CHUNK_SIZE, 0.001)
+    assert sizer.size == 2 * MIN_CHUNK_SIZE
+
+
+def test_chunk_sizer_follows_throughput():
+    sizer = _ChunkSizer(64 * CHUNK_ALIGN)
+    # 1 MiB/s for CHUNK_TARGET_SECONDS seconds.
+    sizer.record(1024 * 1024, 1.0)
+    expected = int(1024 * 1024 * youtube.CHUNK_TARGET_SECONDS) // CHUNK_ALIGN * CHUNK_ALIGN
+    assert sizer.size == expected
+
+
+def test_chunk_sizer_halves_on_failure():
+    sizer = _ChunkSizer(64 * CHUNK_ALIGN)
+    sizer.record_failure()
+    assert sizer.size == 32 * CHUNK_ALIGN
+
+    for _ in range(10):
+        sizer.record_failure()
+    assert sizer.size == MIN_CHUNK_SIZE
+
+
+def test_chunk_sizer_ignores_empty_measurements():
+    sizer = _ChunkSizer(64 * CHUNK_ALIGN)
+    sizer.record(0, 1.0)
+    sizer.record(1000, 0)
+    assert sizer.size == 64 * CHUNK_ALIGN
+
+
+def _response(range_header=None):
+    headers = {"Range": range_header} if range_header is not None else {}
+    return SimpleNamespace(headers=headers)
+
+
+def test_committed_offset():
+    assert youtube._committed_offset(_response("bytes=0-1048575")) == 1048576
+    assert youtube._committed_offset(_response("bytes=0-0")) == 1
+
+
+def test_committed_offset_without_range():
+    assert youtube._committed_offset(_response()) == 0
+    assert youtube._committed_offset(_response("garbage")) == 0
@@ -0,0 +1,94 @@
+import requests
+
+import zoom
+
+
+def test_date_shards_newest_first(monkeypatch):
+    monkeypatch.setattr(zoom, "LIST_SHARD_DAYS", 30)
+
+    assert zoom._date_shards("2026-01-01", "2026-03-05") == [
+        ("2026-03-02", "2026-03-05"),
+        ("2026-01-31", "2026-03-01"),
+        ("2026-01-01", "2026-01-30"),
+    ]
+
+
+def test_date_shards_single_day():
+    assert zoom._date_shards("2026-03-05", "2026-03-05") == [
+        ("2026-03-05", "2026-03-05")
+    ]
+
+
+def test_date_shards_empty_range():
+    assert zoom._date_shards("2026-03-06", "2026-03-05") == []
+
+
+def _file(recording_type, minutes=60, size=100, file_id=None):
+    return {
+        "id": file_id or recording_type,
+        "recording_type": recording_type,
+        "recording_start": "2026-03-05T10:00:00Z",
+        "recording_end": f"2026-03-05T{10 + minutes // 60:02d}:{minutes % 60:02d}:00Z",
+        "file_size": size,
+    }
+
+
+def test_select_best_file_prefers_recording_type():
+    files = [
+        _file("active_speaker", minutes=90),
+        _file("shared_screen_with_speaker_view(CC)"),
+        _file("shared_screen_with_speaker_view"),
+    ]
+    assert zoom.select_best_file(files)["id"] == "shared_screen_with_speaker_view"
+
+
+def test_select_best_file_prefers_longer_then_larger():
+    files = [
+        _file("active_speaker", minutes=30, size=900, file_id="short"),
+        _file("active_speaker", minutes=60, size=100, file_id="long-small"),
+        _file("active_speaker", minutes=60, size=500, file_id="long-large"),
+    ]
+    assert zoom.select_best_file(files)["id"] == "long-large"
+
+
+def test_select_best_file_unknown_type_last():
+    files = [_file("gallery_view", minutes=120), _file("active_speaker")]
+    assert zoom.select_best_file(files)["id"] == "active_speaker"
+
+
+def test_select_best_file_empty():
+    assert zoom.select_best_file([]) is None
+
+
+class _Response:
+    status_code = 206
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield self.data
+
+
+def test_download_segment_backs_off_between_retries(monkeypatch, tmp_path):
+    part = tmp_path / "rec.part"
+    part.write_bytes(b"\0" * 8)
+    calls = []
+
+    def get_download(url, token, headers):
+        calls.append(headers["Range"])
+        if len(calls) < 3:
+            raise requests.ConnectionError("reset")
+        return _Response(b"abcd"), token
+
+    sleeps = []
+    monkeypatch.setattr(zoom, "_get_download", get_download)
+    monkeypatch.setattr(zoom.time, "sleep", sleeps.append)
+
+    assert zoom._download_segment("https://zoom", "tok", str(part), 2, 5) == "tok"
+    assert part.read_bytes() == b"\0\0abcd\0\0"
+    assert calls == ["bytes=2-5"] * 3
+    assert sleeps == [2, 4]
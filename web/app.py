@@ -2,19 +2,26 @@
 講師入力Webフォーム — Flask アプリケーション
 テンプレート画像・講師画像をビジュアルで選択し、Notionマスターテーブルに書き込む。
 Zoom録画完了後、既存パイプラインが自動処理を実行する。
+/webhooks/zoom で recording.completed を受け取ると、その録画を即時処理する。
 """
 
+import hashlib
+import hmac
 import json
 import logging
 import os
+import queue
 import re
 import secrets
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
 from flask import (
     Flask,
+    jsonify,
     render_template,
     request,
     send_from_directory,
@@ -28,6 +35,8 @@ sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
 load_dotenv(PROJECT_ROOT / ".env")
 
+import lecturer_images  # noqa: E402
+import main as pipeline_main  # noqa: E402
 import notion  # noqa: E402
 
 logger = logging.getLogger(__name__)
@@ -44,35 +53,37 @@ TEMPLATES_DIR = PROJECT_ROOT / "templates"
 VALID_CATEGORIES = {"1on1", "グルコン", "講座"}
 MAX_TEXT_LENGTH = 500
 
+ZOOM_WEBHOOK_SECRET = os.environ.get("ZOOM_WEBHOOK_SECRET", "")
+# Reject webhook requests whose timestamp is further off than this (seconds)
+WEBHOOK_MAX_SKEW = 300
+
 
 # ---------------------------------------------------------------------------
 # Image / Template scanning (cached at startup)
 # ---------------------------------------------------------------------------
 
 _cached_lecturers: list[dict] | None = None
+_cached_lecturers_version = 0
 _cached_templates: list[dict] | None = None
 
 
+def _lecturer_registry() -> lecturer_images.LecturerImageRegistry:
+    return lecturer_images.registry(LECTURER_IMAGES_DIR)
+
+
 def _scan_lecturer_images() -> list[dict]:
-    """Scan assets/lecturer-images/ and build a structured registry."""
-    images = []
-    for f in sorted(LECTURER_IMAGES_DIR.glob("*.png")):
-        stem = f.stem
-        parts = stem.split("_")
-        if len(parts) < 3:
-            continue
-        img_id = parts[0]
-        img_type = parts[-1]
-        names = parts[1:-1]
-        images.append({
-            "id": img_id,
-            "filename": f.name,
-            "names": names,
-            "label": " x ".join(names),
-            "type": img_type,
-            "url": f"/images/lecturers/{f.name}",
-        })
-    return images
+    """Build the form's lecturer image list from the shared registry."""
+    return [
+        {
+            "id": img.id,
+            "filename": img.filename,
+            "names": list(img.names),
+            "label": img.label,
+            "type": img.type,
+            "url": f"/images/lecturers/{img.filename}",
+        }
+        for img in _lecturer_registry().images()
+    ]
 
 
 def _scan_templates() -> list[dict]:
@@ -94,9 +105,12 @@ def _scan_templates() -> list[dict]:
 
 
 def get_lecturers() -> list[dict]:
-    global _cached_lecturers
-    if _cached_lecturers is None:
+    """Return the lecturer image list, rebuilt when the images change."""
+    global _cached_lecturers, _cached_lecturers_version
+    version = _lecturer_registry().version()
+    if _cached_lecturers is None or version != _cached_lecturers_version:
         _cached_lecturers = _scan_lecturer_images()
+        _cached_lecturers_version = version
     return _cached_lecturers
 
 
@@ -134,8 +148,8 @@ def _get_valid_pattern_names() -> set[str]:
     return {t["name"] for t in get_templates()}
 
 
-def _get_valid_lecturer_filenames() -> set[str]:
-    return {img["filename"] for img in get_lecturers()}
+def _is_valid_lecturer_filename(filename: str) -> bool:
+    return _lecturer_registry().get(filename) is not None
 
 
 # ---------------------------------------------------------------------------
@@ -202,10 +216,9 @@ def submit():
             errors.append("無効なパターンです")
 
         # Validate lecturer images against known filenames
-        valid_filenames = _get_valid_lecturer_filenames()
-        if lecturer_image1 and lecturer_image1 not in valid_filenames:
+        if lecturer_image1 and not _is_valid_lecturer_filename(lecturer_image1):
             errors.append("無効な講師画像が選択されました")
-        if lecturer_image2 and lecturer_image2 not in valid_filenames:
+        if lecturer_image2 and not _is_valid_lecturer_filename(lecturer_image2):
             errors.append("無効な講師画像が選択されました")
 
         if errors:
@@ -262,7 +275,7 @@ def submit():
 
 @app.route("/images/lecturers/<path:filename>")
 def lecturer_image(filename):
-    if filename not in _get_valid_lecturer_filenames():
+    if not _is_valid_lecturer_filename(filename):
         return "Not Found", 404
     return send_from_directory(str(LECTURER_IMAGES_DIR), filename)
 
@@ -275,6 +288,132 @@ def template_image(pattern):
     return send_from_directory(str(TEMPLATES_DIR / pattern), "base.png")
 
 
+# ---------------------------------------------------------------------------
+# Zoom webhook (recording.completed → immediate processing)
+# ---------------------------------------------------------------------------
+
+# gunicorn runs several workers, each with its own queue.  A meeting is
+# claimed in the catalog (one SQLite file shared by all workers) before it is
+# queued, so an event Zoom re-delivers to another worker is not processed
+# twice.  Claims left by a worker that died expire after this many seconds.
+WEBHOOK_CLAIM_TTL = 6 * 3600
+
+_webhook_queue: queue.Queue = queue.Queue()
+_webhook_lock = threading.Lock()
+_webhook_worker: threading.Thread | None = None
+
+
+def _webhook_claim_key(meeting: dict) -> str:
+    return "webhook:" + (meeting.get("uuid") or str(meeting.get("id")))
+
+
+def _webhook_signature(secret: str, message: str) -> str:
+    return hmac.new(
+        secret.encode("utf-8"), message.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+
+def _verify_zoom_signature(body: str) -> bool:
+    """Check the ``x-zm-signature`` header against ZOOM_WEBHOOK_SECRET."""
+    secret = os.environ.get("ZOOM_WEBHOOK_SECRET", "") or ZOOM_WEBHOOK_SECRET
+    timestamp = request.headers.get("x-zm-request-timestamp", "")
+    signature = request.headers.get("x-zm-signature", "")
+    if not secret or not timestamp.isdigit() or not signature:
+        return False
+    if abs(time.time() - int(timestamp)) > WEBHOOK_MAX_SKEW:
+        return False
+    message = f"v0:{timestamp}:{body}"
+    expected = "v0=" + _webhook_signature(secret, message)
+    return hmac.compare_digest(expected, signature)
+
+
+def _run_webhook_worker() -> None:
+    """Process queued meetings one at a time, in arrival order."""
+    while True:
+        meeting = _webhook_queue.get()
+        key = _webhook_claim_key(meeting)
+        try:
+            count = pipeline_main.process_meeting(meeting)
+            logger.info(
+                "Webhook meeting '%s': %d file(s) processed",
+                meeting.get("topic", ""),
+                count,
+            )
+        except Exception:
+            logger.exception("Webhook processing failed for meeting %s", key)
+        finally:
+            try:
+                pipeline_main._get_catalog().release(key)
+            except Exception:
+                logger.exception("Failed to release webhook claim %s", key)
+
+
+def _enqueue_meeting(meeting: dict) -> bool:
+    """Queue a meeting for the background worker (starting it if needed).
+
+    Returns:
+        ``False`` if the meeting is already queued or being processed by
+        any worker (Zoom re-delivers events that are not acknowledged
+        quickly, possibly to another worker).
+    """
+    global _webhook_worker
+    if not pipeline_main._get_catalog().claim(
+        _webhook_claim_key(meeting), owner=str(os.getpid()), ttl=WEBHOOK_CLAIM_TTL
+    ):
+        return False
+    with _webhook_lock:
+        if _webhook_worker is None or not _webhook_worker.is_alive():
+            _webhook_worker = threading.Thread(
+                target=_run_webhook_worker, name="webhook-worker", daemon=True
+            )
+            _webhook_worker.start()
+    _webhook_queue.put(meeting)
+    return True
+
+
+@app.route("/webhooks/zoom", methods=["POST"])
+def zoom_webhook():
+    try:
+        body = request.get_data().decode("utf-8")
+    except UnicodeDecodeError:
+        return "Bad Request", 400
+    if not _verify_zoom_signature(body):
+        logger.warning("Rejected Zoom webhook with invalid signature")
+        return "Unauthorized", 401
+
+    try:
+        event = json.loads(body)
+    except ValueError:
+        return "Bad Request", 400
+    event_type = event.get("event", "")
+    payload = event.get("payload") or {}
+
+    # Zoom's endpoint validation handshake
+    if event_type == "endpoint.url_validation":
+        plain_token = payload.get("plainToken", "")
+        secret = os.environ.get("ZOOM_WEBHOOK_SECRET", "") or ZOOM_WEBHOOK_SECRET
+        return jsonify({
+            "plainToken": plain_token,
+            "encryptedToken": _webhook_signature(secret, plain_token),
+        })
+
+    if event_type != "recording.completed":
+        return jsonify({"status": "ignored"})
+
+    meeting = payload.get("object") or {}
+    if not meeting.get("recording_files"):
+        return jsonify({"status": "ignored"})
+
+    queued = _enqueue_meeting(meeting)
+    logger.info(
+        "Zoom recording.completed: topic='%s' start_time=%s (%s)",
+        meeting.get("topic", ""),
+        meeting.get("start_time", ""),
+        "queued" if queued else "already queued",
+    )
+    return jsonify({"status": "queued" if queued else "duplicate"})
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------